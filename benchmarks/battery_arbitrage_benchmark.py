@@ -0,0 +1,77 @@
+"""
+Benchmark BatteryArbitrageController over a year of 5-minute real-time prices.
+
+Reports the time for a full 24-hour dynamic programming solve and the average
+per-step cost when re-planning at every 5-minute real-time interval. Synthetic
+prices are used, so Hercules is not required.
+
+Usage:
+    python battery_arbitrage_benchmark.py
+"""
+
+import time
+
+from battery_price_soc_benchmark import (
+    N_DAYS,
+    RT_STEPS_PER_DAY,
+    StandinInterface,
+    synthetic_prices,
+)
+from hycon.controllers import BatteryArbitrageController
+
+N_FULL_SOLVES = 100
+
+
+def main():
+    da_prices, rt_prices = synthetic_prices()
+    input_dict = {
+        "battery": {
+            "charge_rate": 10000.0,
+            "discharge_rate": 10000.0,
+            "energy_capacity": 40000.0,
+        }
+    }
+
+    for n_soc_grid in [41, 81, 161]:
+        controller = BatteryArbitrageController(
+            StandinInterface(), input_dict, {"n_soc_grid": n_soc_grid}
+        )
+
+        # Full solves (all 23 future stages)
+        t_start = time.perf_counter()
+        for i in range(N_FULL_SOLVES):
+            controller._stage_prices = None
+            controller.solve_stages(da_prices[i % N_DAYS, :23])
+        t_full_solve = (time.perf_counter() - t_start) / N_FULL_SOLVES
+
+        # Receding-horizon operation over a year
+        controller = BatteryArbitrageController(
+            StandinInterface(), input_dict, {"n_soc_grid": n_soc_grid}
+        )
+        soc = 0.5
+        revenue = 0.0
+        t_start = time.perf_counter()
+        for day in range(N_DAYS):
+            da_list = da_prices[day].tolist()
+            for k, rt_lmp in enumerate(rt_prices[day].tolist()):
+                measurements_dict = {
+                    "time": (day * RT_STEPS_PER_DAY + k) * 300.0,
+                    "battery": {"state_of_charge": soc},
+                    "RT_LMP": rt_lmp,
+                    "DA_LMP_24hours": da_list,
+                }
+                power = controller.compute_controls(measurements_dict)["power_setpoint"]
+                soc = min(max(soc - power / 40000.0 / 12, 0.0), 1.0)
+                revenue += rt_lmp * power / 1000 / 12
+        t_year = time.perf_counter() - t_start
+        n_steps = rt_prices.size
+
+        print("BatteryArbitrageController, n_soc_grid = {0}".format(n_soc_grid))
+        print("  Full 24-hour solve:  {0:.3f} ms".format(t_full_solve * 1e3))
+        print("  Year of 5-min steps: {0:.3f} s ({1:.1f} us/step), revenue ${2:,.0f}".format(
+            t_year, t_year / n_steps * 1e6, revenue
+        ))
+
+
+if __name__ == "__main__":
+    main()
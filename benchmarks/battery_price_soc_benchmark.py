@@ -0,0 +1,116 @@
+"""
+Benchmark BatteryPriceSOCController over a year of 5-minute real-time prices.
+
+Compares the per-step cost of the controller (which caches the day-ahead price
+thresholds and recomputes them using np.partition only when the day-ahead prices
+change) against a reference implementation that fully sorts the day-ahead prices
+at every step. Synthetic prices are used, so Hercules is not required.
+
+Usage:
+    python battery_price_soc_benchmark.py
+"""
+
+import time
+
+import numpy as np
+from hycon.controllers import BatteryPriceSOCController
+from hycon.interfaces.interface_base import InterfaceBase
+
+N_DAYS = 365
+RT_STEPS_PER_DAY = 288 # 5-minute real-time market
+
+
+class StandinInterface(InterfaceBase):
+    def __init__(self):
+        super().__init__()
+        self.dt = 300.0
+
+    def get_measurements(self):
+        pass
+
+    def check_controls(self):
+        pass
+
+    def send_controls(self):
+        pass
+
+
+def synthetic_prices(seed=0):
+    """Generate day-ahead (hourly) and real-time (5-minute) prices for a year."""
+    rng = np.random.default_rng(seed)
+    hours = np.arange(24)
+    daily_shape = 30 + 15 * np.sin(2 * np.pi * (hours - 8) / 24)
+    da_prices = daily_shape[None, :] + rng.normal(0, 5, (N_DAYS, 24))
+    rt_prices = (
+        np.repeat(da_prices, RT_STEPS_PER_DAY // 24, axis=1)
+        + rng.normal(0, 10, (N_DAYS, RT_STEPS_PER_DAY))
+    )
+    return da_prices, rt_prices
+
+
+def reference_compute_controls(controller, measurements_dict):
+    """Controller logic with a full sort of the day-ahead prices at every step."""
+    sorted_day_ahead_lmps = np.sort(np.array(measurements_dict["DA_LMP_24hours"]))
+    real_time_lmp = measurements_dict["RT_LMP"]
+    bottom_4 = sorted_day_ahead_lmps[3]
+    top_4 = sorted_day_ahead_lmps[-4]
+    bottom_1 = sorted_day_ahead_lmps[0]
+    top_1 = sorted_day_ahead_lmps[-1]
+    soc = measurements_dict["battery"]["state_of_charge"]
+    if real_time_lmp > top_1:
+        return {"power_setpoint": controller.rated_power_discharging}
+    elif (real_time_lmp > top_4) & (soc < controller.high_soc):
+        return {"power_setpoint": controller.rated_power_discharging}
+    elif real_time_lmp < bottom_1:
+        return {"power_setpoint": -controller.rated_power_charging}
+    elif (real_time_lmp < bottom_4) & (soc > controller.low_soc):
+        return {"power_setpoint": -controller.rated_power_charging}
+    else:
+        return {"power_setpoint": 0.0}
+
+
+def run_year(compute_controls, da_prices, rt_prices):
+    """Step through a year of prices, returning the setpoints and elapsed time."""
+    setpoints = np.zeros(rt_prices.size)
+    soc = 0.5
+    k = 0
+    t_start = time.perf_counter()
+    for day in range(N_DAYS):
+        da_list = da_prices[day].tolist()
+        for rt_lmp in rt_prices[day].tolist():
+            measurements_dict = {
+                "battery": {"state_of_charge": soc},
+                "RT_LMP": rt_lmp,
+                "DA_LMP_24hours": da_list,
+            }
+            setpoints[k] = compute_controls(measurements_dict)["power_setpoint"]
+            # Simple SOC update (10 MW, 40 MWh battery)
+            soc = min(max(soc - setpoints[k] / 40000.0 / 12, 0.0), 1.0)
+            k += 1
+    return setpoints, time.perf_counter() - t_start
+
+
+def main():
+    da_prices, rt_prices = synthetic_prices()
+    input_dict = {"battery": {"charge_rate": 10000.0, "discharge_rate": 10000.0}}
+    controller = BatteryPriceSOCController(StandinInterface(), input_dict)
+
+    setpoints_ref, t_ref = run_year(
+        lambda m: reference_compute_controls(controller, m), da_prices, rt_prices
+    )
+    setpoints, t_cached = run_year(controller.compute_controls, da_prices, rt_prices)
+
+    if not np.array_equal(setpoints, setpoints_ref):
+        raise RuntimeError("Cached controller does not match reference implementation.")
+
+    n_steps = rt_prices.size
+    print("BatteryPriceSOCController, {0} real-time steps ({1} days)".format(n_steps, N_DAYS))
+    print("  Full sort every step: {0:.3f} s ({1:.2f} us/step)".format(t_ref, t_ref/n_steps*1e6))
+    print("  Cached thresholds:    {0:.3f} s ({1:.2f} us/step)".format(
+        t_cached, t_cached/n_steps*1e6
+    ))
+    print("  Speedup: {0:.2f}x".format(t_ref / t_cached))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark how the cost of the wake steering design pipeline scales with the lookup table size.
+
+Synthetic yaw offset lookup tables (see hot_path_benchmark.synthetic_df_opt) are generated,
+so FLORIS is not run. Starting from a base table size, the number of turbines, the wind
+direction resolution, the number of wind speeds, and the number of turbulence intensities
+are each swept in turn. At each table size, the time and peak memory allocation (measured
+with tracemalloc, in a separate, untimed call) of each design transform and of the full
+pipeline are recorded:
+- check_df_opt_ordering
+- apply_wind_speed_ramps (from a table at a single wind speed to all wind speeds)
+- apply_static_rate_limits
+- compute_hysteresis_zones
+- get_yaw_angles_interpolant
+- pipeline: apply_wind_speed_ramps (followed by sorting to the ordering of df_opt),
+  apply_static_rate_limits, compute_hysteresis_zones and get_yaw_angles_interpolant, applied
+  in turn.
+
+For each sweep and operation, a scaling exponent is fit to time (and peak memory) against the
+number of table entries (rows x turbines) on log-log axes. An exponent of 1 indicates linear
+scaling; exponents above --threshold are reported as super-linear. Results are written to a
+JSON file, and the scaling curves are optionally plotted.
+
+Usage:
+    python design_pipeline_scaling_benchmark.py [--output FILE] [--plot FILE] [--quick]
+        [--threshold EXPONENT]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import numpy as np
+from hot_path_benchmark import benchmark_metadata, synthetic_df_opt
+from hycon.design_tools.wake_steering_design import (
+    apply_static_rate_limits,
+    apply_wind_speed_ramps,
+    check_df_opt_ordering,
+    compute_hysteresis_zones,
+    get_yaw_angles_interpolant,
+)
+
+# Base table size, from which each dimension is swept in turn
+BASE_SIZE = {"n_turbines": 50, "wd_resolution": 2.0, "n_ws": 12, "n_ti": 3}
+SWEEPS = {
+    "n_turbines": [10, 25, 50, 100, 200, 400],
+    "wd_resolution": [8.0, 4.0, 2.0, 1.0, 0.5],
+    "n_ws": [3, 6, 12, 24, 48],
+    "n_ti": [1, 2, 4, 8],
+}
+QUICK_SWEEPS = {
+    "n_turbines": [10, 50, 200],
+    "wd_resolution": [4.0, 2.0, 1.0],
+    "n_ws": [3, 12, 48],
+    "n_ti": [1, 3, 8],
+}
+OPERATIONS = [
+    "check_df_opt_ordering",
+    "apply_wind_speed_ramps",
+    "apply_static_rate_limits",
+    "compute_hysteresis_zones",
+    "get_yaw_angles_interpolant",
+    "pipeline",
+]
+
+
+def synthetic_tables(n_turbines, wd_resolution, n_ws, n_ti):
+    """
+    Generate synthetic yaw offset lookup tables of the given size.
+
+    Args:
+        n_turbines (int): Number of turbines.
+        wd_resolution (float): Wind direction resolution (degrees).
+        n_ws (int): Number of wind speeds, between 2 and 25 m/s.
+        n_ti (int): Number of turbulence intensities, between 0.04 and 0.20.
+
+    Returns:
+        tuple: Table for all wind speeds, table at a single wind speed (the input to
+            apply_wind_speed_ramps), and the wind speeds of the full table.
+    """
+    wind_directions = np.arange(0.0, 360.0, wd_resolution)
+    wind_speeds = np.linspace(2.0, 25.0, n_ws)
+    turbulence_intensities = (
+        np.array([0.08]) if n_ti == 1 else np.linspace(0.04, 0.20, n_ti)
+    )
+    df_opt = synthetic_df_opt(
+        n_turbines, wind_directions, wind_speeds, turbulence_intensities
+    )
+    df_opt_single_ws = synthetic_df_opt(
+        n_turbines, wind_directions, np.array([8.0]), turbulence_intensities
+    )
+    return df_opt, df_opt_single_ws, wind_speeds
+
+
+def pipeline(df_opt_single_ws, wind_speeds):
+    """
+    Apply the design transforms in turn to a table at a single wind speed.
+    """
+    df_opt = apply_wind_speed_ramps(df_opt_single_ws, wind_speeds=wind_speeds)
+    # apply_wind_speed_ramps orders by wind speed first; restore the ordering of df_opt
+    df_opt = df_opt.sort_values(
+        ["wind_direction", "wind_speed", "turbulence_intensity"], kind="stable"
+    ).reset_index(drop=True)
+    df_opt = apply_static_rate_limits(df_opt)
+    hysteresis_dict = compute_hysteresis_zones(df_opt)
+    interpolant = get_yaw_angles_interpolant(df_opt)
+    return df_opt, hysteresis_dict, interpolant
+
+
+def profile(function, n_repeats):
+    """
+    Time function, and measure its peak memory allocation.
+
+    Args:
+        function (callable): Function to profile.
+        n_repeats (int): Number of timed calls.
+
+    Returns:
+        dict: Minimum time (s) over the timed calls, and peak memory allocated (bytes) during
+            a separate call.
+    """
+    times = []
+    for _ in range(n_repeats):
+        gc.collect()
+        t_start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t_start)
+
+    # tracemalloc slows allocation, so memory is measured separately from time
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"time_s": min(times), "peak_memory_bytes": peak_memory}
+
+
+def run_sweeps(sweeps, n_repeats):
+    results = []
+    for sweep, values in sweeps.items():
+        for value in values:
+            size = {**BASE_SIZE, sweep: value}
+            df_opt, df_opt_single_ws, wind_speeds = synthetic_tables(**size)
+            n_rows = len(df_opt)
+            operations = {
+                "check_df_opt_ordering": lambda: check_df_opt_ordering(df_opt),
+                "apply_wind_speed_ramps": lambda: apply_wind_speed_ramps(
+                    df_opt_single_ws, wind_speeds=wind_speeds
+                ),
+                "apply_static_rate_limits": lambda: apply_static_rate_limits(df_opt),
+                "compute_hysteresis_zones": lambda: compute_hysteresis_zones(df_opt),
+                "get_yaw_angles_interpolant": lambda: get_yaw_angles_interpolant(df_opt),
+                "pipeline": lambda: pipeline(df_opt_single_ws, wind_speeds),
+            }
+            for operation in OPERATIONS:
+                result = {
+                    "sweep": sweep,
+                    "value": value,
+                    **size,
+                    "n_rows": n_rows,
+                    "n_entries": n_rows * size["n_turbines"],
+                    "table_nbytes": int(df_opt.memory_usage(deep=True).sum()),
+                    "operation": operation,
+                    **profile(operations[operation], n_repeats),
+                }
+                results.append(result)
+                print("{0:<14s} {1:>6g} {2:>9d} {3:<28s} {4:>10.2f} ms {5:>10.2f} MB".format(
+                    sweep, value, result["n_entries"], operation, result["time_s"] * 1e3,
+                    result["peak_memory_bytes"] / 1e6
+                ))
+    return results
+
+
+def scaling_exponents(results, threshold):
+    """
+    Fit the scaling exponents of time and peak memory against the number of table entries,
+    for each sweep and operation.
+
+    Args:
+        results (list): Results from run_sweeps.
+        threshold (float): Time exponent above which scaling is reported as super-linear.
+
+    Returns:
+        dict: Time and memory exponents, and whether scaling is super-linear, for each sweep
+            and operation.
+    """
+    scaling = {}
+    for sweep in dict.fromkeys(r["sweep"] for r in results):
+        scaling[sweep] = {}
+        for operation in OPERATIONS:
+            rs = [r for r in results if r["sweep"] == sweep and r["operation"] == operation]
+            log_entries = np.log([r["n_entries"] for r in rs])
+            if len(rs) < 2 or np.ptp(log_entries) == 0:
+                continue
+            time_exponent = np.polyfit(log_entries, np.log([r["time_s"] for r in rs]), 1)[0]
+            memory_exponent = np.polyfit(
+                log_entries, np.log([max(r["peak_memory_bytes"], 1) for r in rs]), 1
+            )[0]
+            scaling[sweep][operation] = {
+                "time_exponent": float(time_exponent),
+                "memory_exponent": float(memory_exponent),
+                "super_linear": bool(time_exponent > threshold),
+            }
+    return scaling
+
+
+def plot_scaling(results, filename):
+    """
+    Plot time and peak memory against the number of table entries for each sweep.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    sweeps = list(dict.fromkeys(r["sweep"] for r in results))
+    fig, axes = plt.subplots(2, len(sweeps), figsize=(4 * len(sweeps), 7), squeeze=False)
+    for j, sweep in enumerate(sweeps):
+        for operation in OPERATIONS:
+            rs = [r for r in results if r["sweep"] == sweep and r["operation"] == operation]
+            n_entries = [r["n_entries"] for r in rs]
+            axes[0, j].loglog(n_entries, [r["time_s"] for r in rs], marker=".", label=operation)
+            axes[1, j].loglog(
+                n_entries, [r["peak_memory_bytes"] / 1e6 for r in rs], marker=".",
+                label=operation
+            )
+        axes[0, j].set_title("Sweep over {0}".format(sweep))
+        axes[1, j].set_xlabel("Table entries (rows x turbines)")
+    axes[0, 0].set_ylabel("Time [s]")
+    axes[1, 0].set_ylabel("Peak memory [MB]")
+    axes[0, -1].legend(fontsize="small")
+    for ax in axes.flatten():
+        ax.grid(True, which="both", alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(filename)
+    print("Scaling curves saved to {0}".format(filename))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="design_pipeline_scaling_results.json",
+                        help="JSON file to write results to.")
+    parser.add_argument("--plot", default=None, help="Image file to plot scaling curves to.")
+    parser.add_argument("--quick", action="store_true",
+                        help="Use fewer table sizes and a single timed call per size.")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Time scaling exponent above which to report super-linear scaling.")
+    args = parser.parse_args(argv)
+    sweeps, n_repeats = (QUICK_SWEEPS, 1) if args.quick else (SWEEPS, 3)
+
+    results = run_sweeps(sweeps, n_repeats)
+    scaling = scaling_exponents(results, args.threshold)
+
+    print("\nScaling exponents against table entries (1 is linear):")
+    for sweep, operations in scaling.items():
+        for operation, s in operations.items():
+            print("{0:<14s} {1:<28s} time {2:5.2f}  memory {3:5.2f}{4}".format(
+                sweep, operation, s["time_exponent"], s["memory_exponent"],
+                "  SUPER-LINEAR" if s["super_linear"] else ""
+            ))
+
+    output = {
+        "metadata": {
+            **benchmark_metadata(),
+            "base_size": BASE_SIZE,
+            "n_repeats": n_repeats,
+            "threshold": args.threshold,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print("\nResults written to {0}".format(args.output))
+
+    if args.plot is not None:
+        plot_scaling(results, args.plot)
+
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+"""
+Benchmark the per-step cost of Hycon's control hot paths, and how it scales with farm size.
+
+Covers:
+- controllers: compute_controls (on pre-generated measurements) and the full
+  ControllerBase.step (interface get_measurements, compute_controls, and send_controls) of
+  every controller, at 1, 10, 100, and 500 turbines. WakeSteeringROSCOStandin, which
+  requires a ROSCO ZMQ connection, is not included.
+- interfaces: HerculesInterface get_measurements (with and without inflow estimation) and
+  send_controls.
+- interpolants: per-turbine and batched yaw offset lookups, for dense tables (at float64
+  and int16 precision) and sparse tables.
+- design_tools: the wake steering design transforms on a realistic table size (1 degree
+  wind direction resolution, 23 wind speeds, and 3 turbulence intensities for 100 turbines).
+
+Inputs are synthetic, so Hercules and FLORIS models are not required. Each benchmark is
+timed over repeated batches of calls; the median and minimum time per call over the batches
+are reported. Results are written to a JSON file, along with the versions of Hycon, Python,
+numpy, and the platform, so that results from different versions can be compared with
+--compare.
+
+Usage:
+    python hot_path_benchmark.py [--output FILE] [--compare FILE] [--quick]
+        [--n-turbines N [N ...]] [--groups GROUP [GROUP ...]]
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from importlib.metadata import version
+
+import numpy as np
+import pandas as pd
+from hycon.controllers import (
+    BatteryArbitrageController,
+    BatteryController,
+    BatteryPassthroughController,
+    BatteryPriceSOCController,
+    HybridSupervisoryControllerBaseline,
+    HybridSupervisoryControllerMPC,
+    HybridSupervisoryControllerMultiRef,
+    HydrogenPlantController,
+    LookupBasedWakeSteeringController,
+    SolarPassthroughController,
+    WindFarmPowerDistributingController,
+    WindFarmPowerTrackingController,
+    YawScheduler,
+)
+from hycon.design_tools.wake_steering_design import (
+    apply_static_rate_limits,
+    apply_wind_speed_ramps,
+    apply_wind_speed_ramps_dense,
+    check_df_opt_ordering,
+    compute_hysteresis_zones,
+    get_sparse_yaw_angles_interpolant,
+    get_yaw_angles_interpolant,
+    quantization_error_report,
+)
+from hycon.interfaces import HerculesInterface
+
+N_TURBINES = [1, 10, 100, 500]
+GROUPS = ["controllers", "interfaces", "interpolants", "design_tools"]
+TURBINE_RATING = 5000.0 # kW
+
+
+class BenchmarkInterface(HerculesInterface):
+    """
+    HerculesInterface that accepts the controls of any controller, so that
+    ControllerBase.step can be timed for all controllers (HerculesInterface only accepts the
+    setpoints of plant-level controllers). Controls are stored in the output dictionary.
+    """
+    def check_controls(self, controls_dict):
+        pass
+
+    def send_controls(self, h_dict, **controls):
+        h_dict["controls"] = controls
+        return h_dict
+
+
+def synthetic_df_opt(
+    n_turbines,
+    wind_directions=np.arange(0.0, 360.0, 1.0),
+    wind_speeds=np.arange(3.0, 26.0, 1.0),
+    turbulence_intensities=np.array([0.04, 0.08, 0.12]),
+    n_sectors=2,
+    sector_width=20.0,
+    maximum_offset=25.0,
+    seed=0,
+):
+    """
+    Generate a yaw offset lookup table with the structure of an optimized table: each turbine
+    has nonzero offsets only within n_sectors waked wind direction sectors, in which the offset
+    ramps up to +/- maximum_offset either side of a sign change at the sector center. Offsets
+    decrease with wind speed above 10 m/s and with turbulence intensity.
+
+    Args:
+        n_turbines (int): Number of turbines.
+        wind_directions (np.ndarray): Wind directions (degrees) of the table.
+        wind_speeds (np.ndarray): Wind speeds (m/s) of the table.
+        turbulence_intensities (np.ndarray): Turbulence intensities of the table.
+        n_sectors (int): Number of waked sectors of each turbine. Defaults to 2.
+        sector_width (float): Width (degrees) of each waked sector. Defaults to 20.
+        maximum_offset (float): Maximum yaw offset (degrees). Defaults to 25.
+        seed (int): Random seed for the sector centers. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: Yaw offset lookup table df_opt.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0.0, 360.0, (n_sectors, n_turbines))
+
+    # Offsets as a function of wind direction, for each turbine
+    offsets_wd = np.zeros((len(wind_directions), n_turbines))
+    for c in centers:
+        d = (wind_directions[:, None] - c[None, :] + 180.0) % 360.0 - 180.0
+        offsets_wd += np.where(
+            np.abs(d) < sector_width / 2,
+            -np.sign(d) * maximum_offset * (1 - np.abs(d) / (sector_width / 2)),
+            0.0
+        )
+    ws_factor = np.clip((15.0 - wind_speeds) / 5.0, 0.0, 1.0)
+    ti_factor = 1.0 - 2.0 * (turbulence_intensities - turbulence_intensities.min())
+    yaw_offsets = (
+        offsets_wd[:, None, None, :] * ws_factor[None, :, None, None]
+        * ti_factor[None, None, :, None]
+    )
+
+    wd_grid, ws_grid, ti_grid = np.meshgrid(
+        wind_directions, wind_speeds, turbulence_intensities, indexing="ij"
+    )
+    return pd.DataFrame({
+        "wind_direction": wd_grid.flatten(),
+        "wind_speed": ws_grid.flatten(),
+        "turbulence_intensity": ti_grid.flatten(),
+        "yaw_angles_opt": list(yaw_offsets.reshape(-1, n_turbines)),
+    })
+
+
+def hercules_dict(n_turbines, seed=0):
+    """
+    Generate a Hercules v2 input dictionary for a wind/solar/battery/hydrogen plant with
+    n_turbines turbines, with per-turbine inflow measurements and external signals for all
+    controllers.
+    """
+    rng = np.random.default_rng(seed)
+    capacity = TURBINE_RATING * n_turbines
+    turbine_available_powers = rng.uniform(0.5, 1.0, n_turbines) * TURBINE_RATING
+    external_signals = {
+        "plant_power_reference": 0.8 * capacity,
+        "wind_power_reference": 0.7 * capacity,
+        "solar_power_reference": 0.05 * capacity,
+        "battery_power_reference": 0.05 * capacity,
+        "hydrogen_reference": 0.02,
+        "lmp_rt": 35.0,
+        "wind_power_forecast_0": 0.75 * capacity,
+        "solar_power_forecast_0": 0.05 * capacity,
+    }
+    da_prices = 30 + 15 * np.sin(2 * np.pi * (np.arange(24) - 8) / 24)
+    for h, price in enumerate(da_prices):
+        external_signals["lmp_da_{:02d}".format(h)] = float(price)
+
+    return {
+        "dt": 1.0,
+        "time": 0.0,
+        "plant": {
+            "interconnect_limit": capacity,
+            "n_turbines": n_turbines, # Used by LookupBasedWakeSteeringController
+        },
+        "controller": {
+            "initial_conditions": {"yaw": 270.0},
+            "nominal_plant_power_kW": capacity,
+            "nominal_hydrogen_rate_kgps": 0.1,
+            "hydrogen_controller_gain": 1.0,
+        },
+        "wind_farm": {
+            "n_turbines": n_turbines,
+            "capacity": capacity,
+            "wind_direction_mean": 270.0,
+            "wind_speed": 8.0,
+            "turbulence_intensity": 0.08,
+            "turbine_wind_directions": (270.0 + rng.normal(0.0, 3.0, n_turbines)).tolist(),
+            "turbine_wind_speeds": (8.0 + rng.normal(0.0, 0.5, n_turbines)).tolist(),
+            "turbine_powers": (0.9 * turbine_available_powers).tolist(),
+            "turbine_available_powers": turbine_available_powers.tolist(),
+        },
+        "solar_farm": {"capacity": 0.1 * capacity, "power": 0.05 * capacity, "dni": 800.0,
+                       "aoi": 30.0},
+        "battery": {
+            "size": 0.1 * capacity,
+            "energy_capacity": 0.4 * capacity,
+            "power": 0.0,
+            "soc": 0.5,
+            "charge_rate": 0.1 * capacity,
+            "discharge_rate": 0.1 * capacity,
+        },
+        "electrolyzer": {"H2_mfr": 0.03},
+        "external_signals": external_signals,
+    }
+
+
+def time_per_call(function, make_args=None, min_time=0.1, n_repeats=5):
+    """
+    Time function over n_repeats batches of calls, each batch lasting approximately
+    min_time seconds.
+
+    Args:
+        function (callable): Function to time.
+        make_args (callable, optional): Function returning a tuple of arguments for each
+            call, generated before each batch is timed. Defaults to None (no arguments).
+        min_time (float): Approximate duration (s) of each batch. Defaults to 0.1.
+        n_repeats (int): Number of batches. Defaults to 5.
+
+    Returns:
+        dict: Median and minimum time per call (us) over the batches, and the number of calls
+            per batch.
+    """
+    make_args = (lambda: ()) if make_args is None else make_args
+
+    # Estimate the number of calls per batch from a single call (after a warm up call)
+    function(*make_args())
+    args = make_args()
+    t_start = time.perf_counter()
+    function(*args)
+    n_calls = int(np.clip(min_time / max(time.perf_counter() - t_start, 1e-7), 1, 100000))
+
+    batch_times = []
+    for _ in range(n_repeats):
+        args_list = [make_args() for _ in range(n_calls)]
+        t_start = time.perf_counter()
+        for args in args_list:
+            function(*args)
+        batch_times.append((time.perf_counter() - t_start) / n_calls)
+
+    return {
+        "median_us": float(np.median(batch_times) * 1e6),
+        "min_us": float(np.min(batch_times) * 1e6),
+        "n_calls": n_calls,
+    }
+
+
+def build_controllers(n_turbines):
+    """
+    Instantiate each controller for a plant with n_turbines turbines.
+
+    Returns:
+        dict: For each controller name, a tuple of the controller and its input dictionary.
+    """
+    df_opt = synthetic_df_opt(
+        n_turbines,
+        wind_directions=np.arange(0.0, 360.0, 2.0),
+        wind_speeds=np.arange(3.0, 16.0, 1.0),
+        turbulence_intensities=np.array([0.06, 0.10]),
+    )
+
+    def plant(drop_signals=()):
+        h_dict = hercules_dict(n_turbines)
+        for k in drop_signals:
+            del h_dict["external_signals"][k]
+        return BenchmarkInterface(h_dict), h_dict
+
+    def hybrid(controller_class, interface, h_dict, **kwargs):
+        return controller_class(
+            interface,
+            h_dict,
+            wind_controller=WindFarmPowerTrackingController(interface, h_dict),
+            solar_controller=SolarPassthroughController(interface, h_dict),
+            battery_controller=BatteryPassthroughController(interface, h_dict),
+            **kwargs
+        )
+
+    controllers = {}
+    interface, h_dict = plant()
+    controllers["WindFarmPowerTrackingController"] = (
+        WindFarmPowerTrackingController(interface, h_dict, integral_gain=0.1), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["WindFarmPowerDistributingController"] = (
+        WindFarmPowerDistributingController(
+            interface, h_dict, distribution_mode="available_power"
+        ),
+        h_dict
+    )
+    interface, h_dict = plant()
+    controllers["LookupBasedWakeSteeringController"] = (
+        LookupBasedWakeSteeringController(interface, h_dict, df_yaw=df_opt), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["LookupBasedWakeSteeringController (sparse, scheduled)"] = (
+        LookupBasedWakeSteeringController(
+            interface,
+            h_dict,
+            df_yaw=df_opt,
+            hysteresis_dict=compute_hysteresis_zones(df_opt),
+            yaw_scheduler=YawScheduler(1.0, n_turbines, deadband=2.0, maximum_yaw_rate=0.3),
+            sparse_table=True,
+        ),
+        h_dict
+    )
+    interface, h_dict = plant()
+    controllers["SolarPassthroughController"] = (
+        SolarPassthroughController(interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["BatteryPassthroughController"] = (
+        BatteryPassthroughController(interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["BatteryController"] = (BatteryController(interface, h_dict), h_dict)
+    interface, h_dict = plant()
+    controllers["BatteryPriceSOCController"] = (
+        BatteryPriceSOCController(interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["BatteryArbitrageController"] = (
+        BatteryArbitrageController(interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["HybridSupervisoryControllerBaseline"] = (
+        hybrid(HybridSupervisoryControllerBaseline, interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["HybridSupervisoryControllerMultiRef"] = (
+        hybrid(HybridSupervisoryControllerMultiRef, interface, h_dict), h_dict
+    )
+    interface, h_dict = plant()
+    controllers["HybridSupervisoryControllerMPC"] = (
+        hybrid(HybridSupervisoryControllerMPC, interface, h_dict), h_dict
+    )
+    # The hydrogen controller passes its own power reference to the generator controller
+    interface, h_dict = plant(drop_signals=["wind_power_reference", "solar_power_reference",
+                                            "battery_power_reference"])
+    controllers["HydrogenPlantController"] = (
+        HydrogenPlantController(
+            interface,
+            h_dict,
+            generator_controller=hybrid(HybridSupervisoryControllerBaseline, interface, h_dict),
+        ),
+        h_dict
+    )
+
+    return controllers
+
+
+def benchmark_controllers(n_turbines_list, min_time, n_repeats):
+    results = []
+    for n_turbines in n_turbines_list:
+        for name, (controller, h_dict) in build_controllers(n_turbines).items():
+            interface = controller._s
+            results.append({
+                "group": "controllers",
+                "name": name,
+                "operation": "compute_controls",
+                "n_turbines": n_turbines,
+                **time_per_call(
+                    controller.compute_controls,
+                    lambda: (interface.get_measurements(h_dict),),
+                    min_time,
+                    n_repeats
+                ),
+            })
+            results.append({
+                "group": "controllers",
+                "name": name,
+                "operation": "step",
+                "n_turbines": n_turbines,
+                **time_per_call(controller.step, lambda: (h_dict,), min_time, n_repeats),
+            })
+            print_result(results[-2])
+            print_result(results[-1])
+    return results
+
+
+def benchmark_interfaces(n_turbines_list, min_time, n_repeats):
+    results = []
+    for n_turbines in n_turbines_list:
+        h_dict = hercules_dict(n_turbines)
+        setpoints = [TURBINE_RATING] * n_turbines
+        interface = HerculesInterface(h_dict)
+        cases = {
+            ("HerculesInterface", "get_measurements"): (
+                HerculesInterface(h_dict).get_measurements, (h_dict,)
+            ),
+            ("HerculesInterface (inflow_window=60)", "get_measurements"): (
+                HerculesInterface(h_dict, inflow_window=60.0).get_measurements, (h_dict,)
+            ),
+            ("HerculesInterface", "send_controls"): (
+                lambda h: interface.send_controls(
+                    h, wind_power_setpoints=setpoints, solar_power_setpoint=0.0,
+                    battery_power_setpoint=0.0
+                ),
+                (h_dict,)
+            ),
+        }
+        for (name, operation), (function, args) in cases.items():
+            results.append({
+                "group": "interfaces",
+                "name": name,
+                "operation": operation,
+                "n_turbines": n_turbines,
+                **time_per_call(function, lambda: args, min_time, n_repeats),
+            })
+            print_result(results[-1])
+    return results
+
+
+def benchmark_interpolants(n_turbines_list, min_time, n_repeats, n_batch=1000):
+    results = []
+    rng = np.random.default_rng(0)
+    for n_turbines in n_turbines_list:
+        df_opt = synthetic_df_opt(n_turbines)
+        interpolants = {
+            "dense (float64)": get_yaw_angles_interpolant(df_opt),
+            "dense (int16)": get_yaw_angles_interpolant(df_opt, precision="int16"),
+            "sparse (float64)": get_sparse_yaw_angles_interpolant(df_opt),
+        }
+        wd_turbines = rng.uniform(0.0, 360.0, n_turbines)
+        ws_turbines = rng.uniform(3.0, 25.0, n_turbines)
+        ti_turbines = rng.uniform(0.04, 0.12, n_turbines)
+        wd_batch = rng.uniform(0.0, 360.0, n_batch)
+        ws_batch = rng.uniform(3.0, 25.0, n_batch)
+        ti_batch = rng.uniform(0.04, 0.12, n_batch)
+        for name, interpolant in interpolants.items():
+            results.append({
+                "group": "interpolants",
+                "name": name,
+                "operation": "per_turbine_query",
+                "n_turbines": n_turbines,
+                **time_per_call(
+                    lambda: interpolant(wd_turbines, ws_turbines, ti_turbines, per_turbine=True),
+                    None, min_time, n_repeats
+                ),
+            })
+            print_result(results[-1])
+            result = {
+                "group": "interpolants",
+                "name": name,
+                "operation": "batch_query_{0}".format(n_batch),
+                "n_turbines": n_turbines,
+                **time_per_call(
+                    lambda: interpolant(wd_batch, ws_batch, ti_batch), None, min_time, n_repeats
+                ),
+            }
+            result["queries_per_s"] = n_batch / (result["median_us"] * 1e-6)
+            results.append(result)
+            print_result(results[-1])
+    return results
+
+
+def benchmark_design_tools(min_time, n_repeats, n_turbines=100):
+    df_opt = synthetic_df_opt(n_turbines)
+    df_opt_single_ws = synthetic_df_opt(n_turbines, wind_speeds=np.array([8.0]))
+    operations = {
+        "check_df_opt_ordering": lambda: check_df_opt_ordering(df_opt),
+        "apply_static_rate_limits": lambda: apply_static_rate_limits(df_opt),
+        "compute_hysteresis_zones": lambda: compute_hysteresis_zones(df_opt),
+        "apply_wind_speed_ramps": lambda: apply_wind_speed_ramps(df_opt_single_ws),
+        "apply_wind_speed_ramps_dense": lambda: apply_wind_speed_ramps_dense(df_opt_single_ws),
+        "get_yaw_angles_interpolant": lambda: get_yaw_angles_interpolant(df_opt),
+        "get_sparse_yaw_angles_interpolant": lambda: get_sparse_yaw_angles_interpolant(df_opt),
+        "quantization_error_report": lambda: quantization_error_report(df_opt),
+    }
+    table_size = "{0} x {1} x {2}".format(
+        *(df_opt[c].nunique() for c in ["wind_direction", "wind_speed", "turbulence_intensity"])
+    )
+
+    results = []
+    for name, function in operations.items():
+        results.append({
+            "group": "design_tools",
+            "name": name,
+            "operation": "call",
+            "n_turbines": n_turbines,
+            "table_size": table_size,
+            **time_per_call(function, None, min_time, n_repeats),
+        })
+        print_result(results[-1])
+    return results
+
+
+def benchmark_metadata():
+    """
+    Versions of Hycon and its core dependencies, and the platform, to store with results.
+    """
+    return {
+        "hycon_version": version("hycon"),
+        "python_version": sys.version.split()[0],
+        "numpy_version": np.__version__,
+        "pandas_version": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def print_result(result):
+    print("{0:<14s} {1:<56s} {2:<22s} {3:>5d} {4:>12.1f} us".format(
+        result["group"], result["name"], result["operation"], result["n_turbines"],
+        result["median_us"]
+    ))
+
+
+def result_key(result):
+    return (result["group"], result["name"], result["operation"], result["n_turbines"])
+
+
+def compare(results, baseline_results):
+    """
+    Print the ratio of the median time per call of each result to that of the matching
+    baseline result.
+    """
+    baseline = {result_key(r): r for r in baseline_results}
+    print("\nComparison with baseline (ratio > 1 is slower):")
+    for result in results:
+        key = result_key(result)
+        if key in baseline:
+            print("{0:<14s} {1:<56s} {2:<22s} {3:>5d} {4:>8.2f}".format(
+                *key, result["median_us"] / baseline[key]["median_us"]
+            ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="hot_path_benchmark_results.json",
+                        help="JSON file to write results to.")
+    parser.add_argument("--compare", default=None,
+                        help="JSON file of baseline results to compare against.")
+    parser.add_argument("--quick", action="store_true",
+                        help="Use shorter and fewer timing batches.")
+    parser.add_argument("--n-turbines", type=int, nargs="+", default=N_TURBINES,
+                        help="Farm sizes to benchmark.")
+    parser.add_argument("--groups", nargs="+", default=GROUPS, choices=GROUPS,
+                        help="Benchmark groups to run.")
+    args = parser.parse_args(argv)
+    min_time, n_repeats = (0.02, 3) if args.quick else (0.1, 5)
+
+    results = []
+    if "controllers" in args.groups:
+        results += benchmark_controllers(args.n_turbines, min_time, n_repeats)
+    if "interfaces" in args.groups:
+        results += benchmark_interfaces(args.n_turbines, min_time, n_repeats)
+    if "interpolants" in args.groups:
+        results += benchmark_interpolants(args.n_turbines, min_time, n_repeats)
+    if "design_tools" in args.groups:
+        results += benchmark_design_tools(min_time, n_repeats)
+
+    output = {
+        "metadata": {**benchmark_metadata(), "min_time": min_time, "n_repeats": n_repeats},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print("\nResults written to {0}".format(args.output))
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark HybridSupervisoryControllerMPC solve times for a range of horizons.
+
+Runs the supervisory controller for an hour of 1-second steps on a simple
+wind/solar/battery plant, where the available wind and solar power follow
+synthetic random walks and the plant power reference steps every 5 minutes.
+Reports the solve time and number of ADMM iterations per step, the number of
+fallbacks to the baseline logic, and the reference tracking error, alongside the
+per-step cost of HybridSupervisoryControllerBaseline. Hercules is not required.
+
+Usage:
+    python hybrid_mpc_benchmark.py
+"""
+
+import time
+
+import numpy as np
+from hycon.controllers import (
+    BatteryPassthroughController,
+    HybridSupervisoryControllerBaseline,
+    HybridSupervisoryControllerMPC,
+    SolarPassthroughController,
+    WindFarmPowerTrackingController,
+)
+from hycon.interfaces import HerculesInterface
+
+N_STEPS = 3600
+N_TURBINES = 10
+
+h_dict = {
+    "dt": 1.0,
+    "time": 0.0,
+    "plant": {"interconnect_limit": 40000.0},
+    "controller": {},
+    "wind_farm": {
+        "n_turbines": N_TURBINES,
+        "capacity": 50000.0,
+        "wind_direction_mean": 270.0,
+        "turbine_powers": [3000.0] * N_TURBINES,
+    },
+    "solar_farm": {"capacity": 10000.0, "power": 5000.0, "dni": 800.0, "aoi": 30.0},
+    "battery": {
+        "size": 20000.0,
+        "energy_capacity": 80000.0,
+        "power": 0.0,
+        "soc": 0.5,
+        "charge_rate": 20000.0,
+        "discharge_rate": 20000.0,
+    },
+    "external_signals": {"plant_power_reference": 30000.0},
+}
+
+
+def synthetic_signals(seed=0):
+    """Generate available wind and solar power and the plant power reference."""
+    rng = np.random.default_rng(seed)
+    wind_available = np.clip(
+        35000.0 + np.cumsum(rng.normal(0.0, 200.0, N_STEPS)), 0.0, 50000.0
+    )
+    solar_available = np.clip(
+        6000.0 + np.cumsum(rng.normal(0.0, 50.0, N_STEPS)), 0.0, 10000.0
+    )
+    plant_power_reference = np.repeat(
+        rng.uniform(10000.0, 45000.0, N_STEPS // 300 + 1), 300
+    )[:N_STEPS]
+    return wind_available, solar_available, plant_power_reference
+
+
+def run(controller_class, controller_parameters=None):
+    wind_available, solar_available, plant_power_reference = synthetic_signals()
+    interface = HerculesInterface(h_dict)
+    kwargs = {} if controller_parameters is None else {
+        "controller_parameters": controller_parameters
+    }
+    controller = controller_class(
+        interface,
+        h_dict,
+        wind_controller=WindFarmPowerTrackingController(interface, h_dict),
+        solar_controller=SolarPassthroughController(interface, h_dict),
+        battery_controller=BatteryPassthroughController(interface, h_dict),
+        **kwargs
+    )
+
+    soc = 0.5
+    wind_power, solar_power, battery_power = 30000.0, 5000.0, 0.0
+    solve_times, iterations, tracking_errors = [], [], []
+    for k in range(N_STEPS):
+        measurements_dict = {
+            "time": float(k),
+            "wind_farm": {
+                "turbine_powers": [wind_power / N_TURBINES] * N_TURBINES,
+                "turbine_available_powers": [wind_available[k] / N_TURBINES] * N_TURBINES,
+            },
+            "solar_farm": {"power": solar_power},
+            "battery": {"power": battery_power, "state_of_charge": soc},
+            "plant_power_reference": plant_power_reference[k],
+            "forecast": {},
+        }
+
+        t_start = time.perf_counter()
+        wind_ref, solar_ref, battery_ref = controller.supervisory_control(measurements_dict)
+        solve_times.append(time.perf_counter() - t_start)
+        iterations.append(getattr(controller, "solve_iterations", 0))
+
+        # Simple plant response
+        wind_power = min(max(wind_ref, 0.0), wind_available[k])
+        solar_power = min(max(solar_ref, 0.0), solar_available[k])
+        battery_power = min(max(battery_ref, -20000.0), 20000.0)
+        soc = min(max(soc - battery_power / 80000.0 / 3600.0, 0.0), 1.0)
+        tracking_errors.append(
+            abs(wind_power + solar_power + battery_power - min(plant_power_reference[k], 40000.0))
+        )
+
+    return controller, np.array(solve_times), np.array(iterations), np.array(tracking_errors)
+
+
+def main():
+    _, solve_times, _, tracking_errors = run(HybridSupervisoryControllerBaseline)
+    print("HybridSupervisoryControllerBaseline")
+    print("  Step time: mean {0:.1f} us, max {1:.1f} us; mean tracking error {2:.0f} kW".format(
+        solve_times.mean() * 1e6, solve_times.max() * 1e6, tracking_errors.mean()
+    ))
+
+    for horizon in [5, 10, 20, 40]:
+        controller, solve_times, iterations, tracking_errors = run(
+            HybridSupervisoryControllerMPC, {"horizon": horizon}
+        )
+        print("HybridSupervisoryControllerMPC, horizon = {0}".format(horizon))
+        print(
+            "  Step time: mean {0:.3f} ms, p99 {1:.3f} ms, max {2:.3f} ms".format(
+                solve_times.mean() * 1e3,
+                np.percentile(solve_times, 99) * 1e3,
+                solve_times.max() * 1e3,
+            )
+        )
+        print(
+            "  Iterations: mean {0:.0f}, max {1:d}; fallbacks {2:d}/{3:d};".format(
+                iterations.mean(), iterations.max(), controller.n_fallbacks, N_STEPS
+            )
+            + " mean tracking error {0:.0f} kW".format(tracking_errors.mean())
+        )
+
+
+if __name__ == "__main__":
+    main()
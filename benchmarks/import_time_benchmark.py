@@ -0,0 +1,64 @@
+"""
+Benchmark the import time of each Hycon controller and interface class.
+
+Each class is imported in a fresh Python process using `python -X importtime`,
+and the total import time (the sum of the self times of all modules imported) is
+reported, along with which of the heavier optional dependencies (FLORIS, pandas,
+scipy, matplotlib, zmq) were loaded. The time to import numpy alone is reported
+as a reference, since all Hycon modules depend on numpy.
+
+Usage:
+    python import_time_benchmark.py [n_repeats]
+"""
+
+import subprocess
+import sys
+
+import hycon.controllers
+import hycon.interfaces
+
+HEAVY_DEPENDENCIES = ["floris", "pandas", "scipy", "matplotlib", "zmq"]
+
+
+def import_time(statement):
+    """
+    Run statement in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: Total import time (ms) and list of heavy dependencies imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    top_level_modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        top_level_modules.add(module.strip().split(".")[0])
+    return total_us / 1e3, [d for d in HEAVY_DEPENDENCIES if d in top_level_modules]
+
+
+def main(n_repeats=3):
+    statements = {"numpy (reference)": "import numpy"}
+    for name in hycon.controllers.__all__:
+        statements[name] = "from hycon.controllers import " + name
+    for name in hycon.interfaces.__all__:
+        statements[name] = "from hycon.interfaces import " + name
+
+    print("{0:<38s} {1:>10s}  {2}".format("Import", "Time [ms]", "Heavy dependencies loaded"))
+    for name, statement in statements.items():
+        # Take the fastest of several repeats to reduce the effect of file system caching
+        times, dependencies = zip(*[import_time(statement) for _ in range(n_repeats)])
+        print("{0:<38s} {1:>10.1f}  {2}".format(
+            name, min(times), ", ".join(dependencies[0]) or "-"
+        ))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,103 @@
+"""
+Angle arithmetic for wind directions, yaw angles, and nacelle headings (all in degrees).
+
+Functions accept scalars, for which plain Python arithmetic is used, or array-likes, for which
+numpy is used. Array functions accept an optional out argument, which may be the input array
+itself to operate in place.
+"""
+
+import numpy as np
+
+
+def wrap_180(x, out=None):
+    """
+    Shift the given angles to within the range [-180, 180).
+
+    Args:
+        x (float or array-like): Angle(s) to shift.
+        out (np.ndarray, optional): Array to store the result in. Defaults to None.
+
+    Returns:
+        float or np.ndarray: Shifted angle(s).
+    """
+    if isinstance(x, (float, int)) and out is None:
+        return ((x + 180.0) % 360.0) - 180.0
+    out = np.add(x, 180.0, out=out)
+    np.mod(out, 360.0, out=out)
+    return np.subtract(out, 180.0, out=out)
+
+
+def wrap_360(x, out=None):
+    """
+    Shift the given angles to within the range [0, 360).
+
+    Args:
+        x (float or array-like): Angle(s) to shift.
+        out (np.ndarray, optional): Array to store the result in. Defaults to None.
+
+    Returns:
+        float or np.ndarray: Shifted angle(s).
+    """
+    if isinstance(x, (float, int)) and out is None:
+        return x % 360.0
+    return np.mod(x, 360.0, out=out)
+
+
+def angle_difference(x, y, out=None):
+    """
+    Compute the signed circular difference x - y, within the range [-180, 180).
+
+    Args:
+        x (float or array-like): Angle(s).
+        y (float or array-like): Angle(s) to subtract.
+        out (np.ndarray, optional): Array to store the result in. Defaults to None.
+
+    Returns:
+        float or np.ndarray: Circular difference(s).
+    """
+    if isinstance(x, (float, int)) and isinstance(y, (float, int)) and out is None:
+        return ((x - y + 180.0) % 360.0) - 180.0
+    out = np.subtract(x, y, out=out)
+    return wrap_180(out, out=out)
+
+
+def circular_mean(x, axis=None, weights=None):
+    """
+    Compute the (weighted) circular mean of angles, within the range [0, 360).
+
+    Args:
+        x (array-like): Angles.
+        axis (int, optional): Axis along which to average. Defaults to None, in which case all
+            angles are averaged.
+        weights (array-like, optional): Weights of the angles. Defaults to None (equal
+            weights).
+
+    Returns:
+        float or np.ndarray: Circular mean(s).
+    """
+    x_rad = np.deg2rad(x)
+    mean_sin = np.average(np.sin(x_rad), axis=axis, weights=weights)
+    mean_cos = np.average(np.cos(x_rad), axis=axis, weights=weights)
+    mean = wrap_360(np.rad2deg(np.arctan2(mean_sin, mean_cos)))
+    return float(mean) if np.ndim(mean) == 0 else mean
+
+
+def in_sector(x, lower, upper):
+    """
+    Determine whether angles lie strictly within the sector from lower to upper (moving in
+    the direction of increasing angle). Sectors may span the 0/360 degree point, in which case
+    lower > upper.
+
+    Args:
+        x (float or array-like): Angle(s) to test.
+        lower (float or array-like): Lower bound(s) of the sector.
+        upper (float or array-like): Upper bound(s) of the sector.
+
+    Returns:
+        bool or np.ndarray: True where x is within the sector.
+    """
+    if (isinstance(x, (float, int)) and isinstance(lower, (float, int))
+        and isinstance(upper, (float, int))):
+        return 0.0 < (x - lower) % 360.0 < (upper - lower) % 360.0
+    offset = wrap_360(np.subtract(x, lower))
+    return (offset > 0.0) & (offset < wrap_360(np.subtract(upper, lower)))
@@ -1,19 +1,36 @@
-from hycon.controllers.battery_controller import (
-    BatteryController,
-    BatteryPassthroughController,
-    BatteryPriceSOCController,
-)
-from hycon.controllers.hybrid_supervisory_controller import (
-    HybridSupervisoryControllerBaseline,
-    HybridSupervisoryControllerMultiRef,
-)
-from hycon.controllers.hydrogen_plant_controller import HydrogenPlantController
-from hycon.controllers.lookup_based_wake_steering_controller import (
-    LookupBasedWakeSteeringController,
-)
-from hycon.controllers.solar_passthrough_controller import SolarPassthroughController
-from hycon.controllers.wake_steering_rosco_standin import WakeSteeringROSCOStandin
-from hycon.controllers.wind_farm_power_tracking_controller import (
-    WindFarmPowerDistributingController,
-    WindFarmPowerTrackingController,
-)
+import importlib
+
+# Controllers are imported on first access (see __getattr__), so that importing a controller
+# only loads its own dependencies (for example, FLORIS is only loaded for the wake steering
+# controllers)
+_CONTROLLER_MODULES = {
+    "BatteryArbitrageController": "hycon.controllers.battery_controller",
+    "BatteryController": "hycon.controllers.battery_controller",
+    "BatteryPassthroughController": "hycon.controllers.battery_controller",
+    "BatteryPriceSOCController": "hycon.controllers.battery_controller",
+    "FilterBank": "hycon.controllers.filter_bank",
+    "HybridSupervisoryControllerBaseline": "hycon.controllers.hybrid_supervisory_controller",
+    "HybridSupervisoryControllerMPC": "hycon.controllers.hybrid_supervisory_controller",
+    "HybridSupervisoryControllerMultiRef": "hycon.controllers.hybrid_supervisory_controller",
+    "HydrogenPlantController": "hycon.controllers.hydrogen_plant_controller",
+    "LookupBasedWakeSteeringController": "hycon.controllers.lookup_based_wake_steering_controller",
+    "SolarPassthroughController": "hycon.controllers.solar_passthrough_controller",
+    "WakeSteeringROSCOStandin": "hycon.controllers.wake_steering_rosco_standin",
+    "WindFarmPowerDistributingController": "hycon.controllers.wind_farm_power_tracking_controller",
+    "WindFarmPowerTrackingController": "hycon.controllers.wind_farm_power_tracking_controller",
+    "YawScheduler": "hycon.controllers.yaw_scheduler",
+}
+
+__all__ = list(_CONTROLLER_MODULES.keys())
+
+
+def __getattr__(name):
+    if name in _CONTROLLER_MODULES:
+        value = getattr(importlib.import_module(_CONTROLLER_MODULES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
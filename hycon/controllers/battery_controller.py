@@ -1,6 +1,10 @@
 import numpy as np
 
-from hycon.controllers.controller_base import ControllerBase
+from hycon.controllers.controller_base import (
+    ControllerBase,
+    timeseries_column,
+    timeseries_length,
+)
 
 
 class BatteryController(ControllerBase):
@@ -128,6 +132,65 @@ class BatteryController(ControllerBase):
 
         return controls_dict
 
+    def replay(self, measurements_timeseries):
+        """
+        Vectorized replay for BatteryController (see ControllerBase.replay).
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+
+        power_setpoints = self.power_setpoint_timeseries(
+            reference_power=timeseries_column(
+                measurements_timeseries["battery"]["power_reference"], n_steps
+            ),
+            current_power=timeseries_column(measurements_timeseries["battery"]["power"], n_steps),
+            soc=timeseries_column(measurements_timeseries["battery"]["state_of_charge"], n_steps),
+        )
+
+        return {"power_setpoint": power_setpoints}
+
+    def power_setpoint_timeseries(self, reference_power, current_power, soc):
+        """
+        Apply the controller to whole time series of reference power, current
+        power, and state of charge in a single pass.
+
+        The state recursion x[k+1] = a x[k] + b e[k] is evaluated as a linear
+        filter over the error sequence (scipy.signal.lfilter), initialized from
+        the current controller state. The output is identical to that produced
+        by repeated calls to compute_controls, and the controller internal
+        state is updated accordingly.
+
+        Args:
+            reference_power (np.ndarray): Reference power at each time step.
+            current_power (np.ndarray): Battery power at each time step.
+            soc (np.ndarray): Battery state of charge at each time step.
+
+        Returns:
+            np.ndarray: Battery power setpoint at each time step.
+        """
+        current_power = np.asarray(current_power, dtype=float)
+        if current_power.size == 0:
+            return current_power.copy()
+
+        # Apply reference clipping
+        reference_power = self.soc_clipping(np.asarray(soc, dtype=float), reference_power)
+
+        e = reference_power - current_power
+
+        # scipy.signal is slow to import, so is only imported where needed
+        from scipy.signal import lfilter
+
+        # States x[1], ..., x[N], with initial condition x[0] = self.x
+        x_next, _ = lfilter([self.b], [1.0, -self.a], e, zi=[self.a * self.x])
+        x = np.concatenate(([self.x], x_next[:-1]))
+
+        # Compute control
+        u = self.c * x + self.d * e
+
+        # Update controller internal state
+        self.x = float(x_next[-1])
+
+        return current_power + u
+
 class BatteryPassthroughController(ControllerBase):
     """
     Simply passes power reference down to (single) battery.
@@ -144,6 +207,17 @@ class BatteryPassthroughController(ControllerBase):
         """
         return {"power_setpoint": measurements_dict["battery"]["power_reference"]}
 
+    def replay(self, measurements_timeseries):
+        """
+        Vectorized replay for BatteryPassthroughController (see ControllerBase.replay).
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+        return {
+            "power_setpoint": timeseries_column(
+                measurements_timeseries["battery"]["power_reference"], n_steps
+            ).copy()
+        }
+
 
 class BatteryPriceSOCController(ControllerBase):
     """
@@ -171,6 +245,8 @@ class BatteryPriceSOCController(ControllerBase):
         self,
         high_soc=0.8,
         low_soc=0.2,
+        threshold_rank=4,
+        extreme_rank=1,
         **_ # <- Allows arbitrary additional parameters to be passed, which are ignored
     ):
         """
@@ -182,24 +258,80 @@ class BatteryPriceSOCController(ControllerBase):
         low_soc is the SOC threshold below which the battery will only discharge if the price is
         below the lowest (hourly) DA price of the day.
 
+        threshold_rank and extreme_rank set which of the ordered DA prices are used as price
+        thresholds. Between low_soc and high_soc, the battery discharges if the RT price exceeds
+        the threshold_rank-th highest DA price and charges if the RT price is below the
+        threshold_rank-th lowest DA price. Outside of this SOC range, the extreme_rank-th
+        highest and lowest DA prices are used instead.
+
         Args:
             high_soc (float): High SOC threshold (0 to 1).
             low_soc (float): Low SOC threshold (0 to 1).
+            threshold_rank (int): Rank of the DA prices used as thresholds for charging and
+                discharging. Defaults to 4.
+            extreme_rank (int): Rank of the DA prices used as thresholds for charging and
+                discharging outside of the SOC limits. Defaults to 1.
         """
+        if not 1 <= extreme_rank <= threshold_rank:
+            raise ValueError("Price ranks must satisfy 1 <= extreme_rank <= threshold_rank.")
+
         self.high_soc = high_soc
         self.low_soc = low_soc
+        self.threshold_rank = threshold_rank
+        self.extreme_rank = extreme_rank
+
+        # Reset cache of price thresholds, keyed on the day-ahead prices used to compute them
+        self._day_ahead_lmps_key = None
+        self._price_thresholds = None
+
+    def compute_price_thresholds(self, day_ahead_lmps):
+        """
+        Compute the price thresholds from the day-ahead prices.
+
+        Uses partial selection (np.partition) rather than a full sort, as only four
+        order statistics are needed.
+
+        Args:
+            day_ahead_lmps (list or np.ndarray): Day-ahead LMPs.
+
+        Returns:
+            tuple: (bottom_extreme, bottom_threshold, top_threshold, top_extreme) prices.
+        """
+        day_ahead_lmps = np.asarray(day_ahead_lmps, dtype=float)
+        n = day_ahead_lmps.size
+        if self.threshold_rank > n:
+            raise ValueError(
+                "threshold_rank ({0}) exceeds the number of day-ahead prices ({1}).".format(
+                    self.threshold_rank, n
+                )
+            )
+
+        i_bottom_extreme = self.extreme_rank - 1
+        i_bottom_threshold = self.threshold_rank - 1
+        i_top_threshold = n - self.threshold_rank
+        i_top_extreme = n - self.extreme_rank
+        partitioned_lmps = np.partition(
+            day_ahead_lmps,
+            sorted({i_bottom_extreme, i_bottom_threshold, i_top_threshold, i_top_extreme})
+        )
+
+        return (
+            partitioned_lmps[i_bottom_extreme],
+            partitioned_lmps[i_bottom_threshold],
+            partitioned_lmps[i_top_threshold],
+            partitioned_lmps[i_top_extreme],
+        )
 
     def compute_controls(self, measurements_dict):
 
-        day_ahead_lmps = np.array(measurements_dict["DA_LMP_24hours"])
-        sorted_day_ahead_lmps = np.sort(day_ahead_lmps)
-        real_time_lmp = measurements_dict["RT_LMP"]
+        # Recompute price thresholds only if the day-ahead prices have changed
+        day_ahead_lmps_key = tuple(measurements_dict["DA_LMP_24hours"])
+        if day_ahead_lmps_key != self._day_ahead_lmps_key:
+            self._price_thresholds = self.compute_price_thresholds(day_ahead_lmps_key)
+            self._day_ahead_lmps_key = day_ahead_lmps_key
+        bottom_1, bottom_4, top_4, top_1 = self._price_thresholds
 
-        # Extract limits
-        bottom_4 = sorted_day_ahead_lmps[3]
-        top_4 = sorted_day_ahead_lmps[-4]
-        bottom_1 = sorted_day_ahead_lmps[0]
-        top_1 = sorted_day_ahead_lmps[-1]
+        real_time_lmp = measurements_dict["RT_LMP"]
 
         # Access the state of charge and LMP in real-time
         soc = measurements_dict["battery"]["state_of_charge"]
@@ -219,3 +351,184 @@ class BatteryPriceSOCController(ControllerBase):
             power_setpoint = 0.0
 
         return {"power_setpoint": power_setpoint}
+
+
+class BatteryArbitrageController(ControllerBase):
+    """
+    Receding-horizon price arbitrage controller for a single battery.
+
+    Solves a 24-hour, SOC-constrained arbitrage problem by dynamic programming
+    over a discretized SOC grid, using the real-time price for the current hour
+    and the day-ahead prices for the following hours. The battery is then
+    controlled to track the planned SOC at the end of the current hour.
+    """
+    def __init__(self, interface, input_dict, controller_parameters={}, verbose=True):
+        """
+        Instantiate BatteryArbitrageController.
+
+        Args:
+            interface (object): Interface object for communicating with simulator.
+            input_dict (dict): Dictionary of input parameters (e.g. from Hercules).
+            controller_parameters (dict): Dictionary of controller parameters. See
+                set_controller_parameters for more details. If controller parameters are provided
+                both in input_dict and controller_parameters, an error is raised.
+            verbose (bool): If True, print debug information.
+        """
+        super().__init__(interface, verbose)
+
+        # Check that parameters are not specified both in input file
+        # and in controller_parameters
+        if "controller" in input_dict:
+            for cp in controller_parameters.keys():
+                if cp in input_dict["controller"]:
+                    raise KeyError(
+                        "Found key \""+cp+"\" in both input_dict[\"controller\"] and"
+                        " in controller_parameters."
+                    )
+            controller_parameters = {**controller_parameters, **input_dict["controller"]}
+
+        self.rated_power_charging = input_dict["battery"]["charge_rate"]
+        self.rated_power_discharging = input_dict["battery"]["discharge_rate"]
+        self.energy_capacity = input_dict["battery"]["energy_capacity"]
+
+        self.set_controller_parameters(**controller_parameters)
+
+    def set_controller_parameters(
+        self,
+        soc_min=0.1,
+        soc_max=0.9,
+        n_soc_grid=81,
+        throughput_cost=0.01,
+        day_start_time=0.0,
+        **_ # <- Allows arbitrary additional parameters to be passed, which are ignored
+    ):
+        """
+        Set parameters for BatteryArbitrageController.
+
+        The planning problem is solved over 24 hourly stages: the current hour, priced at the
+        real-time price, followed by the next 23 hours, priced at the day-ahead prices (which are
+        assumed to repeat daily when the horizon extends past the end of the day).
+
+        Args:
+            soc_min (float): Minimum allowable SOC (0 to 1). Defaults to 0.1.
+            soc_max (float): Maximum allowable SOC (0 to 1). Defaults to 0.9.
+            n_soc_grid (int): Number of points in the SOC discretization. Defaults to 81.
+            throughput_cost (float): Cost applied to energy charged or discharged, in the same
+                units as the prices (e.g. $/MWh), to discourage excessive cycling. A small
+                positive value also breaks ties between equally profitable plans in favor of
+                less cycling. Defaults to 0.01.
+            day_start_time (float): Simulation time (s) at which the first hour of the
+                day-ahead prices begins. Defaults to 0.0.
+        """
+        if not 0 <= soc_min < soc_max <= 1:
+            raise ValueError("SOC limits must satisfy 0 <= soc_min < soc_max <= 1.")
+
+        self.soc_min = soc_min
+        self.soc_max = soc_max
+        self.throughput_cost = throughput_cost
+        self.day_start_time = day_start_time
+        self.n_stages = 24
+        self.stage_duration = 3600.0 # s
+
+        # SOC grid and (constant) hourly transitions between grid points
+        self.soc_grid = np.linspace(soc_min, soc_max, n_soc_grid)
+        energy_discharged = (self.soc_grid[:, None] - self.soc_grid[None, :]) * self.energy_capacity
+        self._transition_energy = energy_discharged / 1000 # MWh, to match prices per MWh
+        self._transition_cost = self.throughput_cost * np.abs(self._transition_energy)
+        self._transition_feasible = (
+            (energy_discharged <= self.rated_power_discharging * self.stage_duration / 3600)
+            & (energy_discharged >= -self.rated_power_charging * self.stage_duration / 3600)
+        )
+
+        # Values (expected future revenue) at the start of each stage and optimal policies,
+        # keyed on the prices used to compute them. Stage 0 is solved at every step.
+        self._values = np.zeros((self.n_stages+1, n_soc_grid))
+        self._policy = np.zeros((self.n_stages, n_soc_grid), dtype=int)
+        self._stage_prices = None
+        self.planned_soc = None
+
+    def solve_stages(self, stage_prices):
+        """
+        Update the values and policies for stages 1, ..., n_stages-1 by backward
+        dynamic programming.
+
+        Stages are only recomputed back from the last stage whose price differs from
+        the previous solve; values for later stages are reused.
+
+        Args:
+            stage_prices (np.ndarray): Prices for stages 1, ..., n_stages-1.
+        """
+        if self._stage_prices is None:
+            t_last_changed = self.n_stages - 1
+        else:
+            changed = np.flatnonzero(stage_prices != self._stage_prices)
+            if changed.size == 0:
+                return None
+            t_last_changed = changed[-1] + 1
+
+        for t in range(t_last_changed, 0, -1):
+            stage_values = np.where(
+                self._transition_feasible,
+                stage_prices[t-1] * self._transition_energy
+                - self._transition_cost
+                + self._values[t+1][None, :],
+                -np.inf
+            )
+            self._policy[t] = np.argmax(stage_values, axis=1)
+            self._values[t] = np.take_along_axis(
+                stage_values, self._policy[t][:, None], axis=1
+            )[:, 0]
+
+        self._stage_prices = stage_prices.copy()
+
+        return None
+
+    def compute_controls(self, measurements_dict):
+        """
+        Main compute_controls method for BatteryArbitrageController.
+        """
+        day_ahead_lmps = np.asarray(measurements_dict["DA_LMP_24hours"], dtype=float)
+        soc = measurements_dict["battery"]["state_of_charge"]
+
+        # Determine position within the day-ahead price schedule
+        time_of_day = (measurements_dict["time"] - self.day_start_time) % 86400
+        hour = int(time_of_day // 3600)
+        time_remaining = max(self.stage_duration - time_of_day % 3600, self.dt)
+        real_time_lmp = measurements_dict.get("RT_LMP", day_ahead_lmps[hour])
+
+        # Re-solve future stages if prices have changed
+        self.solve_stages(np.roll(day_ahead_lmps, -(hour+1))[:self.n_stages-1])
+
+        # Solve the current stage from the current SOC, over the remaining time in the hour
+        energy_discharged = (soc - self.soc_grid) * self.energy_capacity
+        feasible = (
+            (energy_discharged <= self.rated_power_discharging * time_remaining / 3600)
+            & (energy_discharged >= -self.rated_power_charging * time_remaining / 3600)
+        )
+        if not feasible.any():
+            feasible[np.argmin(np.abs(energy_discharged))] = True
+        stage_values = np.where(
+            feasible,
+            (real_time_lmp * energy_discharged
+             - self.throughput_cost * np.abs(energy_discharged)) / 1000
+            + self._values[1],
+            -np.inf
+        )
+        i_target = int(np.argmax(stage_values))
+
+        # Planned SOC at the end of each stage
+        planned_indices = np.empty(self.n_stages, dtype=int)
+        planned_indices[0] = i_target
+        for t in range(1, self.n_stages):
+            planned_indices[t] = self._policy[t][planned_indices[t-1]]
+        self.planned_soc = self.soc_grid[planned_indices]
+
+        # Track the planned SOC at the end of the current hour
+        power_setpoint = (
+            (soc - self.soc_grid[i_target]) * self.energy_capacity * 3600 / time_remaining
+        )
+        power_setpoint = float(
+            np.clip(power_setpoint, -self.rated_power_charging, self.rated_power_discharging)
+        )
+
+        return {"power_setpoint": power_setpoint}
@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+import numpy as np
+
 
 class ControllerBase(metaclass=ABCMeta):
     def __init__(self, interface, verbose = True):
@@ -33,6 +35,41 @@ class ControllerBase(metaclass=ABCMeta):
 
         return output_dict
 
+    def replay(self, measurements_timeseries: dict) -> dict:
+        """
+        Run the controller over a time series of measurements ("replay mode").
+
+        measurements_timeseries has the same (possibly nested) structure as the
+        measurements_dict passed to compute_controls, but is columnar: each leaf
+        that is a numpy array is indexed by time step along its first dimension.
+        All other leaves (scalars, lists, None) are held constant over the time
+        series. The interface is not used; measurements are passed directly to
+        the controller, as in compute_controls.
+
+        The base implementation scans over time steps, calling compute_controls
+        at each step. Stateless controllers may override this method with a
+        fully vectorized implementation. Controller internal state is updated as
+        if compute_controls had been called at each time step.
+
+        Args:
+            measurements_timeseries (dict): Columnar time series of measurements.
+
+        Returns:
+            dict: Columnar controls, with one array per control, indexed by time
+                step along the first dimension.
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+
+        controls_list = [
+            self.compute_controls(timeseries_step(measurements_timeseries, k))
+            for k in range(n_steps)
+        ]
+
+        return {
+            k: np.array([controls_dict[k] for controls_dict in controls_list])
+            for k in (controls_list[0].keys() if n_steps > 0 else [])
+        }
+
     @property
     def controller_parameters(self):
         return self._s.controller_parameters
@@ -66,3 +103,63 @@ class ControllerBase(metaclass=ABCMeta):
     def compute_controls(self, measurements_dict: dict) -> dict:
         pass  # Control algorithms should be implemented in the compute_controls 
         # method of the child class. 
+
+
+def timeseries_length(measurements_timeseries):
+    """
+    Determine the number of time steps in a columnar measurements time series.
+
+    The length is taken from the "time" entry, if present, or otherwise from the
+    first numpy array found in the (possibly nested) dictionary.
+
+    Args:
+        measurements_timeseries (dict): Columnar time series of measurements.
+
+    Returns:
+        int: Number of time steps.
+    """
+    if isinstance(measurements_timeseries.get("time", None), np.ndarray):
+        return measurements_timeseries["time"].shape[0]
+    for v in measurements_timeseries.values():
+        if isinstance(v, np.ndarray):
+            return v.shape[0]
+        elif isinstance(v, dict):
+            try:
+                return timeseries_length(v)
+            except ValueError:
+                continue
+    raise ValueError("No time-indexed arrays found in measurements time series.")
+
+def timeseries_column(value, n_steps):
+    """
+    Broadcast a columnar measurement to a float array of length n_steps.
+
+    Args:
+        value (float or np.ndarray): Measurement, either constant or time-indexed.
+        n_steps (int): Number of time steps.
+
+    Returns:
+        np.ndarray: Measurement at each time step.
+    """
+    return np.broadcast_to(np.asarray(value, dtype=float), (n_steps,))
+
+def timeseries_step(measurements_timeseries, k):
+    """
+    Extract the measurements dictionary for time step k from a columnar time series.
+
+    Args:
+        measurements_timeseries (dict): Columnar time series of measurements.
+        k (int): Time step index.
+
+    Returns:
+        dict: Measurements dictionary for time step k.
+    """
+    measurements_dict = {}
+    for key, v in measurements_timeseries.items():
+        if isinstance(v, np.ndarray):
+            measurements_dict[key] = v[k].tolist() if v.ndim > 1 else v[k].item()
+        elif isinstance(v, dict):
+            measurements_dict[key] = timeseries_step(v, k)
+        else:
+            measurements_dict[key] = v
+    return measurements_dict
@@ -0,0 +1,312 @@
+import numpy as np
+
+FILTER_TYPES = ["first_order", "second_order", "moving_average"]
+
+
+class FilterBank():
+    """
+    Bank of discrete-time measurement filters with array state.
+
+    Controllers declare the measurements to be filtered using add_filter(), and then update all
+    filters with one call to update() per time step. Filters of the same type are stored in
+    contiguous state arrays and updated together, so that the cost of filtering scalar signals
+    and per-turbine signals is similar. Available filter types are:
+
+    - "first_order": Exponential filter y_k = (1 - alpha) y_{k-1} + alpha x_k. The coefficient
+      alpha may be specified directly, or computed from a time constant (s) as
+      alpha = 1 - exp(-dt / time_constant).
+    - "second_order": Low-pass filter with unity DC gain, natural frequency (rad/s) and damping
+      ratio, discretized using the bilinear transform.
+    - "moving_average": Average over a window (s) of round(window / dt) steps.
+
+    Filters not included in a call to update() are held: their state (including the history
+    of moving average filters and the internal state of second order filters) is not changed.
+    """
+    def __init__(self, dt):
+        """
+        Constructor for FilterBank.
+
+        Args:
+            dt (float): Time step (s) at which update() is called.
+        """
+        self.dt = dt
+        self._filters = {}
+
+        # First order filters
+        self._fo_alpha = np.zeros(0)
+        self._fo_state = np.zeros(0)
+        self._fo_input = np.zeros(0)
+
+        # Second order filters (direct form II transposed)
+        self._so_b = np.zeros((3, 0))
+        self._so_a = np.zeros((3, 0))
+        self._so_state = np.zeros((2, 0))
+        self._so_output = np.zeros(0)
+        self._so_input = np.zeros(0)
+
+        # Moving average filters
+        self._ma_window = np.zeros(0, dtype=int)
+        self._ma_history = np.zeros((1, 0))
+        self._ma_sum = np.zeros(0)
+        self._ma_position = np.zeros(0, dtype=int) # Ring buffer position of each channel
+        self._ma_input = np.zeros(0)
+
+        # Boolean masks of the channels of each filter type updated, for each set of names
+        # passed to update()
+        self._masks = {}
+
+    def add_filter(
+        self,
+        name,
+        filter_type="first_order",
+        size=None,
+        initial_value=0.0,
+        alpha=None,
+        time_constant=None,
+        natural_frequency=None,
+        damping_ratio=0.7071,
+        window=None,
+    ):
+        """
+        Declare a measurement to be filtered.
+
+        Args:
+            name (str): Name of the filtered measurement, used as the key in update().
+            filter_type (str): One of "first_order", "second_order", and "moving_average".
+                Defaults to "first_order".
+            size (int): Number of channels of the measurement (for example, the number of
+                turbines). Defaults to None, in which case the measurement is scalar.
+            initial_value (float or array-like): Initial (steady-state) value of the filter.
+                Defaults to 0.0.
+            alpha (float): Coefficient of the first order filter. Either alpha or time_constant
+                must be specified for first order filters.
+            time_constant (float): Time constant of the first order filter (s).
+            natural_frequency (float): Natural frequency of the second order filter (rad/s).
+            damping_ratio (float): Damping ratio of the second order filter. Defaults to 0.7071.
+            window (float): Window length of the moving average filter (s).
+        """
+        if name in self._filters:
+            raise KeyError("Filter \"" + name + "\" already exists.")
+        if filter_type not in FILTER_TYPES:
+            raise ValueError(
+                "filter_type must be one of " + ", ".join(FILTER_TYPES) + "."
+            )
+        n = 1 if size is None else size
+
+        if filter_type == "first_order":
+            if (alpha is None) == (time_constant is None):
+                raise ValueError(
+                    "Exactly one of alpha and time_constant must be specified for first order "
+                    "filters."
+                )
+            if alpha is None:
+                alpha = 1 - np.exp(-self.dt / time_constant)
+            start = len(self._fo_state)
+            self._fo_alpha = np.concatenate([self._fo_alpha, np.full(n, alpha)])
+            self._fo_state = np.concatenate([self._fo_state, np.zeros(n)])
+            self._fo_input = np.concatenate([self._fo_input, np.zeros(n)])
+
+        elif filter_type == "second_order":
+            if natural_frequency is None:
+                raise ValueError("natural_frequency must be specified for second order filters.")
+            # Bilinear transform of wn^2 / (s^2 + 2 zeta wn s + wn^2)
+            K = 2 / self.dt
+            wn2 = natural_frequency**2
+            a0 = K**2 + 2 * damping_ratio * natural_frequency * K + wn2
+            b = np.array([wn2, 2 * wn2, wn2]) / a0
+            a = np.array([
+                1.0,
+                (2 * wn2 - 2 * K**2) / a0,
+                (K**2 - 2 * damping_ratio * natural_frequency * K + wn2) / a0,
+            ])
+            start = len(self._so_output)
+            self._so_b = np.concatenate([self._so_b, np.tile(b[:, None], (1, n))], axis=1)
+            self._so_a = np.concatenate([self._so_a, np.tile(a[:, None], (1, n))], axis=1)
+            self._so_state = np.concatenate([self._so_state, np.zeros((2, n))], axis=1)
+            self._so_output = np.concatenate([self._so_output, np.zeros(n)])
+            self._so_input = np.concatenate([self._so_input, np.zeros(n)])
+
+        elif filter_type == "moving_average":
+            if window is None:
+                raise ValueError("window must be specified for moving average filters.")
+            n_window = max(int(round(window / self.dt)), 1)
+            start = len(self._ma_sum)
+            # Reorder existing history so that the current position of each channel is at the
+            # end
+            n_history_old = self._ma_history.shape[0]
+            rows = (self._ma_position[None, :] + 1 + np.arange(n_history_old)[:, None])
+            history = self._ma_history[rows % n_history_old, np.arange(start)[None, :]]
+            n_history = max(n_history_old, n_window)
+            history = np.concatenate(
+                [np.tile(history[:1], (n_history - n_history_old, 1)), history], axis=0
+            )
+            self._ma_history = np.concatenate([history, np.zeros((n_history, n))], axis=1)
+            self._ma_position = np.full(start + n, n_history - 1)
+            self._ma_window = np.concatenate([self._ma_window, np.full(n, n_window)])
+            self._ma_sum = np.concatenate([self._ma_sum, np.zeros(n)])
+            self._ma_input = np.concatenate([self._ma_input, np.zeros(n)])
+
+        self._filters[name] = (filter_type, slice(start, start + n), size is None)
+        self._masks = {}
+        self.set_state(name, initial_value)
+
+    def set_state(self, name, value):
+        """
+        Set a filter to steady state at the given value.
+
+        Args:
+            name (str): Name of the filtered measurement.
+            value (float or array-like): Value of the filter output.
+        """
+        filter_type, index, _ = self._filters[name]
+        value = np.broadcast_to(np.asarray(value, dtype=float), (index.stop - index.start,))
+        if filter_type == "first_order":
+            self._fo_state[index] = value
+        elif filter_type == "second_order":
+            b = self._so_b[:, index]
+            a = self._so_a[:, index]
+            self._so_output[index] = value
+            self._so_state[0, index] = (1 - b[0]) * value
+            self._so_state[1, index] = (b[2] - a[2]) * value
+        elif filter_type == "moving_average":
+            self._ma_history[:, index] = value
+            self._ma_sum[index] = value * self._ma_window[index]
+
+    def state(self, name):
+        """
+        Get the current output of a filter.
+
+        Args:
+            name (str): Name of the filtered measurement.
+
+        Returns:
+            float or np.ndarray: Filter output.
+        """
+        filter_type, index, scalar = self._filters[name]
+        if filter_type == "first_order":
+            value = self._fo_state[index]
+        elif filter_type == "second_order":
+            value = self._so_output[index]
+        elif filter_type == "moving_average":
+            value = self._ma_sum[index] / self._ma_window[index]
+        return value.item() if scalar else value.copy()
+
+    def _set_input(self, name, value):
+        filter_type, index, _ = self._filters[name]
+        if filter_type == "first_order":
+            self._fo_input[index] = value
+        elif filter_type == "second_order":
+            self._so_input[index] = value
+        elif filter_type == "moving_average":
+            self._ma_input[index] = value
+
+    def _update_masks(self, names):
+        """
+        Get boolean masks of the channels of each filter type belonging to the named filters,
+        or None for filter types with all channels included.
+        """
+        key = frozenset(names)
+        if key not in self._masks:
+            masks = {
+                "first_order": np.zeros(len(self._fo_state), dtype=bool),
+                "second_order": np.zeros(len(self._so_output), dtype=bool),
+                "moving_average": np.zeros(len(self._ma_sum), dtype=bool),
+            }
+            for name in names:
+                filter_type, index, _ = self._filters[name]
+                masks[filter_type][index] = True
+            self._masks[key] = {k: None if m.all() else m for k, m in masks.items()}
+        return self._masks[key]
+
+    def update(self, measurements):
+        """
+        Update filters with new measurements.
+
+        Args:
+            measurements (dict): New (unfiltered) values, keyed by filter name. Filters not
+                included are held at their current state.
+
+        Returns:
+            dict: Filtered values, keyed by filter name.
+        """
+        for name, value in measurements.items():
+            self._set_input(name, value)
+        masks = self._update_masks(measurements)
+
+        if len(self._fo_state) > 0:
+            x = self._fo_input
+            state = (1 - self._fo_alpha) * self._fo_state + self._fo_alpha * x
+            mask = masks["first_order"]
+            self._fo_state = state if mask is None else np.where(mask, state, self._fo_state)
+
+        if len(self._so_output) > 0:
+            x = self._so_input
+            b, a, z = self._so_b, self._so_a, self._so_state
+            y = b[0] * x + z[0]
+            z_new = np.stack([b[1] * x - a[1] * y + z[1], b[2] * x - a[2] * y])
+            mask = masks["second_order"]
+            if mask is None:
+                self._so_state = z_new
+                self._so_output = y
+            else:
+                self._so_state[:, mask] = z_new[:, mask]
+                self._so_output[mask] = y[mask]
+
+        if len(self._ma_sum) > 0:
+            mask = masks["moving_average"]
+            channels = np.arange(len(self._ma_sum)) if mask is None else np.flatnonzero(mask)
+            if len(channels) > 0:
+                x = self._ma_input[channels]
+                n_history = self._ma_history.shape[0]
+                position = (self._ma_position[channels] + 1) % n_history
+                leaving = self._ma_history[
+                    (position - self._ma_window[channels]) % n_history, channels
+                ]
+                self._ma_sum[channels] += x - leaving
+                self._ma_history[position, channels] = x
+                self._ma_position[channels] = position
+
+        return {name: self.state(name) for name in measurements}
+
+    def filter_timeseries(self, name, values):
+        """
+        Run a single filter over a time series of measurements, updating its state. The
+        outputs are identical to calling update() at each step.
+
+        Args:
+            name (str): Name of the filtered measurement.
+            values (array-like): Time series of measurements, with time along the first axis.
+
+        Returns:
+            np.ndarray: Filtered time series.
+        """
+        # scipy.signal is slow to import, so is only imported where needed
+        from scipy.signal import lfilter
+
+        filter_type, index, _ = self._filters[name]
+        values = np.asarray(values, dtype=float).reshape(len(values), -1)
+
+        if filter_type == "first_order":
+            alpha = self._fo_alpha[index]
+            y = np.empty_like(values)
+            for i, a in enumerate(alpha):
+                y[:, i], zf = lfilter(
+                    [a], [1.0, -(1 - a)], values[:, i], zi=[(1 - a) * self._fo_state[index][i]]
+                )
+            self._fo_state[index] = y[-1]
+        elif filter_type == "second_order":
+            b = self._so_b[:, index]
+            a = self._so_a[:, index]
+            y = np.empty_like(values)
+            for i in range(values.shape[1]):
+                y[:, i], zf = lfilter(
+                    b[:, i], a[:, i], values[:, i], zi=self._so_state[:, index][:, i]
+                )
+                self._so_state[:, index.start + i] = zf
+            self._so_output[index] = y[-1]
+        elif filter_type == "moving_average":
+            y = np.empty_like(values)
+            for k in range(values.shape[0]):
+                y[k] = self.update({name: values[k]})[name]
+
+        return y[:, 0] if self._filters[name][2] else y
@@ -1,12 +1,20 @@
+import time
+
 import numpy as np
 
 from hycon.controllers.controller_base import ControllerBase
+from hycon.controllers.filter_bank import FilterBank
+from hycon.interfaces.forecast_buffer import ForecastBuffer
 
 
 class HybridSupervisoryControllerBase(ControllerBase):
     """
     Base class for hybrid supervisory controllers, implementing shared functionality.
     """
+    # Coefficients of the first order filters applied to the wind, solar, and battery power
+    # measurements (1.0 for no filtering)
+    measurement_filter_alphas = {"wind_power": 1.0, "solar_power": 1.0, "battery_power": 1.0}
+
     def __init__(
         self,
         interface,
@@ -36,9 +44,35 @@ class HybridSupervisoryControllerBase(ControllerBase):
         self.wind_reference = 0
         self.solar_reference = 0
         self.battery_reference = 0
-        self.prev_battery_power = 0
-        self.prev_wind_power = 0
-        self.prev_solar_power = 0
+
+        # Initialize measurement filters
+        self.filter_bank = FilterBank(self.dt)
+        for name, alpha in self.measurement_filter_alphas.items():
+            self.filter_bank.add_filter(name, "first_order", alpha=alpha)
+
+    @property
+    def prev_wind_power(self):
+        return self.filter_bank.state("wind_power")
+
+    @prev_wind_power.setter
+    def prev_wind_power(self, value):
+        self.filter_bank.set_state("wind_power", value)
+
+    @property
+    def prev_solar_power(self):
+        return self.filter_bank.state("solar_power")
+
+    @prev_solar_power.setter
+    def prev_solar_power(self, value):
+        self.filter_bank.set_state("solar_power", value)
+
+    @property
+    def prev_battery_power(self):
+        return self.filter_bank.state("battery_power")
+
+    @prev_battery_power.setter
+    def prev_battery_power(self, value):
+        self.filter_bank.set_state("battery_power", value)
 
     def compute_controls(self, measurements_dict):
         # Run supervisory control logic
@@ -63,7 +97,41 @@ class HybridSupervisoryControllerBase(ControllerBase):
 
         return controls_dict
 
+    def plant_power_reference(self, measurements_dict):
+        """
+        Extract the plant power reference from the measurements, handling either the
+        'power_reference' or 'plant_power_reference' key. If 'power_reference' is
+        provided, it is moved to 'plant_power_reference' in measurements_dict.
+        """
+        # Handle power_reference or plant_power_reference keys
+        if (
+            "power_reference" in measurements_dict
+            and "plant_power_reference" not in measurements_dict
+        ):
+            measurements_dict["plant_power_reference"] = measurements_dict["power_reference"]
+            del measurements_dict["power_reference"]
+        elif (
+            "power_reference" not in measurements_dict
+            and "plant_power_reference" not in measurements_dict
+        ):
+            raise KeyError(
+                "Either 'power_reference' or 'plant_power_reference' must be provided"
+                " in measurements_dict."
+            )
+        elif (
+            "power_reference" in measurements_dict
+            and "plant_power_reference" in measurements_dict
+        ):
+            raise KeyError(
+                "Found both 'power_reference' and 'plant_power_reference' in measurements_dict."
+            )
+        return measurements_dict["plant_power_reference"]
+
 class HybridSupervisoryControllerBaseline(HybridSupervisoryControllerBase):
+    # Filter the wind and solar power measurements to reduce noise and improve closed-loop
+    # controller damping
+    measurement_filter_alphas = {"wind_power": 0.1, "solar_power": 0.1, "battery_power": 1.0}
+
     def __init__(
             self,
             interface,
@@ -107,35 +175,18 @@ class HybridSupervisoryControllerBaseline(HybridSupervisoryControllerBase):
             battery_power = 0
             battery_soc = 0
 
-        # Handle power_reference or plant_power_reference keys
-        if (
-            "power_reference" in measurements_dict
-            and "plant_power_reference" not in measurements_dict
-        ):
-            measurements_dict["plant_power_reference"] = measurements_dict["power_reference"]
-            del measurements_dict["power_reference"]
-        elif (
-            "power_reference" not in measurements_dict
-            and "plant_power_reference" not in measurements_dict
-        ):
-            raise KeyError(
-                "Either 'power_reference' or 'plant_power_reference' must be provided"
-                " in measurements_dict."
-            )
-        elif (
-            "power_reference" in measurements_dict
-            and "plant_power_reference" in measurements_dict
-        ):
-            raise KeyError(
-                "Found both 'power_reference' and 'plant_power_reference' in measurements_dict."
-            )
-        plant_power_reference = measurements_dict["plant_power_reference"]
+        plant_power_reference = self.plant_power_reference(measurements_dict)
 
-        # Filter the wind and solar power measurements to reduce noise and improve closed-loop
-        # controller damping
-        a = 0.1
-        wind_power = (1-a)*self.prev_wind_power + a*wind_power
-        solar_power = (1-a)*self.prev_solar_power + a*solar_power
+        # Filter the wind and solar power measurements
+        prev_wind_power = self.prev_wind_power
+        prev_solar_power = self.prev_solar_power
+        filtered_powers = self.filter_bank.update({
+            "wind_power": wind_power,
+            "solar_power": solar_power,
+            "battery_power": battery_power,
+        })
+        wind_power = filtered_powers["wind_power"]
+        solar_power = filtered_powers["solar_power"]
 
         # Calculate battery reference value
         if self._has_battery_controller:
@@ -171,13 +222,13 @@ class HybridSupervisoryControllerBaseline(HybridSupervisoryControllerBase):
         else: 
             # go up
             # Is the resource saturated?
-            if self.solar_reference > (self.prev_solar_power+0.05*self.solar_reference):
+            if self.solar_reference > (prev_solar_power+0.05*self.solar_reference):
                 solar_reference = self.solar_reference
             else:
                 # If not, ask for more power
                 solar_reference = solar_power - K
 
-            if self.wind_reference > (self.prev_wind_power+0.05*self.wind_reference):
+            if self.wind_reference > (prev_wind_power+0.05*self.wind_reference):
                 wind_reference = self.wind_reference
             else:
                 wind_reference = wind_power - K
@@ -188,9 +239,6 @@ class HybridSupervisoryControllerBaseline(HybridSupervisoryControllerBase):
         if not self._has_solar_controller:
             solar_reference = 0
 
-        self.prev_solar_power = solar_power
-        self.prev_wind_power = wind_power
-        self.prev_battery_power = battery_power
         self.wind_reference = wind_reference
         self.solar_reference = solar_reference
         self.battery_reference = battery_reference
@@ -304,13 +352,16 @@ class HybridSupervisoryControllerMultiRef(HybridSupervisoryControllerBase):
             battery_power = 0
             battery_reference = 0
 
-        # Filter the wind and solar power measurements to reduce noise and improve closed-loop
-        # controller damping
-        # TODO RECONSIDER THIS MAYBE MAKE MORE DEPENDENT ON THE TIME STEP
-        a = 1.0  # 0.1 # FORCE THE FILTER TO BE 100% DEPENDENT ON THE CURRENT TIME STEP
-        wind_power = (1 - a) * self.prev_wind_power + a * wind_power
-        solar_power = (1 - a) * self.prev_solar_power + a * solar_power
-        battery_power = (1 - a) * self.prev_battery_power + a * battery_power
+        # Filter the wind, solar, and battery power measurements (unfiltered by default; see
+        # measurement_filter_alphas)
+        filtered_powers = self.filter_bank.update({
+            "wind_power": wind_power,
+            "solar_power": solar_power,
+            "battery_power": battery_power,
+        })
+        wind_power = filtered_powers["wind_power"]
+        solar_power = filtered_powers["solar_power"]
+        battery_power = filtered_powers["battery_power"]
 
         # Loop over the curtailment order in reverse order to progressively reduce the reference
         # of the first component in the order
@@ -343,9 +394,6 @@ class HybridSupervisoryControllerMultiRef(HybridSupervisoryControllerBase):
             else:
                 raise ValueError(f"Invalid generation type {component} in curtailment_order.")
 
-        self.prev_solar_power = solar_power
-        self.prev_wind_power = wind_power
-        self.prev_battery_power = battery_power
         self.wind_reference = wind_reference
         self.solar_reference = solar_reference
         self.battery_reference = battery_reference
@@ -353,3 +401,407 @@ class HybridSupervisoryControllerMultiRef(HybridSupervisoryControllerBase):
         return wind_reference, solar_reference, battery_reference
 
     # TODO: Need to add it's own compute_controls method that ensures interconnect is satisfied
+
+
+class HybridSupervisoryControllerMPC(HybridSupervisoryControllerBase):
+    """
+    Model predictive supervisory controller for a hybrid wind/solar/battery plant.
+
+    Optimizes the wind, solar, and battery power references over a short horizon to
+    track the plant power reference, subject to the available wind and solar power,
+    battery power and SOC limits, and the interconnection limit. The resulting
+    quadratic program is solved using the alternating direction method of
+    multipliers (ADMM). The problem structure is built once on instantiation, and
+    only the problem vectors are updated at each step.
+    Each solve is warm-started from the shifted previous solution. If the solve does
+    not converge within the solve time budget, the controller falls back on the
+    HybridSupervisoryControllerBaseline logic for that step.
+    """
+    measurement_filter_alphas = HybridSupervisoryControllerBaseline.measurement_filter_alphas
+
+    def __init__(
+            self,
+            interface,
+            input_dict,
+            wind_controller=None,
+            solar_controller=None,
+            battery_controller=None,
+            controller_parameters={},
+            verbose=False
+        ):
+        super().__init__(
+            interface=interface,
+            input_dict=input_dict,
+            wind_controller=wind_controller,
+            solar_controller=solar_controller,
+            battery_controller=battery_controller,
+            verbose=verbose
+        )
+
+        if not self._has_wind_controller and not self._has_solar_controller:
+            raise ValueError(
+                "The HybridSupervisoryControllerMPC requires that either a solar_controller"
+                " or a wind_controller be provided."
+            )
+
+        # Check that parameters are not specified both in input file
+        # and in controller_parameters
+        if "controller" in input_dict:
+            for cp in controller_parameters.keys():
+                if cp in input_dict["controller"]:
+                    raise KeyError(
+                        "Found key \""+cp+"\" in both input_dict[\"controller\"] and"
+                        " in controller_parameters."
+                    )
+            controller_parameters = {**controller_parameters, **input_dict["controller"]}
+        self.set_controller_parameters(**controller_parameters)
+
+    def set_controller_parameters(
+        self,
+        horizon=10,
+        horizon_dt=None,
+        tracking_weight=1.0,
+        curtailment_weight=0.01,
+        battery_weight=0.001,
+        rate_weight=0.01,
+        soc_min=0.1,
+        soc_max=0.9,
+        solve_time_budget=0.05,
+        max_iterations=2000,
+        tolerance=1e-4,
+        **_ # <- Allows arbitrary additional parameters to be passed, which are ignored
+    ):
+        """
+        Set parameters for HybridSupervisoryControllerMPC and build the quadratic program.
+
+        The cost function penalizes, over each step of the horizon, the squared error between
+        total plant power and the plant power reference (tracking_weight); curtailment of
+        available wind and solar power (curtailment_weight); battery usage (battery_weight); and
+        changes in the references between steps (rate_weight). Powers are normalized by the
+        plant's power scale (interconnect limit or largest component rating) before weighting.
+
+        Forecasts of the available wind and solar power and the plant power reference are read
+        from the measurements' forecast buffer (or, if the interface does not provide one, from
+        the forecast dictionary), for the signals "wind_power", "solar_power" and
+        "plant_power_reference" (e.g. with keys "wind_power_forecast_<k>", where k is the
+        horizon step). Where forecasts are not provided, the most recent value is persisted (for
+        wind, the sum of turbine_available_powers is used if provided, otherwise the measured
+        power).
+
+        Args:
+            horizon (int): Number of steps in the prediction horizon. Defaults to 10.
+            horizon_dt (float): Duration of each horizon step in seconds. Defaults to None, in
+                which case the controller time step dt is used.
+            tracking_weight (float): Weight on plant power reference tracking. Defaults to 1.0.
+            curtailment_weight (float): Weight on curtailment of available wind and solar power.
+                Defaults to 0.01.
+            battery_weight (float): Weight on battery power. Defaults to 0.001.
+            rate_weight (float): Weight on changes in the references. Defaults to 0.01.
+            soc_min (float): Minimum allowable battery SOC. Defaults to 0.1.
+            soc_max (float): Maximum allowable battery SOC. Defaults to 0.9.
+            solve_time_budget (float): Maximum time (s) allowed for each solve before falling
+                back on the baseline logic. Defaults to 0.05.
+            max_iterations (int): Maximum number of ADMM iterations. Defaults to 2000.
+            tolerance (float): Convergence tolerance on the (normalized) primal and dual
+                residuals. Defaults to 1e-4.
+        """
+        self.horizon = horizon
+        self.horizon_dt = self.dt if horizon_dt is None else horizon_dt
+        self.tracking_weight = tracking_weight
+        self.curtailment_weight = curtailment_weight
+        self.battery_weight = battery_weight
+        self.rate_weight = rate_weight
+        self.soc_min = soc_min
+        self.soc_max = soc_max
+        self.solve_time_budget = solve_time_budget
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+        # Solver statistics
+        self.solve_time = 0.0
+        self.solve_iterations = 0
+        self.solve_converged = False
+        self.n_fallbacks = 0
+
+        self._build_qp()
+
+    def _build_qp(self):
+        """
+        Build the (constant) quadratic program structure and factorize the ADMM linear system.
+
+        Decision variables are stacked as [wind (N), solar (N), battery (N)] references over the
+        horizon of N steps. Constraint rows are stacked as [variable bounds (3N),
+        cumulative battery energy (N), total plant power (N)].
+        """
+        N = self.horizon
+        I_N = np.eye(N)
+        Z_N = np.zeros((N, N))
+
+        # Normalization of powers
+        power_ratings = [
+            self.plant_parameters.get("interconnect_limit", None),
+            self.plant_parameters.get("wind_farm", {}).get("capacity", None),
+            self.plant_parameters.get("solar_farm", {}).get("capacity", None),
+            self.plant_parameters.get("battery", {}).get("discharge_rate", None),
+        ]
+        power_ratings = [p for p in power_ratings if isinstance(p, (int, float)) and p > 0]
+        self._power_scale = float(max(power_ratings)) if power_ratings else 1000.0
+
+        # Cost function 1/2 x^T P x + q^T x
+        M = np.hstack([I_N, I_N, I_N]) # Total plant power
+        D = I_N - np.eye(N, k=-1) # Differences between steps
+        DtD = D.T @ D
+        self._P = 2 * (
+            self.tracking_weight * M.T @ M
+            + self.curtailment_weight * np.block([
+                [I_N, Z_N, Z_N], [Z_N, I_N, Z_N], [Z_N, Z_N, Z_N]
+            ])
+            + self.battery_weight * np.block([
+                [Z_N, Z_N, Z_N], [Z_N, Z_N, Z_N], [Z_N, Z_N, I_N]
+            ])
+            + self.rate_weight * np.block([
+                [DtD, Z_N, Z_N], [Z_N, DtD, Z_N], [Z_N, Z_N, DtD]
+            ])
+        )
+
+        # Constraints l <= A x <= u
+        self._A = np.vstack([
+            np.eye(3 * N),
+            np.hstack([Z_N, Z_N, np.tril(np.ones((N, N)))]),
+            M,
+        ])
+        # Normalize constraint rows to improve convergence
+        self._row_scale = 1 / np.linalg.norm(self._A, axis=1)
+        self._A = self._A * self._row_scale[:, None]
+        self._At = self._A.T
+
+        # ADMM parameters and factorization of the (constant) linear system. The step size rho
+        # is adapted between iterations if the residuals become unbalanced, in which case the
+        # linear system is refactorized; rho is carried over between solves.
+        self._sigma = 1e-6
+        self._alpha = 1.6
+        self._set_rho(0.01)
+
+        # Forecast storage, used if not provided by the interface
+        self._forecast_buffer = ForecastBuffer()
+
+        # Warm start
+        self._x = None
+        self._z = None
+        self._y = None
+
+    def _set_rho(self, rho):
+        """Set the ADMM step size and factorize the corresponding linear system."""
+        self._rho = rho
+        # The system is small, dense, and positive definite, so the explicit inverse is stored
+        # for fast iterations
+        self._kkt_inverse = np.linalg.inv(
+            self._P + self._sigma * np.eye(self._P.shape[0]) + rho * self._At @ self._A
+        )
+
+    def _horizon_values(self, forecast_buffer, signal, current_value):
+        """Extract a forecast over the horizon, persisting the most recent value."""
+        values = np.full(self.horizon, np.nan)
+        if signal in forecast_buffer:
+            forecast = forecast_buffer.horizon(signal)[:self.horizon]
+            values[:len(forecast)] = forecast
+
+        # Fill leads that are not available with the most recent known value
+        index = np.where(np.isnan(values), -1, np.arange(self.horizon))
+        np.maximum.accumulate(index, out=index)
+        return np.where(index >= 0, values[index], current_value)
+
+    def _update_qp(self, measurements_dict, plant_power_reference):
+        """Compute the cost and constraint vectors for the current step."""
+        N = self.horizon
+        forecast = measurements_dict.get("forecast_buffer", None)
+        if forecast is None:
+            # Forecasts not provided at this step are reset, rather than holding stale values
+            forecast = self._forecast_buffer
+            forecast.update(measurements_dict.get("forecast", {}), replace=True)
+
+        # Available wind, solar power and plant power reference over the horizon
+        if self._has_wind_controller:
+            wind_farm_measurements = measurements_dict["wind_farm"]
+            if wind_farm_measurements.get("turbine_available_powers", None) is not None:
+                wind_available = np.sum(wind_farm_measurements["turbine_available_powers"])
+            else:
+                wind_available = np.sum(wind_farm_measurements["turbine_powers"])
+            wind_available = self._horizon_values(forecast, "wind_power", wind_available)
+        else:
+            wind_available = np.zeros(N)
+        if self._has_solar_controller:
+            solar_available = self._horizon_values(
+                forecast, "solar_power", measurements_dict["solar_farm"]["power"]
+            )
+        else:
+            solar_available = np.zeros(N)
+        reference = self._horizon_values(
+            forecast, "plant_power_reference", plant_power_reference
+        )
+
+        scale = self._power_scale
+        wind_available = np.maximum(wind_available, 0) / scale
+        solar_available = np.maximum(solar_available, 0) / scale
+        reference = reference / scale
+
+        # Cost vector
+        q = np.concatenate([
+            -self.tracking_weight * reference - self.curtailment_weight * wind_available,
+            -self.tracking_weight * reference - self.curtailment_weight * solar_available,
+            -self.tracking_weight * reference,
+        ])
+        q[0] -= self.rate_weight * self.wind_reference / scale
+        q[N] -= self.rate_weight * self.solar_reference / scale
+        q[2*N] -= self.rate_weight * self.battery_reference / scale
+        q = 2 * q
+
+        # Variable bounds
+        if self._has_battery_controller:
+            battery_lower = -self.plant_parameters["battery"]["charge_rate"] / scale
+            battery_upper = self.plant_parameters["battery"]["discharge_rate"] / scale
+        else:
+            battery_lower = battery_upper = 0.0
+        l_box = np.concatenate([np.zeros(2*N), np.full(N, battery_lower)])
+        u_box = np.concatenate([wind_available, solar_available, np.full(N, battery_upper)])
+
+        # Cumulative battery energy bounds (from SOC limits)
+        if (self._has_battery_controller
+            and "energy_capacity" in self.plant_parameters["battery"]):
+            soc = np.clip(
+                measurements_dict["battery"]["state_of_charge"], self.soc_min, self.soc_max
+            )
+            energy_scale = (
+                self.plant_parameters["battery"]["energy_capacity"] * 3600
+                / (scale * self.horizon_dt)
+            )
+            l_soc = np.full(N, (soc - self.soc_max) * energy_scale)
+            u_soc = np.full(N, (soc - self.soc_min) * energy_scale)
+        else:
+            l_soc = np.full(N, -np.inf)
+            u_soc = np.full(N, np.inf)
+
+        # Total plant power bounds (interconnection limit)
+        l_plant = np.full(N, -np.inf)
+        u_plant = np.full(
+            N, self.plant_parameters.get("interconnect_limit", None) or np.inf
+        ) / scale
+
+        return (
+            q,
+            np.concatenate([l_box, l_soc, l_plant]) * self._row_scale,
+            np.concatenate([u_box, u_soc, u_plant]) * self._row_scale,
+        )
+
+    def solve_qp(self, q, lower, upper):
+        """
+        Solve the quadratic program min 1/2 x^T P x + q^T x s.t. lower <= A x <= upper using ADMM,
+        warm-started from the shifted previous solution.
+
+        Args:
+            q (np.ndarray): Cost vector.
+            lower (np.ndarray): Constraint lower bounds.
+            upper (np.ndarray): Constraint upper bounds.
+
+        Returns:
+            np.ndarray or None: Solution, or None if the solve did not converge within the time
+                budget or maximum number of iterations.
+        """
+        t_start = time.perf_counter()
+        N = self.horizon
+
+        # Warm start from shifted previous solution
+        if self._x is None:
+            x = np.zeros(3 * N)
+            z = np.clip(self._A @ x, lower, upper)
+            y = np.zeros(5 * N)
+        else:
+            x = np.concatenate(
+                [self._x.reshape(3, N)[:, 1:], self._x.reshape(3, N)[:, -1:]], axis=1
+            ).ravel()
+            z = np.clip(np.concatenate(
+                [self._z.reshape(5, N)[:, 1:], self._z.reshape(5, N)[:, -1:]], axis=1
+            ).ravel(), lower, upper)
+            y = np.concatenate(
+                [self._y.reshape(5, N)[:, 1:], self._y.reshape(5, N)[:, -1:]], axis=1
+            ).ravel()
+
+        sigma, alpha = self._sigma, self._alpha
+        converged = False
+        for iteration in range(1, self.max_iterations+1):
+            rho = self._rho
+            x = self._kkt_inverse @ (sigma * x - q + self._At @ (rho * z - y))
+            Ax = self._A @ x
+            Ax_relaxed = alpha * Ax + (1 - alpha) * z
+            z_new = np.clip(Ax_relaxed + y / rho, lower, upper)
+            y = y + rho * (Ax_relaxed - z_new)
+            z = z_new
+
+            # Check convergence (with absolute and relative tolerances)
+            if iteration % 5 == 0 or iteration == self.max_iterations:
+                Px = self._P @ x
+                Aty = self._At @ y
+                residual_primal = np.max(np.abs(Ax - z))
+                residual_dual = np.max(np.abs(Px + q + Aty))
+                scale_primal = max(np.max(np.abs(Ax)), np.max(np.abs(z)))
+                scale_dual = max(np.max(np.abs(Px)), np.max(np.abs(Aty)), np.max(np.abs(q)))
+                if (residual_primal < self.tolerance * (1 + scale_primal)
+                    and residual_dual < self.tolerance * (1 + scale_dual)):
+                    converged = True
+                    break
+                if time.perf_counter() - t_start > self.solve_time_budget:
+                    break
+
+                # Adapt step size to balance the (relative) residuals
+                rho_new = rho * np.sqrt(
+                    (residual_primal / (scale_primal + 1e-10))
+                    / (residual_dual / (scale_dual + 1e-10) + 1e-10)
+                )
+                rho_new = np.clip(rho_new, 1e-6, 1e6)
+                if rho_new > 5 * rho or rho_new < rho / 5:
+                    self._set_rho(rho_new)
+
+        self.solve_time = time.perf_counter() - t_start
+        self.solve_iterations = iteration
+        self.solve_converged = converged
+
+        # Store iterates for warm start (also if the solve did not converge, as the iterates
+        # are generally still closer to the solution of the next problem than a cold start)
+        self._x, self._z, self._y = x, z, y
+
+        return x if converged else None
+
+    def supervisory_control(self, measurements_dict):
+        plant_power_reference = self.plant_power_reference(measurements_dict)
+
+        x = self.solve_qp(*self._update_qp(measurements_dict, plant_power_reference))
+
+        if x is None:
+            # Fall back on baseline heuristic
+            if self.verbose:
+                print("MPC solve did not converge; using baseline supervisory control.")
+            self.n_fallbacks += 1
+            return HybridSupervisoryControllerBaseline.supervisory_control(
+                self, measurements_dict
+            )
+
+        wind_reference = x[0] * self._power_scale
+        solar_reference = x[self.horizon] * self._power_scale
+        battery_reference = x[2*self.horizon] * self._power_scale
+
+        # Update measurement filters for use by the baseline logic if needed
+        measured_powers = {}
+        if self._has_wind_controller:
+            measured_powers["wind_power"] = np.sum(
+                measurements_dict["wind_farm"]["turbine_powers"]
+            )
+        if self._has_solar_controller:
+            measured_powers["solar_power"] = measurements_dict["solar_farm"]["power"]
+        if self._has_battery_controller:
+            measured_powers["battery_power"] = measurements_dict["battery"]["power"]
+        self.filter_bank.update(measured_powers)
+        self.wind_reference = wind_reference
+        self.solar_reference = solar_reference
+        self.battery_reference = battery_reference
+
+        return wind_reference, solar_reference, battery_reference
@@ -1,6 +1,13 @@
 import copy
 
-from hycon.controllers.controller_base import ControllerBase
+import numpy as np
+
+from hycon.controllers.controller_base import (
+    ControllerBase,
+    timeseries_column,
+    timeseries_length,
+)
+from hycon.controllers.filter_bank import FilterBank
 
 
 class HydrogenPlantController(ControllerBase):
@@ -31,7 +38,16 @@ class HydrogenPlantController(ControllerBase):
         self.set_controller_parameters(**controller_parameters)
 
         # Initialize filter
-        self.filtered_power_prev = 0
+        self.filter_bank = FilterBank(self.dt)
+        self.filter_bank.add_filter("total_power", "first_order", alpha=0.05/self.dt)
+
+    @property
+    def filtered_power_prev(self):
+        return self.filter_bank.state("total_power")
+
+    @filtered_power_prev.setter
+    def filtered_power_prev(self, value):
+        self.filter_bank.set_state("total_power", value)
 
     def set_controller_parameters(
         self,
@@ -89,6 +105,53 @@ class HydrogenPlantController(ControllerBase):
 
         return generator_controls_dict
 
+    def replay(self, measurements_timeseries):
+        """
+        Replay for HydrogenPlantController (see ControllerBase.replay).
+
+        The input filter is run over the power array using the filter bank; the
+        resulting power references are then replayed through the generator
+        controller.
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+        current_power = timeseries_column(measurements_timeseries["total_power"], n_steps)
+        hydrogen_output = timeseries_column(
+            measurements_timeseries["hydrogen"]["production_rate"], n_steps
+        )
+        hydrogen_reference = timeseries_column(
+            measurements_timeseries["hydrogen"]["power_reference"], n_steps
+        )
+
+        # Input filtering
+        filtered_power = self.filter_bank.filter_timeseries("total_power", current_power)
+
+        # Apply gain to generator power output
+        power_reference = np.maximum(
+            filtered_power + self.K * (hydrogen_reference - hydrogen_output),
+            0
+        )
+
+        generator_controls = {}
+        if self.generator_controller:
+            generator_measurements_timeseries = {
+                k: v for k, v in measurements_timeseries.items() if k != "plant_power_reference"
+            }
+            generator_measurements_timeseries["power_reference"] = power_reference
+
+            generator_controls = self.generator_controller.replay(
+                generator_measurements_timeseries
+            )
+
+            # Clean up returned controls
+            if "yaw_angles" in generator_controls:
+                del generator_controls["yaw_angles"]
+            if "power_setpoints" in generator_controls:
+                generator_controls["wind_power_setpoints"] = (
+                    generator_controls.pop("power_setpoints")
+                )
+
+        return generator_controls
+
     def supervisory_control(self, measurements_dict):
         # Extract measurements sent
         current_power = measurements_dict["total_power"]
@@ -96,8 +159,7 @@ class HydrogenPlantController(ControllerBase):
         hydrogen_reference = measurements_dict["hydrogen"]["power_reference"]
 
         # Input filtering
-        a = 0.05
-        filtered_power = (1-a/self.dt)*self.filtered_power_prev + a/self.dt*current_power
+        filtered_power = self.filter_bank.update({"total_power": current_power})["total_power"]
 
         # Calculate difference between hydrogen reference and hydrogen actual
         hydrogen_error = hydrogen_reference - hydrogen_output
@@ -107,7 +169,5 @@ class HydrogenPlantController(ControllerBase):
 
         if power_reference < 0:
             power_reference = 0
-            
-        self.filtered_power_prev = filtered_power
 
         return power_reference
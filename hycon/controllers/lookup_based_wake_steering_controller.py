@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
-from floris.utilities import wrap_180
 
 from hycon.controllers.controller_base import ControllerBase
-from hycon.design_tools.wake_steering_design import get_yaw_angles_interpolant
+from hycon.controllers.yaw_scheduler import YawScheduler
+from hycon.design_tools.wake_steering_design import (
+    get_sparse_yaw_angles_interpolant,
+    get_yaw_angles_interpolant,
+    HysteresisZoneIndex,
+)
 from hycon.interfaces.interface_base import InterfaceBase
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class LookupBasedWakeSteeringController(ControllerBase):
     def __init__(
@@ -16,6 +24,9 @@ class LookupBasedWakeSteeringController(ControllerBase):
             input_dict: dict,
             df_yaw: pd.DataFrame | None = None,
             hysteresis_dict: dict | None = None,
+            yaw_scheduler: YawScheduler | None = None,
+            table_precision: str = "float64",
+            sparse_table: bool = False,
             verbose: bool = False
         ):
         """
@@ -29,6 +40,17 @@ class LookupBasedWakeSteeringController(ControllerBase):
             hysteresis_dict (dict): Dictionary of hysteresis zones. May be produced using
                 compute_hysteresis_zones function in hycon.design_tools.wake_steering_design.
                 Defaults to None.
+            yaw_scheduler (YawScheduler): Scheduler applied to the yaw angles from the lookup
+                table (after hysteresis) to limit yaw activity. Defaults to None (yaw angles
+                from the lookup table are sent directly).
+            table_precision (str): Precision at which the yaw offsets from df_yaw are stored;
+                one of "float64", "float32", "float16", or "int16" (quantized to hundredths of
+                a degree). See get_yaw_angles_interpolant in
+                hycon.design_tools.wake_steering_design. Defaults to "float64".
+            sparse_table (bool): If True, store only the wind direction sectors in which each
+                turbine has nonzero offsets (see SparseYawOffsetTable in
+                hycon.design_tools.wake_steering_design), reducing memory use for large farms.
+                Defaults to False.
             verbose (bool): Verbosity flag.
         """
         super().__init__(interface, verbose=verbose)
@@ -47,8 +69,14 @@ class LookupBasedWakeSteeringController(ControllerBase):
             if self.verbose:
                 print("No offsets received; assuming nominal aligned control.")
             self.wake_steering_interpolant = None
+        elif sparse_table:
+            self.wake_steering_interpolant = get_sparse_yaw_angles_interpolant(
+                df_yaw, precision=table_precision
+            )
         else:
-            self.wake_steering_interpolant = get_yaw_angles_interpolant(df_yaw)
+            self.wake_steering_interpolant = get_yaw_angles_interpolant(
+                df_yaw, precision=table_precision
+            )
 
         if isinstance(hysteresis_dict, dict) and len(hysteresis_dict) == 0:
             print((
@@ -58,6 +86,18 @@ class LookupBasedWakeSteeringController(ControllerBase):
             hysteresis_dict = None
 
         self.hysteresis_dict = hysteresis_dict
+        self.hysteresis_zone_index = (
+            None if hysteresis_dict is None
+            else HysteresisZoneIndex(hysteresis_dict, self.n_turbines)
+        )
+
+        if yaw_scheduler is not None and yaw_scheduler.n_turbines != self.n_turbines:
+            raise ValueError(
+                "yaw_scheduler n_turbines ({0}) does not match plant n_turbines ({1}).".format(
+                    yaw_scheduler.n_turbines, self.n_turbines
+                )
+            )
+        self.yaw_scheduler = yaw_scheduler
 
         # Set initial conditions
         yaw_IC = input_dict["controller"]["initial_conditions"]["yaw"]
@@ -74,48 +114,63 @@ class LookupBasedWakeSteeringController(ControllerBase):
 
         # For startup
         self.wd_store = [270.]*self.n_turbines # TODO: update this?
-        self.yaw_store = yaw_IC
+        self.ws_store = [8.0]*self.n_turbines
+        self.ti_store = None
+        self.yaw_store = list(self.controls_dict["yaw_angles"])
 
 
     def compute_controls(self, measurements_dict):
-        return self.wake_steering_angles(measurements_dict["wind_farm"]["wind_directions"])
+        return self.wake_steering_angles(
+            measurements_dict["wind_farm"]["wind_directions"],
+            measurements_dict["wind_farm"].get("wind_speeds"),
+            measurements_dict["wind_farm"].get("turbulence_intensities"),
+        )
 
-    def wake_steering_angles(self, wind_directions):
+    def wake_steering_angles(self, wind_directions, wind_speeds=None, turbulence_intensities=None):
 
         # Handle possible bad data
-        wind_speeds = [8.0]*self.n_turbines # TODO: enable extraction of wind speed in Hercules
         if not wind_directions: # Received empty or None
             if self.verbose:
                 print("Bad wind direction measurement received, reverting to previous measurement.")
             wind_directions = self.wd_store
         else:
             self.wd_store = wind_directions
+        if wind_speeds is None or len(wind_speeds) == 0:
+            # Wind speeds not available; revert to previous measurement
+            wind_speeds = self.ws_store
+        else:
+            self.ws_store = wind_speeds
+        if turbulence_intensities is None or len(turbulence_intensities) == 0:
+            # Turbulence intensities not available; revert to previous measurement (if any,
+            # otherwise the interpolant uses the median turbulence intensity of the table)
+            turbulence_intensities = self.ti_store
+        else:
+            self.ti_store = turbulence_intensities
 
         # Look up wind direction
         if self.wake_steering_interpolant is None:
             yaw_setpoint = wind_directions
         else:
-            interpolated_angles = self.wake_steering_interpolant(
+            yaw_offsets = self.wake_steering_interpolant(
                 wind_directions,
                 wind_speeds,
-                None
+                turbulence_intensities,
+                per_turbine=True
             )
-            yaw_offsets = np.diag(interpolated_angles)
             yaw_setpoint = (np.array(wind_directions) - yaw_offsets).tolist()
 
         # Apply hysteresis
-        if self.hysteresis_dict is not None:
-            for t in range(self.n_turbines):
-                for zone in self.hysteresis_dict["T{:03d}".format(t)]:
-                    if (
-                        (zone[0] < wind_directions[t] < zone[1])
-                        or (wrap_180(zone[0]) < wrap_180(wind_directions[t]) < wrap_180(zone[1]))
-                        ):
-                        # In hysteresis zone, overwrite yaw angle with previous setpoint
-                        yaw_setpoint[t] = self.yaw_store[t]
+        if self.hysteresis_zone_index is not None:
+            # In hysteresis zone, overwrite yaw angle with previous setpoint
+            for t in np.flatnonzero(self.hysteresis_zone_index.in_zone(wind_directions)):
+                yaw_setpoint[t] = self.yaw_store[t]
 
         self.yaw_store = yaw_setpoint
 
+        # Schedule yaw maneuvers
+        if self.yaw_scheduler is not None:
+            yaw_setpoint = self.yaw_scheduler.update(yaw_setpoint).tolist()
+
         self.controls_dict = {"yaw_angles": yaw_setpoint}
 
         return {"yaw_angles": yaw_setpoint}
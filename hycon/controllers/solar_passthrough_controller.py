@@ -1,4 +1,8 @@
-from hycon.controllers.controller_base import ControllerBase
+from hycon.controllers.controller_base import (
+    ControllerBase,
+    timeseries_column,
+    timeseries_length,
+)
 
 
 class SolarPassthroughController(ControllerBase):
@@ -10,3 +14,14 @@ class SolarPassthroughController(ControllerBase):
 
     def compute_controls(self, measurements_dict):
         return {"power_setpoint": measurements_dict["solar_farm"]["power_reference"]}
+
+    def replay(self, measurements_timeseries):
+        """
+        Vectorized replay for SolarPassthroughController (see ControllerBase.replay).
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+        return {
+            "power_setpoint": timeseries_column(
+                measurements_timeseries["solar_farm"]["power_reference"], n_steps
+            ).copy()
+        }
@@ -1,18 +1,85 @@
 import numpy as np
 
-from hycon.controllers.controller_base import ControllerBase
+from hycon.controllers.controller_base import (
+    ControllerBase,
+    timeseries_column,
+    timeseries_length,
+)
 
 # Default power setpoint in kW (meant to ensure power maximization)
 POWER_SETPOINT_DEFAULT = 1e9 
 
+def water_filling_allocation(total_power, capacities):
+    """
+    Allocate a total power among turbines with limited capacities by water filling.
+
+    Each turbine receives min(capacity, level), where the common level is chosen such that the
+    allocations sum to total_power. The level is found directly by sorting the capacities and
+    computing prefix sums, i.e., in O(n log n) without iterative redistribution. If total_power
+    exceeds the sum of the capacities, the surplus is split evenly on top of the capacities.
+
+    Operates along the last axis of capacities, so that a batch of allocation problems (e.g.,
+    multiple time steps) may be solved in a single call.
+
+    Args:
+        total_power (float or np.ndarray): Total power to allocate. Must be a scalar or have
+            shape capacities.shape[:-1].
+        capacities (np.ndarray): Power available to each turbine, with turbines along the
+            last axis.
+
+    Returns:
+        np.ndarray: Power allocated to each turbine, with the same shape as capacities.
+    """
+    capacities = np.maximum(np.asarray(capacities, dtype=float), 0.0)
+    total_power = np.maximum(np.asarray(total_power, dtype=float), 0.0)[..., None]
+    n = capacities.shape[-1]
+
+    capacities_sorted = np.sort(capacities, axis=-1)
+    prefix_sums = np.cumsum(capacities_sorted, axis=-1)
+    total_capacity = prefix_sums[..., -1:]
+
+    # Candidate levels, assuming the k smallest turbines are capacity-limited
+    prefix_sums_exclusive = prefix_sums - capacities_sorted
+    levels = (total_power - prefix_sums_exclusive) / (n - np.arange(n))
+
+    # Solution is the first candidate level that does not exceed the next capacity
+    k = np.argmax(levels <= capacities_sorted, axis=-1)[..., None]
+    level = np.take_along_axis(levels, k, axis=-1)
+
+    return np.where(
+        total_power >= total_capacity,
+        capacities + (total_power - total_capacity) / n,
+        np.minimum(capacities, level)
+    )
+
 class WindFarmPowerDistributingController(ControllerBase):
     """
-    Evenly distributes wind farm power reference between turbines without 
-    feedback on current power generation.
+    Distributes wind farm power reference between turbines without feedback on
+    current power generation. The reference is split either evenly, or, if
+    distribution_mode is "available_power", by water filling over the turbines'
+    available powers.
     """
-    def __init__(self, interface, input_dict, verbose=False):
+    def __init__(self, interface, input_dict, distribution_mode="equal", verbose=False):
+        """
+        Constructor for WindFarmPowerDistributingController.
+
+        Args:
+            interface: Hycon Interface object for communication with the simulation environment.
+            input_dict: Dictionary containing input parameters for the controller.
+            distribution_mode: Method for distributing the farm power reference among turbines.
+                "equal" splits the reference evenly; "available_power" allocates the reference
+                by water filling over turbine_available_powers, provided in the wind_farm
+                measurements. Defaults to "equal".
+            verbose: Boolean flag for verbosity.
+        """
         super().__init__(interface, verbose=verbose)
 
+        if distribution_mode not in ["equal", "available_power"]:
+            raise ValueError(
+                "distribution_mode must be either 'equal' or 'available_power'."
+            )
+        self.distribution_mode = distribution_mode
+
         # Pull plant parameters for ease of use
         self.cname = "wind_farm"
         
@@ -23,6 +90,50 @@ class WindFarmPowerDistributingController(ControllerBase):
         self.turbines = range(self.n_turbines)
 
     def compute_controls(self, measurements_dict):
+        return self.turbine_power_references(
+            farm_power_reference=self.farm_power_reference(measurements_dict),
+            turbine_powers=measurements_dict[self.cname]["turbine_powers"],
+            turbine_available_powers=measurements_dict[self.cname].get(
+                "turbine_available_powers", None
+            ),
+        )
+
+    def replay(self, measurements_timeseries):
+        """
+        Vectorized replay for WindFarmPowerDistributingController (see ControllerBase.replay).
+        """
+        n_steps = timeseries_length(measurements_timeseries)
+        farm_power_reference = timeseries_column(
+            self.farm_power_reference(measurements_timeseries), n_steps
+        )
+        turbine_available_powers = measurements_timeseries[self.cname].get(
+            "turbine_available_powers", None
+        )
+
+        if self.distribution_mode == "available_power" and turbine_available_powers is not None:
+            power_setpoints = water_filling_allocation(
+                farm_power_reference,
+                np.broadcast_to(
+                    np.asarray(turbine_available_powers, dtype=float),
+                    (n_steps, self.n_turbines)
+                )
+            )
+        else:
+            power_setpoints = np.repeat(
+                farm_power_reference[:, None] / self.n_turbines, self.n_turbines, axis=1
+            )
+
+        return {"power_setpoints": power_setpoints}
+
+    def farm_power_reference(self, measurements_dict):
+        """
+        Extract the farm-level power reference from the measurements.
+
+        Inputs:
+        - measurements_dict: dict, measurements (or columnar measurements time series)
+        Outputs:
+        - farm_power_reference: float (or array), farm-level power reference
+        """
         ref_in_lower_dict = (
             "power_reference" in measurements_dict[self.cname]
             and measurements_dict[self.cname]["power_reference"] is not None
@@ -43,25 +154,39 @@ class WindFarmPowerDistributingController(ControllerBase):
         else:
             farm_power_reference = POWER_SETPOINT_DEFAULT
 
-        return self.turbine_power_references(
-            farm_power_reference=farm_power_reference,
-            turbine_powers=measurements_dict[self.cname]["turbine_powers"]
-        )
+        return farm_power_reference
 
     def turbine_power_references(
             self,
             farm_power_reference=POWER_SETPOINT_DEFAULT,
-            turbine_powers=None
+            turbine_powers=None,
+            turbine_available_powers=None,
         ):
         """
         Compute turbine-level power setpoints based on farm-level power
         reference signal.
         Inputs:
         - farm_power_reference: float, farm-level power reference signal
+        - turbine_powers: list or array, current turbine power outputs
+        - turbine_available_powers: list or array, estimates of the power
+          available to each turbine (used only if distribution_mode is
+          "available_power")
         Outputs:
-        - None (sets self.controls_dict)
+        - controls_dict: dict, containing turbine power setpoints
         """
 
+        if self.distribution_mode == "available_power":
+            if turbine_available_powers is not None:
+                # Water-fill farm power reference over available turbine powers.
+                return {
+                    "power_setpoints": water_filling_allocation(
+                        farm_power_reference,
+                        turbine_available_powers
+                    ).tolist()
+                }
+            elif self.verbose:
+                print("No turbine available powers received; distributing reference evenly.")
+
         # Split farm power reference among turbines.
         controls_dict = {
             "power_setpoints": [farm_power_reference/self.n_turbines]*self.n_turbines,
@@ -71,8 +196,9 @@ class WindFarmPowerDistributingController(ControllerBase):
 
 class WindFarmPowerTrackingController(WindFarmPowerDistributingController):
     """
-    Based on controller developed under A2e2g project. Proportional control only---
-    all integral action is disabled.
+    Based on controller developed under A2e2g project. Proportional-integral
+    control with gain scheduling based on the number of saturated turbines.
+    Integral action is disabled by default (integral_gain=0).
 
     Inherits from WindFarmPowerDistributingController.
     """
@@ -82,7 +208,9 @@ class WindFarmPowerTrackingController(WindFarmPowerDistributingController):
             interface, 
             input_dict,
             proportional_gain=1,
+            integral_gain=0,
             ramp_rate_limit=None,
+            saturation_tolerance=1.0,
             verbose=False
         ):
         """
@@ -92,32 +220,68 @@ class WindFarmPowerTrackingController(WindFarmPowerDistributingController):
             interface: Hycon Interface object for communication with the simulation environment.
             input_dict: Dictionary containing input parameters for the controller.
             proportional_gain: Proportional gain for the controller.
+            integral_gain: Integral gain for the controller (1/s). Defaults to 0, i.e.,
+                proportional control only.
             ramp_rate_limit: Ramp rate limit for the controller (kW/s). Defaults to None.
+            saturation_tolerance: Margin (kW) below a turbine's available power within which
+                the turbine is considered saturated. Only used if turbine available powers are
+                provided in the measurements. Defaults to 1.0.
             verbose: Boolean flag for verbosity.
         """
         super().__init__(interface, input_dict, verbose=verbose)
 
-        # Proportional gain
+        # Proportional and integral gains
         self.K_p = proportional_gain * 1/self.n_turbines
+        self.K_i = integral_gain * 1/self.n_turbines
 
         # Ramp rate limit
         self.ramp_rate_limit = ramp_rate_limit
 
+        # Saturation detection
+        self.saturation_tolerance = saturation_tolerance
+        self.n_saturated = 0
+
+        # Initialize controller internal state
+        self.e_prev = 0.0
+        self.u_i_prev = 0.0
+
+    def replay(self, measurements_timeseries):
+        """
+        Replay for WindFarmPowerTrackingController (see ControllerBase.replay).
+
+        The controller is stateful, so replay scans over time steps.
+        """
+        return ControllerBase.replay(self, measurements_timeseries)
+
     def turbine_power_references(
             self,
             farm_power_reference=POWER_SETPOINT_DEFAULT,
-            turbine_powers=None
+            turbine_powers=None,
+            turbine_available_powers=None,
         ):
         """
         Compute turbine-level power setpoints based on farm-level power
         reference signal.
+
+        If turbine_available_powers is provided, turbines producing within
+        saturation_tolerance of their available power are treated as saturated
+        when the farm is under-producing. The control gains are then scheduled
+        so that the full farm-level correction is redistributed across the
+        unsaturated turbines, saturated turbines are assigned their available
+        power, and integration is halted if all turbines are saturated
+        (anti-windup). All operations are vectorized over turbines.
+
         Inputs:
         - farm_power_reference: float, farm-level power reference signal
+        - turbine_powers: list or array, current turbine power outputs
+        - turbine_available_powers: list or array, estimates of the power
+          available to each turbine. Defaults to None (no saturation detection).
         Outputs:
-        - None (sets self.controls_dict)
+        - controls_dict: dict, containing turbine power setpoints
         """
-        
-        farm_current_power = np.sum(turbine_powers)
+        turbine_powers = np.asarray(turbine_powers, dtype=float)
+
+        farm_current_power = turbine_powers.sum()
         farm_current_error = farm_power_reference - farm_current_power
 
         # Apply ramp rate limit
@@ -128,37 +292,44 @@ class WindFarmPowerTrackingController(WindFarmPowerDistributingController):
                 farm_current_power + self.ramp_rate_limit * self.dt
             )
 
-        self.n_saturated = 0 # TODO: determine whether to use gain scheduling
+        # Determine saturated turbines (only relevant when more power is requested)
+        if turbine_available_powers is not None and farm_current_error > 0:
+            turbine_available_powers = np.asarray(turbine_available_powers, dtype=float)
+            saturated = turbine_powers >= turbine_available_powers - self.saturation_tolerance
+        else:
+            saturated = np.zeros(self.n_turbines, dtype=bool)
+        self.n_saturated = int(np.count_nonzero(saturated))
+
+        # Gain scheduling to redistribute the correction across unsaturated turbines
         if self.n_saturated < self.n_turbines:
             # with self.n_saturated = 0, gain_adjustment = 1
             gain_adjustment = self.n_turbines/(self.n_turbines-self.n_saturated)
         else:
             gain_adjustment = self.n_turbines
         K_p_gs = gain_adjustment*self.K_p
-        #K_i_gs = gain_adjustment*self.K_i
+        K_i_gs = gain_adjustment*self.K_i
 
         # Discretize and apply difference equation (trapezoid rule)
         u_p = K_p_gs*farm_current_error
-        #u_i = self.dt/2*K_i_gs * (farm_current_error + self.e_prev) + self.u_i_prev
+        u_i = self.dt/2*K_i_gs * (farm_current_error + self.e_prev) + self.u_i_prev
 
-        # Apply integral anti-windup
-        #eps = 0.0001 # Threshold for anti-windup
-        #if (np.array(self.ai_prev) > 1/3-eps).all() or \
-        #   (np.array(self.ai_prev) < 0+eps).all():
-        #   u_i = 0
-        
-        u = u_p #+ u_i
+        # Apply integral anti-windup (hold integrator if no turbine can respond)
+        if self.n_saturated == self.n_turbines:
+            u_i = self.u_i_prev
+
+        u = u_p + u_i
         delta_P_ref = u
 
-        turbine_power_setpoints = np.array(turbine_powers) + delta_P_ref
+        turbine_power_setpoints = turbine_powers + delta_P_ref
+        if self.n_saturated > 0:
+            turbine_power_setpoints[saturated] = turbine_available_powers[saturated]
 
         controls_dict = {
-            "power_setpoints": list(turbine_power_setpoints),
+            "power_setpoints": turbine_power_setpoints.tolist(),
         }
 
-        # Store error, control (only needed for integral action, which is disabled)
-        # self.e_prev = farm_current_error
-        # self.u_prev = u
-        # self.u_i_prev = u_i
+        # Store error, integral control action
+        self.e_prev = farm_current_error
+        self.u_i_prev = u_i
 
         return controls_dict
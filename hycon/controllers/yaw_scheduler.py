@@ -0,0 +1,163 @@
+import numpy as np
+
+from hycon.angles import angle_difference
+
+
+class YawScheduler():
+    """
+    Actuator-aware scheduler that converts target yaw angles into yaw setpoints.
+
+    Rather than passing target yaw angles (for example, from a wake steering lookup table)
+    directly to the turbines at every time step, each turbine holds its yaw setpoint until the
+    time-averaged misalignment between the target and the setpoint exceeds a deadband, and at
+    least a minimum dwell time has passed since the turbine last finished yawing. The turbine
+    then moves to the time-averaged target at no more than a maximum yaw rate. All operations
+    are vectorized over turbines, and all parameters may be specified per turbine.
+
+    Yaw setpoints are continuous (not wrapped to [0, 360)), so that a turbine yawing through
+    the 0/360 degree point takes the shorter path.
+
+    The cumulative yaw travel, number of yaw maneuvers, and number of setpoint changes of each
+    turbine are recorded, and are available via statistics().
+    """
+    def __init__(
+        self,
+        dt,
+        n_turbines,
+        deadband=0.0,
+        minimum_dwell_time=0.0,
+        maximum_yaw_rate=np.inf,
+        averaging_time=0.0,
+    ):
+        """
+        Constructor for YawScheduler.
+
+        Args:
+            dt (float): Time step (s) at which update() is called.
+            n_turbines (int): Number of turbines.
+            deadband (float or array-like): Time-averaged misalignment (degrees) between the
+                target yaw angle and the yaw setpoint above which a yaw maneuver is started.
+                Defaults to 0.0.
+            minimum_dwell_time (float or array-like): Minimum time (s) between the end of one
+                yaw maneuver and the start of the next. Defaults to 0.0.
+            maximum_yaw_rate (float or array-like): Maximum rate of change of the yaw setpoint
+                (degrees/s). Defaults to np.inf (yaw maneuvers completed in one time step).
+            averaging_time (float or array-like): Time constant (s) of the exponential filter
+                applied to the misalignment between the target yaw angle and the yaw setpoint.
+                Defaults to 0.0 (no averaging).
+        """
+        self.dt = dt
+        self.n_turbines = n_turbines
+
+        shape = (n_turbines,)
+        self.deadband = np.broadcast_to(np.asarray(deadband, dtype=float), shape)
+        self.minimum_dwell_time = np.broadcast_to(
+            np.asarray(minimum_dwell_time, dtype=float), shape
+        )
+        self.maximum_yaw_step = np.broadcast_to(
+            np.asarray(maximum_yaw_rate, dtype=float) * dt, shape
+        )
+        averaging_time = np.broadcast_to(np.asarray(averaging_time, dtype=float), shape)
+        if (np.any(self.deadband < 0) or np.any(self.minimum_dwell_time < 0)
+            or np.any(self.maximum_yaw_step <= 0) or np.any(averaging_time < 0)):
+            raise ValueError(
+                "deadband, minimum_dwell_time and averaging_time must be nonnegative, and "
+                "maximum_yaw_rate must be positive."
+            )
+        self._alpha = np.exp(-dt / np.maximum(averaging_time, 1e-12))
+
+        self.reset()
+
+    def reset(self, yaw_angles=None):
+        """
+        Reset the scheduler state and statistics.
+
+        Args:
+            yaw_angles (array-like, optional): Initial yaw setpoints (degrees). Defaults to
+                None, in which case the setpoints are initialized to the first target yaw
+                angles passed to update().
+        """
+        self.yaw_angles = (
+            None if yaw_angles is None
+            else np.array(np.broadcast_to(yaw_angles, (self.n_turbines,)), dtype=float)
+        )
+        self._goal = np.zeros(self.n_turbines)
+        self._filtered_misalignment = np.zeros(self.n_turbines)
+        self._maneuvering = np.zeros(self.n_turbines, dtype=bool)
+        self._time_since_maneuver = np.full(self.n_turbines, np.inf)
+
+        self.yaw_travel = np.zeros(self.n_turbines)
+        self.n_maneuvers = np.zeros(self.n_turbines, dtype=int)
+        self.n_setpoint_changes = np.zeros(self.n_turbines, dtype=int)
+        self.n_steps = 0
+
+    def update(self, target_yaw_angles):
+        """
+        Compute yaw setpoints for the current time step.
+
+        Args:
+            target_yaw_angles (array-like): Target yaw angle (degrees) of each turbine.
+
+        Returns:
+            np.ndarray: Yaw setpoint (degrees) of each turbine.
+        """
+        target_yaw_angles = np.asarray(target_yaw_angles, dtype=float)
+        self.n_steps += 1
+        if self.yaw_angles is None:
+            self.yaw_angles = np.array(target_yaw_angles, dtype=float)
+            return self.yaw_angles.copy()
+
+        # Time-averaged misalignment between the target and the current setpoint
+        misalignment = angle_difference(target_yaw_angles, self.yaw_angles)
+        self._filtered_misalignment *= self._alpha
+        self._filtered_misalignment += (1 - self._alpha) * misalignment
+
+        # Start maneuvers where the misalignment exceeds the deadband and the dwell time is met
+        start = (
+            ~self._maneuvering
+            & (np.abs(self._filtered_misalignment) > self.deadband)
+            & (self._time_since_maneuver >= self.minimum_dwell_time)
+        )
+        self._goal[start] = self.yaw_angles[start] + self._filtered_misalignment[start]
+        self._maneuvering |= start
+        self.n_maneuvers += start
+
+        # Move towards the goal, subject to the yaw rate limit
+        yaw_step = np.where(
+            self._maneuvering,
+            np.clip(self._goal - self.yaw_angles, -self.maximum_yaw_step, self.maximum_yaw_step),
+            0.0,
+        )
+        arrived = (
+            self._maneuvering & (np.abs(self._goal - self.yaw_angles) <= self.maximum_yaw_step)
+        )
+        self.yaw_angles += yaw_step
+        self.yaw_angles[arrived] = self._goal[arrived] # Avoid round-off error at the goal
+        self._filtered_misalignment -= yaw_step
+        self._maneuvering &= ~arrived
+
+        # Update dwell timers and statistics
+        self._time_since_maneuver = np.where(
+            self._maneuvering | arrived, 0.0, self._time_since_maneuver + self.dt
+        )
+        self.yaw_travel += np.abs(yaw_step)
+        self.n_setpoint_changes += yaw_step != 0.0
+
+        return self.yaw_angles.copy()
+
+    def statistics(self):
+        """
+        Report the cumulative yaw statistics since the last reset.
+
+        Returns:
+            dict: Dictionary containing the yaw travel (degrees), number of yaw maneuvers, and
+                number of setpoint changes of each turbine, as well as the total yaw travel
+                (degrees) over all turbines and the elapsed time (s).
+        """
+        return {
+            "yaw_travel": self.yaw_travel.copy(),
+            "total_yaw_travel": float(self.yaw_travel.sum()),
+            "n_maneuvers": self.n_maneuvers.copy(),
+            "n_setpoint_changes": self.n_setpoint_changes.copy(),
+            "elapsed_time": self.n_steps * self.dt,
+        }
@@ -1,10 +1,21 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
-from floris import FlorisModel, UncertainFlorisModel, WindRose, WindTIRose
-from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
-from floris.utilities import wrap_360
+from hycon.angles import wrap_360
 from scipy.interpolate import interp1d, RegularGridInterpolator
 
+# FLORIS is slow to import, so is only imported in the functions that use it (allowing
+# get_yaw_angles_interpolant to be used by controllers without loading FLORIS)
+if TYPE_CHECKING:
+    from floris import FlorisModel
+
+YAW_OFFSET_PRECISIONS = ["float64", "float32", "float16", "int16"]
+INT16_RESOLUTION = 0.01 # Resolution (degrees) of int16 quantized yaw offsets
+
 
 def build_simple_wake_steering_lookup_table(
     fmodel: FlorisModel,
@@ -19,6 +30,9 @@ def build_simple_wake_steering_lookup_table(
     ti_max: float = 0.06,
     minimum_yaw_angle: float = 0.0,
     maximum_yaw_angle: float = 25.0,
+    wind_directions: np.ndarray | None = None,
+    wind_speeds: np.ndarray | None = None,
+    turbulence_intensities: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     Build a simple wake steering lookup table for a given FlorisModel using the Serial Refine
@@ -49,23 +63,26 @@ def build_simple_wake_steering_lookup_table(
             degrees. Defaults to 0.0.
         maximum_yaw_angle (float, optional): The maximum (inclusive) allowable misalignment in
             degrees. Defaults to 25.0.
+        wind_directions (np.ndarray, optional): Wind directions in degrees, which need not be
+            uniformly spaced. If provided, wd_resolution, wd_min, and wd_max are ignored.
+            Defaults to None.
+        wind_speeds (np.ndarray, optional): Wind speeds in m/s, which need not be uniformly
+            spaced. If provided, ws_resolution, ws_min, and ws_max are ignored. Defaults to None.
+        turbulence_intensities (np.ndarray, optional): Turbulence intensities as fractions,
+            which need not be uniformly spaced. If provided, ti_resolution, ti_min, and ti_max
+            are ignored. Defaults to None.
 
     Returns:
         pd.DataFrame: A yaw offset lookup table.
     """
-    wind_rose = create_uniform_wind_rose(
-        wd_resolution=wd_resolution,
-        wd_min=wd_min,
-        wd_max=wd_max,
-        ws_resolution=ws_resolution,
-        ws_min=ws_min,
-        ws_max=ws_max,
-        ti_resolution=ti_resolution,
-        ti_min=ti_min,
-        ti_max=ti_max,
+    wind_data = _design_wind_data(
+        wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max,
+        wind_directions, wind_speeds, turbulence_intensities
     )
 
-    fmodel.set(wind_data=wind_rose)
+    fmodel.set(wind_data=wind_data)
+
+    from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
 
     yaw_opt = YawOptimizationSR(
         fmodel=fmodel,
@@ -91,6 +108,9 @@ def build_uncertain_wake_steering_lookup_table(
     minimum_yaw_angle: float = 0.0,
     maximum_yaw_angle: float = 25.0,
     kwargs_UncertainFlorisModel: dict = {},
+    wind_directions: np.ndarray | None = None,
+    wind_speeds: np.ndarray | None = None,
+    turbulence_intensities: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     Build a simple wake steering lookup table for a given FlorisModel using the Serial Refine
@@ -124,23 +144,27 @@ def build_uncertain_wake_steering_lookup_table(
             degrees. Defaults to 25.0.
         kwargs_UncertainFlorisModel (dict, optional): Additional keyword arguments for the
             instantiation of the UncertainFlorisModel. Defaults to an empty dictionary.
+        wind_directions (np.ndarray, optional): Wind directions in degrees, which need not be
+            uniformly spaced. If provided, wd_resolution, wd_min, and wd_max are ignored.
+            Defaults to None.
+        wind_speeds (np.ndarray, optional): Wind speeds in m/s, which need not be uniformly
+            spaced. If provided, ws_resolution, ws_min, and ws_max are ignored. Defaults to None.
+        turbulence_intensities (np.ndarray, optional): Turbulence intensities as fractions,
+            which need not be uniformly spaced. If provided, ti_resolution, ti_min, and ti_max
+            are ignored. Defaults to None.
 
     Returns:
         pd.DataFrame: A yaw offset lookup table.
     """
-    wind_rose = create_uniform_wind_rose(
-        wd_resolution=wd_resolution,
-        wd_min=wd_min,
-        wd_max=wd_max,
-        ws_resolution=ws_resolution,
-        ws_min=ws_min,
-        ws_max=ws_max,
-        ti_resolution=ti_resolution,
-        ti_min=ti_min,
-        ti_max=ti_max,
+    wind_data = _design_wind_data(
+        wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max,
+        wind_directions, wind_speeds, turbulence_intensities
     )
 
-    fmodel.set(wind_data=wind_rose)
+    fmodel.set(wind_data=wind_data)
+
+    from floris import UncertainFlorisModel
+    from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
 
     ufmodel = UncertainFlorisModel(
         configuration=fmodel.core.as_dict(),
@@ -157,6 +181,393 @@ def build_uncertain_wake_steering_lookup_table(
     return yaw_opt.optimize()
 
 
+def build_uncertain_wake_steering_lookup_table_sweep(
+    fmodel: FlorisModel,
+    wd_stds: list[float],
+    wd_resolution: float = 5.0,
+    wd_min: float = 0.0,
+    wd_max: float = 360.0,
+    ws_resolution: float = 1.0,
+    ws_min: float = 8.0,
+    ws_max: float = 8.0,
+    ti_resolution: float = 0.02,
+    ti_min: float = 0.06,
+    ti_max: float = 0.06,
+    minimum_yaw_angle: float = 0.0,
+    maximum_yaw_angle: float = 25.0,
+    expanded_wd_resolution: float = 1.0,
+    offset_scales: list[float] = [0.25, 0.5, 0.75, 1.0],
+    n_processes: int | None = None,
+    chunk_size: int = 10000,
+    wind_directions: np.ndarray | None = None,
+    wind_speeds: np.ndarray | None = None,
+    turbulence_intensities: np.ndarray | None = None,
+) -> dict[float, pd.DataFrame]:
+    """
+    Build wake steering lookup tables accounting for uncertainty in the wind direction, for
+    each of several wind direction standard deviations, sharing FLORIS evaluations between
+    them.
+
+    As in UncertainFlorisModel, the power at each nominal wind direction is the Gaussian
+    weighted average of the power at the nominal wind direction offset by -2, -1, 0, 1, and 2
+    standard deviations. Rather than optimizing each nominal condition separately (as in
+    build_uncertain_wake_steering_lookup_table), the design proceeds in two stages:
+
+    1. The set of all offset ("expanded") wind directions, over all nominal wind directions
+       and standard deviations, is computed once (rounded to expanded_wd_resolution), and the
+       optimal yaw offsets at each are found with the Serial Refine method.
+    2. For each nominal condition, the candidate offsets are the optimal offsets at its
+       expanded wind directions, scaled by each of offset_scales, along with zero offsets.
+       The power of each candidate at each expanded wind direction is evaluated once, so that
+       evaluations are shared between neighbouring nominal wind directions (whose expansions
+       overlap) and between standard deviations. For each standard deviation, the candidate
+       with the highest weighted average power is selected.
+
+    Both stages are evaluated in chunks, in parallel across n_processes processes. Since the
+    offsets are selected from a candidate set rather than optimized directly, the resulting
+    power may be slightly lower than that of build_uncertain_wake_steering_lookup_table, but
+    additional standard deviations cost only the evaluation of any additional expanded wind
+    directions.
+
+    Args:
+        fmodel (FlorisModel): An instantiated FlorisModel object.
+        wd_stds (list[float]): Wind direction standard deviations in degrees.
+        wd_resolution (float, optional): The resolution of the wind direction in degrees.
+            Defaults to 5.
+        wd_min (float, optional): The minimum (inclusive) wind direction in degrees. Defaults to 0.
+        wd_max (float, optional): The maximum (inclusive) wind direction in degrees. Defaults to
+            360.
+        ws_resolution (float, optional): The resolution of the wind speed in m/s.
+            Defaults to 1.
+        ws_min (float, optional): The minimum (inclusive) wind speed in m/s. Defaults to 8.
+        ws_max (float, optional): The maximum (inclusive) wind speed in m/s. Defaults to 8.
+        ti_resolution (float, optional): The resolution of the turbulence intensity as a fraction.
+            Defaults to 0.02.
+        ti_min (float, optional): The minimum (inclusive) turbulence intensity as a fraction.
+            Defaults to 0.06.
+        ti_max (float, optional): The maximum (inclusive) turbulence intensity as a fraction.
+            Defaults to 0.06.
+        minimum_yaw_angle (float, optional): The minimum (inclusive) allowable misalignment in
+            degrees. Defaults to 0.0.
+        maximum_yaw_angle (float, optional): The maximum (inclusive) allowable misalignment in
+            degrees. Defaults to 25.0.
+        expanded_wd_resolution (float, optional): The resolution in degrees to which expanded
+            wind directions are rounded. Defaults to 1.
+        offset_scales (list[float], optional): Factors by which the optimal offsets at the
+            expanded wind directions are scaled to form candidate offsets. Defaults to
+            [0.25, 0.5, 0.75, 1.0].
+        n_processes (int, optional): Number of processes to evaluate chunks in. Defaults to
+            None, in which case the number of CPUs is used.
+        chunk_size (int, optional): Maximum number of conditions in each chunk of candidate
+            evaluations. Defaults to 10000.
+        wind_directions (np.ndarray, optional): Wind directions in degrees, which need not be
+            uniformly spaced. If provided, wd_resolution, wd_min, and wd_max are ignored.
+            Defaults to None.
+        wind_speeds (np.ndarray, optional): Wind speeds in m/s, which need not be uniformly
+            spaced. If provided, ws_resolution, ws_min, and ws_max are ignored. Defaults to None.
+        turbulence_intensities (np.ndarray, optional): Turbulence intensities as fractions,
+            which need not be uniformly spaced. If provided, ti_resolution, ti_min, and ti_max
+            are ignored. Defaults to None.
+
+    Returns:
+        dict: Yaw offset lookup table for each wind direction standard deviation.
+    """
+    wd_stds = np.atleast_1d(np.asarray(wd_stds, dtype=float))
+    if np.any(wd_stds <= 0):
+        raise ValueError("wd_stds must be strictly greater than 0.")
+    if n_processes is None:
+        n_processes = os.cpu_count() or 1
+    _check_design_axes(wind_directions, wind_speeds, turbulence_intensities)
+    wind_directions, wind_speeds, turbulence_intensities = (
+        uniform if specified is None else np.atleast_1d(np.asarray(specified, dtype=float))
+        for uniform, specified in zip(
+            _uniform_axes(
+                wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution,
+                ti_min, ti_max
+            ),
+            (wind_directions, wind_speeds, turbulence_intensities)
+        )
+    )
+    n_wd, n_ws, n_ti = len(wind_directions), len(wind_speeds), len(turbulence_intensities)
+    n_turbines = len(fmodel.layout_x)
+
+    # Expanded wind directions of each nominal wind direction, for each standard deviation
+    sample_points = np.array([-2.0, -1.0, 0.0, 1.0, 2.0])
+    weights = np.exp(-sample_points**2 / 2) # Same for all standard deviations
+    weights /= weights.sum()
+    expanded_wds, expanded_idx = np.unique(
+        wrap_360(
+            np.round(
+                (wind_directions[None, :, None] + wd_stds[:, None, None] * sample_points)
+                / expanded_wd_resolution
+            ) * expanded_wd_resolution
+        ),
+        return_inverse=True
+    )
+    expanded_idx = expanded_idx.reshape(len(wd_stds), n_wd, len(sample_points))
+
+    # Stage 1: optimal offsets at each expanded wind direction
+    df_opt_expanded = pd.concat(_map_chunks(
+        _optimize_chunk,
+        [(fmodel, chunk, wind_speeds, turbulence_intensities, minimum_yaw_angle,
+          maximum_yaw_angle)
+         for chunk in np.array_split(expanded_wds, min(n_processes, len(expanded_wds)))],
+        n_processes
+    ))
+    optimal_offsets = np.vstack(df_opt_expanded.yaw_angles_opt.to_numpy()).reshape(
+        len(expanded_wds), n_ws, n_ti, n_turbines
+    )
+
+    # Stage 2: candidate offsets of each nominal condition, and the conditions to evaluate
+    # them at (expanded wind direction index, wind speed index, turbulence intensity index,
+    # offsets)
+    scales = np.asarray(offset_scales, dtype=float)
+    conditions = []
+    groups = []
+    for i in range(n_wd):
+        sample_idx = np.unique(expanded_idx[:, i, :])
+        for j in range(n_ws):
+            for k in range(n_ti):
+                candidates = np.clip(
+                    scales[:, None, None] * optimal_offsets[None, sample_idx, j, k, :],
+                    minimum_yaw_angle,
+                    maximum_yaw_angle
+                ).reshape(-1, n_turbines)
+                candidates = np.unique(candidates, axis=0)
+                # Zero offsets first, so that they are selected in case of ties
+                candidates = np.vstack([np.zeros((1, n_turbines)), candidates])
+                n_c, n_s = len(candidates), len(sample_idx)
+                conditions.append(np.hstack([
+                    np.repeat(sample_idx, n_c)[:, None],
+                    np.full((n_s * n_c, 1), j),
+                    np.full((n_s * n_c, 1), k),
+                    np.tile(candidates, (n_s, 1)),
+                ]))
+                groups.append((i, j, k, sample_idx, candidates))
+    conditions = np.vstack(conditions)
+    unique_conditions, condition_idx = np.unique(conditions, axis=0, return_inverse=True)
+    condition_idx = condition_idx.reshape(-1)
+
+    n_chunks = max(min(n_processes, len(unique_conditions)),
+                   int(np.ceil(len(unique_conditions) / chunk_size)))
+    farm_powers = np.concatenate(_map_chunks(
+        _farm_power_chunk,
+        [(fmodel,
+          expanded_wds[chunk[:, 0].astype(int)],
+          wind_speeds[chunk[:, 1].astype(int)],
+          turbulence_intensities[chunk[:, 2].astype(int)],
+          chunk[:, 3:])
+         for chunk in np.array_split(unique_conditions, n_chunks)],
+        n_processes
+    ))
+
+    # Select the candidate with the highest expected power for each standard deviation
+    tables = {float(wd_std): [] for wd_std in wd_stds}
+    start = 0
+    for i, j, k, sample_idx, candidates in groups:
+        n_c, n_s = len(candidates), len(sample_idx)
+        powers = farm_powers[condition_idx[start:start + n_s * n_c]].reshape(n_s, n_c)
+        start += n_s * n_c
+        invalid = np.any(
+            (candidates < minimum_yaw_angle) | (candidates > maximum_yaw_angle), axis=1
+        )
+        for s, wd_std in enumerate(wd_stds):
+            expected_powers = weights @ powers[np.searchsorted(sample_idx, expanded_idx[s, i])]
+            baseline_power = expected_powers[0]
+            expected_powers[invalid] = -np.inf
+            best = np.argmax(expected_powers)
+            tables[float(wd_std)].append({
+                "wind_direction": wind_directions[i],
+                "wind_speed": wind_speeds[j],
+                "turbulence_intensity": turbulence_intensities[k],
+                "yaw_angles_opt": candidates[best],
+                "farm_power_opt": expected_powers[best],
+                "farm_power_baseline": baseline_power,
+            })
+
+    return {wd_std: pd.DataFrame(rows) for wd_std, rows in tables.items()}
+
+
+def _map_chunks(function, chunks, n_processes):
+    """
+    Apply function to the arguments of each chunk, in parallel across n_processes processes if
+    n_processes > 1.
+    """
+    if n_processes <= 1 or len(chunks) <= 1:
+        return [function(*chunk) for chunk in chunks]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(n_processes, len(chunks))) as executor:
+        return list(executor.map(function, *zip(*chunks)))
+
+
+def _optimize_chunk(
+    fmodel, wind_directions, wind_speeds, turbulence_intensities, minimum_yaw_angle,
+    maximum_yaw_angle
+):
+    """
+    Optimize the yaw offsets for a chunk of wind directions (see
+    build_uncertain_wake_steering_lookup_table_sweep).
+    """
+    return build_simple_wake_steering_lookup_table(
+        fmodel.copy(),
+        minimum_yaw_angle=minimum_yaw_angle,
+        maximum_yaw_angle=maximum_yaw_angle,
+        wind_directions=wind_directions,
+        wind_speeds=wind_speeds,
+        turbulence_intensities=turbulence_intensities,
+    )
+
+
+def _farm_power_chunk(fmodel, wind_directions, wind_speeds, turbulence_intensities, yaw_angles):
+    """
+    Compute the farm power for a chunk of conditions and yaw offsets (see
+    build_uncertain_wake_steering_lookup_table_sweep).
+    """
+    from floris import TimeSeries
+
+    fmodel = fmodel.copy()
+    fmodel.set(
+        wind_data=TimeSeries(
+            wind_directions=wind_directions,
+            wind_speeds=wind_speeds,
+            turbulence_intensities=turbulence_intensities,
+        ),
+        yaw_angles=yaw_angles,
+    )
+    fmodel.run()
+    return fmodel.get_farm_power()
+
+
+def build_adaptive_wake_steering_lookup_table(
+    fmodel: FlorisModel,
+    wd_resolution_coarse: float = 8.0,
+    wd_resolution_fine: float = 1.0,
+    yaw_rate_threshold: float = 1.0,
+    wd_min: float = 0.0,
+    wd_max: float = 360.0,
+    ws_resolution: float = 1.0,
+    ws_min: float = 8.0,
+    ws_max: float = 8.0,
+    ti_resolution: float = 0.02,
+    ti_min: float = 0.06,
+    ti_max: float = 0.06,
+    minimum_yaw_angle: float = 0.0,
+    maximum_yaw_angle: float = 25.0,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """
+    Build a wake steering lookup table for a given FlorisModel using the Serial Refine method,
+    refining the wind direction resolution only where the optimal offsets change rapidly.
+
+    Offsets are first optimized over a coarse wind direction grid. Wind direction intervals
+    over which the offset of any turbine changes faster than yaw_rate_threshold (at any wind
+    speed and turbulence intensity) are identified as in compute_hysteresis_zones, and the
+    offsets are then optimized at wd_resolution_fine within those intervals only. Since most
+    wind directions have zero or smoothly varying offsets, this requires far fewer FLORIS
+    evaluations than optimizing over a uniform fine grid.
+
+    The output table has a non-uniform wind direction grid, but is otherwise in the same
+    format as the output of build_simple_wake_steering_lookup_table, and can be passed to
+    get_yaw_angles_interpolant.
+
+    Args:
+        fmodel (FlorisModel): An instantiated FlorisModel object.
+        wd_resolution_coarse (float, optional): The resolution of the coarse wind direction
+            grid in degrees. Defaults to 8.
+        wd_resolution_fine (float, optional): The resolution of the wind direction in refined
+            intervals in degrees. Defaults to 1.
+        yaw_rate_threshold (float, optional): The rate of change of the yaw offset with wind
+            direction above which an interval is refined, in degrees per degree change in wind
+            direction. Defaults to 1.
+        wd_min (float, optional): The minimum (inclusive) wind direction in degrees. Defaults to 0.
+        wd_max (float, optional): The maximum (inclusive) wind direction in degrees. Defaults to
+            360.
+        ws_resolution (float, optional): The resolution of the wind speed in m/s.
+            Defaults to 1.
+        ws_min (float, optional): The minimum (inclusive) wind speed in m/s. Defaults to 8.
+        ws_max (float, optional): The maximum (inclusive) wind speed in m/s. Defaults to 8.
+        ti_resolution (float, optional): The resolution of the turbulence intensity as a fraction.
+            Defaults to 0.02.
+        ti_min (float, optional): The minimum (inclusive) turbulence intensity as a fraction.
+            Defaults to 0.06.
+        ti_max (float, optional): The maximum (inclusive) turbulence intensity as a fraction.
+            Defaults to 0.06.
+        minimum_yaw_angle (float, optional): The minimum (inclusive) allowable misalignment in
+            degrees. Defaults to 0.0.
+        maximum_yaw_angle (float, optional): The maximum (inclusive) allowable misalignment in
+            degrees. Defaults to 25.0.
+        verbose (bool, optional): Whether to print the refined intervals. Defaults to False.
+
+    Returns:
+        pd.DataFrame: A yaw offset lookup table.
+    """
+    df_opt_coarse = build_simple_wake_steering_lookup_table(
+        fmodel,
+        wd_resolution=wd_resolution_coarse,
+        wd_min=wd_min,
+        wd_max=wd_max,
+        ws_resolution=ws_resolution,
+        ws_min=ws_min,
+        ws_max=ws_max,
+        ti_resolution=ti_resolution,
+        ti_min=ti_min,
+        ti_max=ti_max,
+        minimum_yaw_angle=minimum_yaw_angle,
+        maximum_yaw_angle=maximum_yaw_angle,
+    )
+    check_df_opt_ordering(df_opt_coarse)
+    wind_directions = np.unique(df_opt_coarse.wind_direction)
+    wind_speeds = np.unique(df_opt_coarse.wind_speed)
+    turbulence_intensities = np.unique(df_opt_coarse.turbulence_intensity)
+    if len(wind_directions) == 1:
+        return df_opt_coarse
+    offsets = np.vstack(df_opt_coarse.yaw_angles_opt.to_numpy()).reshape(
+        len(wind_directions), len(wind_speeds), len(turbulence_intensities), -1
+    )
+
+    # Find intervals to refine, and the wind directions to add within them
+    wind_directions_ext, jump_idx = _find_offset_jumps(
+        wind_directions, offsets, yaw_rate_threshold
+    )
+    intervals = np.unique(jump_idx[:, 0])
+    wind_directions_fine = np.concatenate([
+        np.arange(
+            wind_directions_ext[i] + wd_resolution_fine,
+            wind_directions_ext[i+1] - wd_resolution_fine/2,
+            wd_resolution_fine
+        ) for i in intervals
+    ] + [np.zeros(0)])
+    wind_directions_fine = np.unique(wrap_360(wind_directions_fine))
+    if verbose:
+        print("Refining wind direction intervals: {}".format(
+            [(float(wind_directions_ext[i]), float(wind_directions_ext[i+1]))
+             for i in intervals]
+        ))
+        print("Optimizing {0} coarse and {1} refined wind directions.".format(
+            len(wind_directions), len(wind_directions_fine)
+        ))
+    if len(wind_directions_fine) == 0:
+        return df_opt_coarse
+
+    # Optimize over all wind speeds and turbulence intensities at the refined wind directions
+    from floris.optimization.yaw_optimization.yaw_optimizer_sr import YawOptimizationSR
+
+    fmodel.set(wind_data=create_wind_data_grid(
+        wind_directions_fine, wind_speeds, turbulence_intensities
+    ))
+    df_opt_fine = YawOptimizationSR(
+        fmodel=fmodel,
+        minimum_yaw_angle=minimum_yaw_angle,
+        maximum_yaw_angle=maximum_yaw_angle,
+    ).optimize()
+
+    return pd.concat([df_opt_coarse, df_opt_fine]).sort_values(
+        by=_DF_OPT_AXES, kind="stable"
+    ).reset_index(drop=True)
+
+
 def apply_static_rate_limits(
     df_opt: pd.DataFrame,
     wd_rate_limit: float = 5.0,
@@ -168,6 +579,10 @@ def apply_static_rate_limits(
     significantly different yaw offsets than the original lookup table, resulting in suboptimal
     behavior, even for slow wind direction changes.
 
+    The wind direction, wind speed, and turbulence intensity grids need not be uniform; the
+    maximum change in yaw offset between neighboring grid points is the rate limit multiplied
+    by the spacing of those grid points.
+
     Args:
         df_opt (pd.DataFrame): A yaw offset lookup table.
         wd_rate_limit (float, optional): The maximum rate of change in yaw offset per degree change
@@ -187,9 +602,10 @@ def apply_static_rate_limits(
     ws_array = np.unique(df_opt.wind_speed)
     ti_array = np.unique(df_opt.turbulence_intensity)
 
-    wd_step = wd_array[1] - wd_array[0]
-    ws_step = ws_array[1] - ws_array[0]
-    ti_step = ti_array[1] - ti_array[0] if len(ti_array) > 1 else 1
+    # Maximum change in yaw offset between neighboring grid points
+    wd_max_deltas = wd_rate_limit * np.diff(wd_array)
+    ws_max_deltas = ws_rate_limit * np.diff(ws_array)
+    ti_max_deltas = ti_rate_limit * np.diff(ti_array)
 
     check_df_opt_ordering(df_opt)
     # 4D array, with dimensions: (wd, ws, ti, turbines)
@@ -201,12 +617,12 @@ def apply_static_rate_limits(
     offsets_limited_lr = offsets_array.copy()
     for i in range(1, len(wd_array)):
         delta_yaw = offsets_limited_lr[i, :, :, :] - offsets_limited_lr[i-1, :, :, :]
-        delta_yaw = np.clip(delta_yaw, -wd_rate_limit*wd_step, wd_rate_limit*wd_step)
+        delta_yaw = np.clip(delta_yaw, -wd_max_deltas[i-1], wd_max_deltas[i-1])
         offsets_limited_lr[i, :, :, :] = offsets_limited_lr[i-1, :, :, :] + delta_yaw
     offsets_limited_rl = offsets_array.copy()
     for i in range(len(wd_array)-2, -1, -1):
         delta_yaw = offsets_limited_rl[i, :, :, :] - offsets_limited_rl[i+1, :, :, :]
-        delta_yaw = np.clip(delta_yaw, -wd_rate_limit*wd_step, wd_rate_limit*wd_step)
+        delta_yaw = np.clip(delta_yaw, -wd_max_deltas[i], wd_max_deltas[i])
         offsets_limited_rl[i, :, :, :] = offsets_limited_rl[i+1, :, :, :] + delta_yaw
     offsets_array = (offsets_limited_lr + offsets_limited_rl) / 2
 
@@ -214,12 +630,12 @@ def apply_static_rate_limits(
     offsets_limited_lr = offsets_array.copy()
     for j in range(1, len(ws_array)):
         delta_yaw = offsets_limited_lr[:, j, :, :] - offsets_limited_lr[:, j-1, :, :]
-        delta_yaw = np.clip(delta_yaw, -ws_rate_limit*ws_step, ws_rate_limit*ws_step)
+        delta_yaw = np.clip(delta_yaw, -ws_max_deltas[j-1], ws_max_deltas[j-1])
         offsets_limited_lr[:, j, :, :] = offsets_limited_lr[:, j-1, :, :] + delta_yaw
     offsets_limited_rl = offsets_array.copy()
     for j in range(len(ws_array)-2, -1, -1):
         delta_yaw = offsets_limited_rl[:, j, :, :] - offsets_limited_rl[:, j+1, :, :]
-        delta_yaw = np.clip(delta_yaw, -ws_rate_limit*ws_step, ws_rate_limit*ws_step)
+        delta_yaw = np.clip(delta_yaw, -ws_max_deltas[j], ws_max_deltas[j])
         offsets_limited_rl[:, j, :, :] = offsets_limited_rl[:, j+1, :, :] + delta_yaw
     offsets_array = (offsets_limited_lr + offsets_limited_rl) / 2
 
@@ -227,12 +643,12 @@ def apply_static_rate_limits(
     offsets_limited_lr = offsets_array.copy()
     for k in range(1, len(ti_array)):
         delta_yaw = offsets_limited_lr[:, :, k, :] - offsets_limited_lr[:, :, k-1, :]
-        delta_yaw = np.clip(delta_yaw, -ti_rate_limit*ti_step, ti_rate_limit*ti_step)
+        delta_yaw = np.clip(delta_yaw, -ti_max_deltas[k-1], ti_max_deltas[k-1])
         offsets_limited_lr[:, :, k, :] = offsets_limited_lr[:, :, k-1, :] + delta_yaw
     offsets_limited_rl = offsets_array.copy()
     for k in range(len(ti_array)-2, -1, -1):
         delta_yaw = offsets_limited_rl[:, :, k, :] - offsets_limited_rl[:, :, k+1, :]
-        delta_yaw = np.clip(delta_yaw, -ti_rate_limit*ti_step, ti_rate_limit*ti_step)
+        delta_yaw = np.clip(delta_yaw, -ti_max_deltas[k], ti_max_deltas[k])
         offsets_limited_rl[:, :, k, :] = offsets_limited_rl[:, :, k+1, :] + delta_yaw
     offsets_array = (offsets_limited_lr + offsets_limited_rl) / 2
 
@@ -288,23 +704,10 @@ def compute_hysteresis_zones(
         offsets_stacked.shape[1]
     )
 
-    # Add 360 to end, if full wind rose and wraps
     if len(wind_directions) == 1:
         raise ValueError("Cannot compute hysteresis regions for single wind direction.")
-    wd_steps = wind_directions[1:]-wind_directions[:-1]
-    if ((wind_directions[0] - wd_steps[0] < 0)
-        & (wind_directions[-1] + wd_steps[-1] >= 360)
-    ):
-        offsets = np.concatenate((offsets, offsets[0:1, :, :, :]), axis=0)
-        wind_directions = np.concatenate((wind_directions, [wind_directions[-1] + wd_steps[-1]]))
-        wd_steps = wind_directions[1:]-wind_directions[:-1]
-    wd_centers = wind_directions[:-1] + 0.5 * wd_steps
-
-    # Define function that identifies hysteresis zones
-    jump_threshold = yaw_rate_threshold*wd_steps[:,None,None,None]
-    jump_idx = np.argwhere(np.abs(np.diff(offsets, axis=0)) >= jump_threshold)
-    # Drop information about ws, ti
-    jump_idx = np.unique(jump_idx[:, [0, 3]], axis=0)
+    wind_directions, jump_idx = _find_offset_jumps(wind_directions, offsets, yaw_rate_threshold)
+    wd_centers = wind_directions[:-1] + 0.5 * (wind_directions[1:] - wind_directions[:-1])
     # Convert to a per-turbine dictionary of switching wind directions
     centers_dict = {}
     for t in np.unique(jump_idx[:,1]):
@@ -315,33 +718,70 @@ def compute_hysteresis_zones(
         print("Center wind directions for hysteresis, per turbine: {}".format(centers_dict))
         print("Computing hysteresis regions.")
 
-    # Find hysteresis regions for each switching point
-    hysteresis_dict = {}
-    for turbine_tag in centers_dict.keys():
-        hysteresis_wds = []
-        for wd_switch_point in centers_dict[turbine_tag]:
-            t = int(turbine_tag[1:])
-            # Create region of minimum width
-            lb = wrap_360(wd_switch_point - min_zone_width/2)
-            ub = wrap_360(wd_switch_point + min_zone_width/2)
-            hysteresis_wds.append((lb, ub))
-
-        # Consolidate regions
-        hysteresis_dict[turbine_tag] = consolidate_hysteresis_zones(hysteresis_wds)
+    # Find hysteresis regions of minimum width around each switching point, and consolidate
+    turbines = jump_idx[:, 1]
+    switch_points = wd_centers[jump_idx[:, 0]]
+    turbines, lower_bounds, upper_bounds = _consolidate_zones(
+        turbines,
+        wrap_360(switch_points - min_zone_width/2),
+        wrap_360(switch_points + min_zone_width/2),
+    )
+    hysteresis_dict = {
+        "T{:03d}".format(t): list(zip(
+            lower_bounds[turbines == t].tolist(), upper_bounds[turbines == t].tolist()
+        ))
+        for t in np.unique(turbines)
+    }
 
     if verbose:
         print("Identified hysteresis zones: {}".format(hysteresis_dict))
 
     return hysteresis_dict
 
+def _find_offset_jumps(wind_directions, offsets, yaw_rate_threshold):
+    """
+    Find wind direction intervals over which the yaw offset of any turbine changes faster than
+    yaw_rate_threshold (degrees per degree change in wind direction), at any wind speed and
+    turbulence intensity.
+
+    If the wind directions cover the full wind rose (that is, the gap from the last wind
+    direction to the first is no larger than the step at either end of the wind directions), an
+    interval from the last wind direction to the first (plus 360 degrees) is included.
+
+    Args:
+        wind_directions (np.ndarray): Wind directions (degrees) of the table.
+        offsets (np.ndarray): Yaw offsets with shape (n_wind_directions, n_wind_speeds,
+            n_turbulence_intensities, n_turbines).
+        yaw_rate_threshold (float): Threshold rate of change (deg / deg).
+
+    Returns:
+        tuple: Wind directions (extended by one if the wind rose wraps), and an array of
+            (wind direction interval index, turbine index) pairs for each interval and
+            turbine with a jump.
+    """
+    # Add 360 to end, if full wind rose and wraps, that is, if the gap from the last wind
+    # direction to the first is no larger than the steps at either end of the wind directions
+    # (which may be non-uniform). Coarse steps elsewhere do not imply that the table wraps.
+    wd_steps = wind_directions[1:]-wind_directions[:-1]
+    if wind_directions[0] + 360.0 - wind_directions[-1] <= max(wd_steps[0], wd_steps[-1]) + 1e-9:
+        offsets = np.concatenate((offsets, offsets[0:1, :, :, :]), axis=0)
+        wind_directions = np.concatenate((wind_directions, [wind_directions[0] + 360.0]))
+        wd_steps = wind_directions[1:]-wind_directions[:-1]
+
+    jump_threshold = yaw_rate_threshold*wd_steps[:,None,None,None]
+    jump_idx = np.argwhere(np.abs(np.diff(offsets, axis=0)) >= jump_threshold)
+    # Drop information about ws, ti
+    return wind_directions, np.unique(jump_idx[:, [0, 3]], axis=0)
+
 def consolidate_hysteresis_zones(hysteresis_wds):
     """
     Merge hysteresis zones that overlap.
 
     Algorithm overview
-    1. Order by the lower bound of the hysteresis algorithm
-    2. Merge by forward checking the next zone recursively
-    3. Handle wrap-around at 360 degrees
+    1. Rotate the wind directions so that no merged zone spans the 0/360 degree point
+    2. Order by the (rotated) lower bound of the hysteresis zones
+    3. Merge each zone into the previous one if it starts before the running maximum of the
+       upper bounds of the previous zones (cumulative-max sweep)
 
     Args:
         hysteresis_wds (list): A list of tuples representing the lower and upper bounds for the
@@ -350,40 +790,162 @@ def consolidate_hysteresis_zones(hysteresis_wds):
     Returns:
         hysteresis_wds (list): A list of tuples representing the merged hysteresis zones.
     """
+    if len(hysteresis_wds) == 0:
+        return []
+    lower_bounds, upper_bounds = np.array(hysteresis_wds, dtype=float).T
+    _, lower_bounds, upper_bounds = _consolidate_zones(
+        np.zeros(len(lower_bounds), dtype=int), lower_bounds, upper_bounds
+    )
+    return list(zip(lower_bounds.tolist(), upper_bounds.tolist()))
+
+def _consolidate_zones(turbines, lower_bounds, upper_bounds):
+    """
+    Merge overlapping hysteresis zones of multiple turbines with array operations.
+
+    Zones where the lower bound exceeds the upper bound span the 0/360 degree point. Zones are
+    first merged on the unrolled wind direction axis to find, for each turbine, the lower bound
+    of the last merged zone; rotating the wind directions to start at this point ensures that
+    no merged zone spans the 0/360 degree point. The rotated zones are then sorted and merged
+    in a single cumulative-max sweep over all turbines. Merged zones are returned in order of
+    their lower bound, except that a zone spanning the 0/360 degree point that contains the
+    zone with the lowest lower bound is returned first.
+
+    Args:
+        turbines (np.ndarray): Turbine index of each zone.
+        lower_bounds (np.ndarray): Lower bound (degrees) of each zone.
+        upper_bounds (np.ndarray): Upper bound (degrees) of each zone.
+
+    Returns:
+        tuple: Turbine indices, lower bounds and upper bounds of the merged zones, as
+            np.ndarrays.
+    """
+    turbines = np.asarray(turbines, dtype=int)
+    lower_bounds = np.asarray(lower_bounds, dtype=float)
+    upper_bounds = np.asarray(upper_bounds, dtype=float)
+    if len(turbines) == 0:
+        return turbines, lower_bounds, upper_bounds
+    widths = np.where(
+        upper_bounds >= lower_bounds, upper_bounds - lower_bounds, upper_bounds - lower_bounds + 360
+    )
+    n_turbines = turbines.max() + 1
+    # Offset each turbine's zones so that a single sweep does not merge zones across turbines
+    offsets = 1080.0 * turbines
+
+    def merge(starts):
+        # Sort by turbine and start, and find where each merged zone begins using a
+        # cumulative-max sweep over the (offset) zone ends
+        order = np.lexsort((starts, turbines))
+        ends = (offsets + starts + widths)[order]
+        running_max_end = np.maximum.accumulate(ends)
+        group_start = np.ones(len(order), dtype=bool)
+        group_start[1:] = (offsets + starts)[order][1:] > running_max_end[:-1]
+        return order, np.cumsum(group_start) - 1
+
+    # Rotation for each turbine: the start of the last merged zone, if that zone reaches
+    # 360 degrees
+    order, groups = merge(lower_bounds)
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = turbines[order][1:] != turbines[order][:-1]
+    group_first = np.searchsorted(groups, groups) # First (sorted) zone of each zone's group
+    rotation = np.zeros(n_turbines)
+    last_start = lower_bounds[order][group_first[last]]
+    turbine_end = np.zeros(n_turbines)
+    np.maximum.at(turbine_end, turbines, lower_bounds + widths)
+    wraps = turbine_end[turbines[order][last]] >= 360.0
+    rotation[turbines[order][last][wraps]] = last_start[wraps]
+
+    # Merge the rotated zones
+    order, groups = merge((lower_bounds - rotation[turbines]) % 360.0)
+    n_groups = groups[-1] + 1
+    group_first = np.searchsorted(groups, np.arange(n_groups))
+    # Zone with the greatest (rotated) end in each group
+    rotated_ends = ((lower_bounds - rotation[turbines]) % 360.0 + widths)[order]
+    group_last = np.lexsort((rotated_ends, groups))[np.searchsorted(groups, np.arange(n_groups),
+                                                                    side="right") - 1]
+    merged_turbines = turbines[order][group_first]
+    merged_lower_bounds = lower_bounds[order][group_first]
+    merged_upper_bounds = upper_bounds[order][group_last]
+
+    # Order merged zones, placing a zone spanning 0/360 degrees that contains the turbine's
+    # lowest lower bound first
+    min_lower_bound = np.full(n_turbines, np.inf)
+    np.minimum.at(min_lower_bound, turbines, lower_bounds)
+    contains_min = np.zeros(n_groups, dtype=bool)
+    contains_min[groups[lower_bounds[order] == min_lower_bound[turbines[order]]]] = True
+    first = contains_min & (merged_lower_bounds > merged_upper_bounds)
+    output_order = np.lexsort((merged_lower_bounds, ~first, merged_turbines))
+
+    return (
+        merged_turbines[output_order],
+        merged_lower_bounds[output_order],
+        merged_upper_bounds[output_order],
+    )
+
+class HysteresisZoneIndex():
+    """
+    Index of the hysteresis zones of all turbines, for fast membership queries.
+
+    Zones that wrap around the 0/360 degree point (lower bound greater than upper bound) are
+    split into two non-wrapping intervals, and the intervals of all turbines are stored in a
+    single sorted array, with the intervals of each turbine offset by a turbine-specific
+    constant. A wind direction is then located among the intervals of its own turbine using
+    one np.searchsorted call for all turbines, so that the cost of a query is
+    O(n_turbines log n_zones). As in LookupBasedWakeSteeringController, wind directions
+    strictly within a zone's bounds are in the zone.
+    """
+    # Separation between the intervals of consecutive turbines (degrees); intervals span at
+    # most [-360, 720) after wrap-around zones are split
+    _TURBINE_OFFSET = 1080.0
+
+    def __init__(self, hysteresis_dict, n_turbines):
+        """
+        Constructor for HysteresisZoneIndex.
+
+        Args:
+            hysteresis_dict (dict): Dictionary of hysteresis zones, as produced by
+                compute_hysteresis_zones. Keys are turbine labels ("T000", "T001", etc.) and
+                values are lists of (lower bound, upper bound) tuples.
+            n_turbines (int): Number of turbines.
+        """
+        self.n_turbines = n_turbines
+
+        lower_bounds = []
+        upper_bounds = []
+        for t in range(n_turbines):
+            offset = t * self._TURBINE_OFFSET
+            for lb, ub in hysteresis_dict.get("T{:03d}".format(t), []):
+                if lb > ub:
+                    # Split wrap-around zone; the wind direction is in [0, 360)
+                    lower_bounds.extend([offset + lb, offset + lb - 360.0])
+                    upper_bounds.extend([offset + ub + 360.0, offset + ub])
+                else:
+                    lower_bounds.append(offset + lb)
+                    upper_bounds.append(offset + ub)
+
+        order = np.argsort(lower_bounds, kind="stable")
+        self.lower_bounds = np.array(lower_bounds, dtype=float)[order]
+        # Running maximum of the upper bounds, so that overlapping zones are handled correctly
+        self.upper_bounds = np.maximum.accumulate(np.array(upper_bounds, dtype=float)[order])
+        self._offsets = np.arange(n_turbines) * self._TURBINE_OFFSET
+
+    def in_zone(self, wind_directions):
+        """
+        Determine whether each turbine's wind direction lies within one of its hysteresis
+        zones.
+
+        Args:
+            wind_directions (array-like): Wind direction (degrees) at each turbine.
+
+        Returns:
+            np.ndarray: Boolean array, True for turbines within a hysteresis zone.
+        """
+        if len(self.lower_bounds) == 0:
+            return np.zeros(self.n_turbines, dtype=bool)
+        keys = self._offsets + wrap_360(np.asarray(wind_directions, dtype=float))
+        # Last interval with lower bound strictly below the key
+        i = np.searchsorted(self.lower_bounds, keys, side="left") - 1
+        return (i >= 0) & (keys < self.upper_bounds[np.maximum(i, 0)])
 
-    # Sort hysteresis zones by lower bound
-    hysteresis_wds = sorted(hysteresis_wds, key=lambda x: x[0])
-
-    i_h = 0
-    while i_h < len(hysteresis_wds)-1:
-        # Continue merging into the ith until no more overlaps with the ith
-        while ((hysteresis_wds[i_h+1][0] <= hysteresis_wds[i_h][1])
-                or ((hysteresis_wds[i_h][1] < hysteresis_wds[i_h][0])
-                    and (hysteresis_wds[i_h+1][0] > hysteresis_wds[i_h+1][1])
-                    )
-              ):
-            # Merge regions
-            hysteresis_wds[i_h] = (
-                hysteresis_wds[i_h][0],
-                hysteresis_wds[i_h+1][1]
-            )
-            # Remove next region
-            hysteresis_wds.pop(i_h+1)
-            if len(hysteresis_wds) <= i_h+1:
-                break
-        i_h += 1
-
-    # Handle wrap-around at 360 degrees
-    for _ in range(len(hysteresis_wds)): # Multiple loops in case multiple overlaps
-        if ((hysteresis_wds[-1][1] >= hysteresis_wds[0][0])
-            and (hysteresis_wds[-1][1] < hysteresis_wds[-1][0])
-           ):
-            # Merge last and first regions
-            hysteresis_wds[0] = (hysteresis_wds[-1][0], hysteresis_wds[0][1])
-            if len(hysteresis_wds) > 1:
-                hysteresis_wds.pop(-1)
-
-    return hysteresis_wds
 
 def apply_wind_speed_ramps(
     df_opt: pd.DataFrame,
@@ -394,6 +956,7 @@ def apply_wind_speed_ramps(
     ws_wake_steering_fully_engaged_low: float = 5.0,
     ws_wake_steering_fully_engaged_high: float = 10.0,
     ws_wake_steering_cut_out: float = 13.0,
+    wind_speeds: np.ndarray | None = None,
 ) -> pd.DataFrame:
     """
     Apply wind speed ramps to a yaw offset lookup table.
@@ -412,6 +975,9 @@ def apply_wind_speed_ramps(
             wake steering is fully engaged at the value provided in df_opt. Defaults to 10.
         ws_wake_steering_cut_out (float, optional): The wind speed at which wake steering
             ceases to be applied. Defaults to 13.
+        wind_speeds (np.ndarray, optional): Wind speeds (m/s) of the output table, which need
+            not be uniformly spaced. If provided, ws_resolution, ws_min, and ws_max are ignored.
+            Defaults to None.
 
     Returns:
         pd.DataFrame: A yaw offset lookup table for all wind speeds between ws_min and ws_max
@@ -477,7 +1043,10 @@ def apply_wind_speed_ramps(
         bounds_error=False,
         fill_value=np.zeros_like(offsets_ramps[0,:,:])
     )
-    wind_speed_all = np.arange(ws_min, ws_max, ws_resolution)
+    if wind_speeds is None:
+        wind_speed_all = np.arange(ws_min, ws_max, ws_resolution)
+    else:
+        wind_speed_all = np.asarray(wind_speeds, dtype=float)
     offsets_stacked = interp(wind_speed_all).reshape(-1, offsets_ramps.shape[2])
 
     wind_direction_stacked = np.tile(df_opt.wind_direction, len(wind_speed_all))
@@ -492,7 +1061,122 @@ def apply_wind_speed_ramps(
     })
 
 
-def get_yaw_angles_interpolant(df_opt):
+def apply_wind_speed_ramps_dense(
+    df_opt: pd.DataFrame,
+    ws_resolution: float = 1.0,
+    ws_min: float = 0.0,
+    ws_max: float = 30.0,
+    ws_wake_steering_cut_in: float = 3.0,
+    ws_wake_steering_fully_engaged_low: float = 5.0,
+    ws_wake_steering_fully_engaged_high: float = 10.0,
+    ws_wake_steering_cut_out: float = 13.0,
+    wind_speeds: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+    chunk_size: int = 64,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Apply wind speed ramps to a yaw offset lookup table, producing a dense table.
+
+    As apply_wind_speed_ramps, but the ramped yaw offsets are written directly into a dense
+    array over (wind direction, wind speed, turbulence intensity, turbine), chunk_size wind
+    speeds at a time, rather than into a DataFrame with one row per condition. The output
+    array may be preallocated by the caller, for example as a memory-mapped array (see
+    np.lib.format.open_memmap) or with a lower precision dtype, so that tables at fine wind
+    speed resolution need not be held in memory. The result can be converted to an interpolant
+    using get_yaw_angles_interpolant_from_grid.
+
+    Below the cut in wind speed and above the cut out wind speed, the yaw offsets are zero;
+    between the cut in and fully engaged low wind speeds, and between the fully engaged high
+    and cut out wind speeds, they are linearly ramped.
+
+    Args:
+        df_opt (pd.DataFrame): A yaw offset lookup table, with a single wind speed.
+        ws_resolution (float, optional): The resolution of the wind speed in m/s.
+            Defaults to 1.
+        ws_min (float, optional): The minimum (inclusive) wind speed in m/s. Defaults to 0.
+        ws_max (float, optional): The maximum (exclusive) wind speed in m/s. Defaults to 30.
+        ws_wake_steering_cut_in (float, optional): The wind speed at which wake steering
+            begins to be applied. Defaults to 3.
+        ws_wake_steering_fully_engaged_low (float, optional): The lower wind speed at which
+            wake steering is fully engaged at the value provided in df_opt. Defaults to 5.
+        ws_wake_steering_fully_engaged_high (float, optional): The upper wind speed at which
+            wake steering is fully engaged at the value provided in df_opt. Defaults to 10.
+        ws_wake_steering_cut_out (float, optional): The wind speed at which wake steering
+            ceases to be applied. Defaults to 13.
+        wind_speeds (np.ndarray, optional): Wind speeds (m/s) of the output table, which need
+            not be uniformly spaced. If provided, ws_resolution, ws_min, and ws_max are ignored.
+            Defaults to None.
+        out (np.ndarray, optional): Array in which to store the yaw offsets, with shape
+            (n_wind_directions, n_wind_speeds, n_turbulence_intensities, n_turbines).
+            Defaults to None, in which case a new float64 array is allocated.
+        chunk_size (int, optional): Number of wind speeds written at a time. Defaults to 64.
+
+    Returns:
+        tuple: Wind directions, wind speeds, turbulence intensities, and yaw offsets of the
+            dense table, as np.ndarrays.
+    """
+    check_df_opt_ordering(df_opt)
+
+    if not (ws_wake_steering_cut_in
+            <= ws_wake_steering_fully_engaged_low
+            <= ws_wake_steering_fully_engaged_high
+            <= ws_wake_steering_cut_out):
+        raise ValueError(
+            "Wind speed ramp values must be in the order: cut in, fully engaged low, "
+            "fully engaged high, cut out."
+        )
+    ws_specified = df_opt["wind_speed"].unique()
+    if len(ws_specified) > 1:
+        raise ValueError(
+            "Wind speed ramps can only be applied to a dataframe with a single wind speed."
+        )
+    if (ws_specified[0] < ws_wake_steering_fully_engaged_low
+        or ws_specified[0] > ws_wake_steering_fully_engaged_high):
+        raise ValueError(
+            "Provided wind speed must be between fully engaged limits."
+        )
+
+    wind_directions = np.unique(df_opt["wind_direction"])
+    turbulence_intensities = np.unique(df_opt["turbulence_intensity"])
+    if wind_speeds is None:
+        wind_speeds = np.arange(ws_min, ws_max, ws_resolution)
+    else:
+        wind_speeds = np.asarray(wind_speeds, dtype=float)
+    offsets_specified = np.vstack(df_opt["yaw_angles_opt"].to_numpy()).reshape(
+        len(wind_directions), 1, len(turbulence_intensities), -1
+    )
+
+    shape = (
+        len(wind_directions), len(wind_speeds), len(turbulence_intensities),
+        offsets_specified.shape[-1]
+    )
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError("out must have shape {0}.".format(shape))
+
+    # The ramped offsets are the specified offsets scaled by a piecewise linear factor of the
+    # wind speed
+    ramp_factors = np.interp(
+        wind_speeds,
+        [ws_wake_steering_cut_in, ws_wake_steering_fully_engaged_low,
+         ws_wake_steering_fully_engaged_high, ws_wake_steering_cut_out],
+        [0.0, 1.0, 1.0, 0.0],
+        left=0.0,
+        right=0.0,
+    )
+    for i in range(0, len(wind_speeds), chunk_size):
+        np.multiply(
+            offsets_specified,
+            ramp_factors[None, i:i+chunk_size, None, None],
+            out=out[:, i:i+chunk_size, :, :],
+            casting="unsafe",
+        )
+
+    return wind_directions, wind_speeds, turbulence_intensities, out
+
+
+def get_yaw_angles_interpolant(df_opt, precision="float64"):
     """Get an interpolant for the optimal yaw angles from a dataframe.
 
     Create an interpolant for the optimal yaw angles from a dataframe
@@ -514,9 +1198,16 @@ def get_yaw_angles_interpolant(df_opt):
     An error is raised if the resulting interpolant is queried outside of the extended
     wind direction, wind speed, or turbulence intensity ranges.
 
+    The yaw offsets may be stored at reduced precision to save memory: as float32 or float16,
+    or quantized to int16 hundredths of a degree. Offsets are then converted back to float64
+    on the fly, only at the grid points used in each query. quantization_error_report may be
+    used to assess the resulting errors.
+
     Args:
         df_opt (pd.DataFrame): Dataframe containing the rows 'wind_direction',
             'wind_speed', 'turbulence_intensity', and 'yaw_angles_opt'.
+        precision (str, optional): Precision at which the yaw offsets are stored; one of
+            "float64", "float32", "float16", or "int16". Defaults to "float64".
 
     Returns:
         RegularGridInterpolator: An interpolant function which takes the inputs
@@ -524,6 +1215,332 @@ def get_yaw_angles_interpolant(df_opt):
             dimensions, and returns the yaw angles for all turbines. This function
             incorporates the ramp-up and ramp-down regions.
     """
+    return get_yaw_angles_interpolant_from_grid(
+        *_yaw_offset_grid_from_df_opt(df_opt), precision=precision
+    )
+
+
+def get_yaw_angles_interpolant_from_grid(
+    wind_directions,
+    wind_speeds,
+    turbulence_intensities,
+    yaw_offsets,
+    precision="float64",
+):
+    """
+    Get an interpolant for the optimal yaw angles from a dense table.
+
+    As get_yaw_angles_interpolant, but for yaw offsets provided as a dense array over the
+    wind direction, wind speed and turbulence intensity axes (for example, as produced by
+    apply_wind_speed_ramps_dense) rather than as a DataFrame.
+
+    Args:
+        wind_directions (np.ndarray): Wind directions (degrees) of the table, increasing.
+        wind_speeds (np.ndarray): Wind speeds (m/s) of the table, increasing.
+        turbulence_intensities (np.ndarray): Turbulence intensities of the table, increasing.
+        yaw_offsets (np.ndarray): Yaw offsets (degrees) with shape (n_wind_directions,
+            n_wind_speeds, n_turbulence_intensities, n_turbines).
+        precision (str, optional): Precision at which the yaw offsets are stored; see
+            get_yaw_angles_interpolant. Defaults to "float64".
+
+    Returns:
+        function: Interpolant function; see get_yaw_angles_interpolant.
+    """
+    wind_directions = np.asarray(wind_directions, dtype=float)
+    wind_speeds = np.asarray(wind_speeds, dtype=float)
+    turbulence_intensities = np.asarray(turbulence_intensities, dtype=float)
+    if yaw_offsets.shape[:3] != (
+        len(wind_directions), len(wind_speeds), len(turbulence_intensities)
+    ):
+        raise ValueError(
+            "yaw_offsets must have shape (n_wind_directions, n_wind_speeds, "
+            "n_turbulence_intensities, n_turbines)."
+        )
+
+    # Store for possible use if no turbulence intensity is provided
+    ti_ref = float(np.median(turbulence_intensities))
+
+    yaw_offsets, scale = compact_yaw_offsets(yaw_offsets, precision)
+
+    wind_directions, wind_speeds, turbulence_intensities, yaw_offsets = _extend_yaw_offset_grid(
+        wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
+    )
+
+    # Linear interpolant for the yaw angles (reduced precision tables are interpolated
+    # directly, as RegularGridInterpolator would store a float64 copy)
+    if precision == "float64":
+        interpolant = RegularGridInterpolator(
+            points=(wind_directions, wind_speeds, turbulence_intensities),
+            values=yaw_offsets,
+            bounds_error=True
+        )
+    else:
+        interpolant = None
+
+    # Create a wrapper function to return
+    def yaw_angle_interpolant(wd_array, ws_array, ti_array=None, per_turbine=False):
+        # If per_turbine, wd_array, ws_array and ti_array hold the conditions at each turbine,
+        # and only the yaw offset of each turbine at its own conditions is returned.
+        # Deal with missing ti_array
+        if ti_array is None:
+            ti_array = np.ones(np.shape(wd_array), dtype=float) * ti_ref
+
+        # Format inputs
+        wd_array = np.array(wd_array, dtype=float)
+        ws_array = np.array(ws_array, dtype=float)
+        ti_array = np.array(ti_array, dtype=float)
+
+        _check_interpolant_bounds(
+            (wind_directions, wind_speeds, turbulence_intensities),
+            (wd_array, ws_array, ti_array)
+        )
+
+        if per_turbine or interpolant is None:
+            return _interpolate_grid(
+                (wind_directions, wind_speeds, turbulence_intensities),
+                yaw_offsets,
+                np.broadcast_arrays(*(np.atleast_1d(a) for a in (wd_array, ws_array, ti_array))),
+                per_turbine=per_turbine,
+                scale=scale,
+            )
+
+        interpolation_points = np.column_stack((wd_array, ws_array, ti_array))
+        return np.array(interpolant(interpolation_points), dtype=float)
+
+    return yaw_angle_interpolant
+
+
+def get_sparse_yaw_angles_interpolant(df_opt, precision="float64", tolerance=0.0):
+    """
+    Get a sparse interpolant for the optimal yaw angles from a dataframe.
+
+    As get_yaw_angles_interpolant, but the yaw offsets are stored as a SparseYawOffsetTable,
+    which holds only the wind direction sectors in which each turbine has nonzero offsets.
+    This reduces memory use and lookup cost for large farms, in which most turbines have zero
+    offsets for most wind directions.
+
+    Args:
+        df_opt (pd.DataFrame): Dataframe containing the rows 'wind_direction',
+            'wind_speed', 'turbulence_intensity', and 'yaw_angles_opt'.
+        precision (str, optional): Precision at which the yaw offsets are stored; see
+            get_yaw_angles_interpolant. Defaults to "float64".
+        tolerance (float, optional): Yaw offsets (degrees) with magnitude at most tolerance
+            are treated as zero. Defaults to 0.0.
+
+    Returns:
+        SparseYawOffsetTable: An interpolant, called in the same way as the output of
+            get_yaw_angles_interpolant.
+    """
+    return SparseYawOffsetTable(
+        *_yaw_offset_grid_from_df_opt(df_opt), precision=precision, tolerance=tolerance
+    )
+
+
+class SparseYawOffsetTable():
+    """
+    Yaw offset lookup table storing, for each turbine, only the wind direction sectors in
+    which the turbine has nonzero offsets.
+
+    Each sector is a contiguous range of table wind directions over which the offsets of the
+    turbine are nonzero at any wind speed and turbulence intensity, extended by one wind
+    direction either side (so that interpolation into and out of the sector is unchanged);
+    sectors that touch are merged. The offsets within each sector are stored as a dense
+    sub-block over wind direction, wind speed, and turbulence intensity. As in
+    HysteresisZoneIndex, the sectors of all turbines are stored in a single sorted array, with
+    the wind directions of each turbine offset by a turbine-specific constant, so that the
+    sector (if any) containing each query is found with one np.searchsorted call. Queries
+    outside all sectors return zero without interpolation.
+
+    Instances are called in the same way as the interpolant returned by
+    get_yaw_angles_interpolant, and return identical offsets (for the same precision and
+    tolerance=0).
+    """
+    # Separation between the wind directions of consecutive turbines (degrees); table wind
+    # directions lie within [0, 360]
+    _TURBINE_OFFSET = 720.0
+
+    def __init__(
+        self,
+        wind_directions,
+        wind_speeds,
+        turbulence_intensities,
+        yaw_offsets,
+        precision="float64",
+        tolerance=0.0,
+    ):
+        """
+        Constructor for SparseYawOffsetTable.
+
+        Args:
+            wind_directions (np.ndarray): Wind directions (degrees) of the table, increasing.
+            wind_speeds (np.ndarray): Wind speeds (m/s) of the table, increasing.
+            turbulence_intensities (np.ndarray): Turbulence intensities of the table,
+                increasing.
+            yaw_offsets (np.ndarray): Yaw offsets (degrees) with shape (n_wind_directions,
+                n_wind_speeds, n_turbulence_intensities, n_turbines).
+            precision (str, optional): Precision at which the yaw offsets are stored; see
+                get_yaw_angles_interpolant. Defaults to "float64".
+            tolerance (float, optional): Yaw offsets (degrees) with magnitude at most
+                tolerance are treated as zero. Defaults to 0.0.
+        """
+        wind_directions = np.asarray(wind_directions, dtype=float)
+        wind_speeds = np.asarray(wind_speeds, dtype=float)
+        turbulence_intensities = np.asarray(turbulence_intensities, dtype=float)
+        yaw_offsets = np.asarray(yaw_offsets, dtype=float)
+        if yaw_offsets.shape[:3] != (
+            len(wind_directions), len(wind_speeds), len(turbulence_intensities)
+        ):
+            raise ValueError(
+                "yaw_offsets must have shape (n_wind_directions, n_wind_speeds, "
+                "n_turbulence_intensities, n_turbines)."
+            )
+        self.n_turbines = yaw_offsets.shape[3]
+        self.ti_ref = float(np.median(turbulence_intensities))
+        # Memory that the dense table would use at the same precision, for comparison
+        self.dense_nbytes = (
+            compact_yaw_offsets(np.zeros(0), precision)[0].itemsize * yaw_offsets.size
+        )
+
+        yaw_offsets = np.where(np.abs(yaw_offsets) > tolerance, yaw_offsets, 0.0)
+        wind_directions, wind_speeds, turbulence_intensities, yaw_offsets = (
+            _extend_yaw_offset_grid(
+                wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
+            )
+        )
+        self.grids = (wind_directions, wind_speeds, turbulence_intensities)
+
+        # Find the sectors of each turbine, as (first, last) wind direction indices
+        nonzero = np.any(yaw_offsets != 0.0, axis=(1, 2))
+        n_wd = len(wind_directions)
+        self.sectors = {}
+        sector_rows = []
+        blocks = []
+        row_turbines = []
+        row_wds = []
+        n_rows = 0
+        for t in range(self.n_turbines):
+            idx = np.flatnonzero(nonzero[:, t])
+            if len(idx) == 0:
+                continue
+            breaks = np.flatnonzero(np.diff(idx) > 2) # Gaps of 2 or more zero wind directions
+            firsts = np.maximum(idx[np.concatenate([[0], breaks + 1])] - 1, 0)
+            lasts = np.minimum(idx[np.concatenate([breaks, [len(idx) - 1]])] + 1, n_wd - 1)
+            self.sectors["T{:03d}".format(t)] = [
+                (float(wind_directions[i]), float(wind_directions[j]))
+                for i, j in zip(firsts, lasts)
+            ]
+            for i, j in zip(firsts, lasts):
+                sector_rows.append((n_rows, n_rows + j - i))
+                blocks.append(yaw_offsets[i:j+1, :, :, t])
+                row_wds.append(wind_directions[i:j+1])
+                row_turbines.append(np.full(j - i + 1, t))
+                n_rows += j - i + 1
+
+        # Offsets of all sectors, stacked along the wind direction axis
+        self._sector_rows = np.array(sector_rows, dtype=int).reshape(-1, 2)
+        self._row_wds = np.concatenate(row_wds + [np.zeros(0)])
+        self._row_keys = (
+            np.concatenate(row_turbines + [np.zeros(0)]) * self._TURBINE_OFFSET + self._row_wds
+        )
+        self._sector_keys = self._row_keys[self._sector_rows]
+        self._row_sectors = np.repeat(
+            np.arange(len(self._sector_rows)), np.diff(self._sector_rows, axis=1)[:, 0] + 1
+        )
+        self._values, self._scale = compact_yaw_offsets(
+            np.concatenate(blocks) if blocks else np.zeros((0,) + yaw_offsets.shape[1:3]),
+            precision
+        )
+
+    @property
+    def nbytes(self):
+        """
+        Memory (bytes) used to store the sparse table.
+        """
+        return (self._values.nbytes + self._row_wds.nbytes + self._row_keys.nbytes
+                + self._row_sectors.nbytes + self._sector_rows.nbytes + self._sector_keys.nbytes)
+
+    def __call__(self, wd_array, ws_array, ti_array=None, per_turbine=False):
+        """
+        Look up the yaw offsets.
+
+        Args:
+            wd_array (array-like): Wind directions (degrees).
+            ws_array (array-like): Wind speeds (m/s).
+            ti_array (array-like, optional): Turbulence intensities. Defaults to None, in
+                which case the median turbulence intensity of the table is used.
+            per_turbine (bool, optional): If True, the inputs hold the conditions at each
+                turbine, and only the yaw offset of each turbine at its own conditions is
+                returned. Defaults to False.
+
+        Returns:
+            np.ndarray: Yaw offsets (degrees), with shape (n_points, n_turbines), or
+                (n_turbines,) if per_turbine.
+        """
+        if ti_array is None:
+            ti_array = np.ones(np.shape(wd_array), dtype=float) * self.ti_ref
+
+        wd_array = np.array(wd_array, dtype=float)
+        ws_array = np.array(ws_array, dtype=float)
+        ti_array = np.array(ti_array, dtype=float)
+
+        _check_interpolant_bounds(self.grids, (wd_array, ws_array, ti_array))
+
+        wd_array, ws_array, ti_array = np.broadcast_arrays(
+            *(np.atleast_1d(a) for a in (wd_array, ws_array, ti_array))
+        )
+        if per_turbine:
+            return self._lookup(np.arange(self.n_turbines), wd_array, ws_array, ti_array)
+        n_points = len(wd_array)
+        return self._lookup(
+            np.tile(np.arange(self.n_turbines), n_points),
+            *(np.repeat(a, self.n_turbines) for a in (wd_array, ws_array, ti_array))
+        ).reshape(n_points, self.n_turbines)
+
+    def _lookup(self, turbines, wind_directions, wind_speeds, turbulence_intensities):
+        """
+        Interpolate the offset of each of the given turbines at the corresponding conditions.
+        """
+        result = np.zeros(len(turbines))
+        if len(self._sector_rows) == 0:
+            return result
+
+        # Find the table row at or below each query, and hence the sector (if any) containing
+        # the query
+        keys = turbines * self._TURBINE_OFFSET + wind_directions
+        row = np.searchsorted(self._row_keys, keys, side="right") - 1
+        sector = self._row_sectors[np.maximum(row, 0)]
+        inside = (row >= 0) & (keys <= self._sector_keys[sector, 1])
+        if not np.any(inside):
+            return result
+        wind_directions = wind_directions[inside]
+        first_row, last_row = self._sector_rows[sector[inside]].T
+
+        # Wind direction cells within the sector, and wind speed and turbulence intensity cells
+        row = np.minimum(row[inside], np.maximum(last_row - 1, first_row))
+        row_upper = np.minimum(row + 1, last_row)
+        spacing = self._row_wds[row_upper] - self._row_wds[row]
+        wd_weight = np.divide(
+            wind_directions - self._row_wds[row], spacing, out=np.zeros(len(row)),
+            where=spacing > 0
+        )
+        cells = [
+            (row, row_upper, wd_weight),
+            _grid_cells(self.grids[1], wind_speeds[inside]),
+            _grid_cells(self.grids[2], turbulence_intensities[inside]),
+        ]
+
+        result[inside] = _sum_cell_corners(self._values, cells)
+        if self._scale is not None:
+            result *= self._scale
+        return result
+
+
+def _yaw_offset_grid_from_df_opt(df_opt):
+    """
+    Extract the wind direction, wind speed, and turbulence intensity axes and the dense yaw
+    offsets (with shape (n_wind_directions, n_wind_speeds, n_turbulence_intensities,
+    n_turbines)) from a yaw offset lookup table.
+    """
     check_df_opt_ordering(df_opt)
 
     # Extract points and values
@@ -532,9 +1549,6 @@ def get_yaw_angles_interpolant(df_opt):
     turbulence_intensities = np.unique(df_opt["turbulence_intensity"])
     yaw_offsets = np.vstack(df_opt["yaw_angles_opt"])
 
-    # Store for possible use if no turbulence intensity is provided
-    ti_ref = float(np.median(turbulence_intensities))
-
     # Reshape the yaw offsets to match the wind direction, wind speed, and turbulence intensity
     yaw_offsets = yaw_offsets.reshape(
         len(wind_directions),
@@ -543,6 +1557,15 @@ def get_yaw_angles_interpolant(df_opt):
         yaw_offsets.shape[1],
     )
 
+    return wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
+
+
+def _extend_yaw_offset_grid(wind_directions, wind_speeds, turbulence_intensities, yaw_offsets):
+    """
+    Extend a dense yaw offset table to wrap around the 0/360 degree point (if the first wind
+    direction is 0 degrees) and to cover all reasonable wind speeds and turbulence intensities,
+    by copying the first and last values (see get_yaw_angles_interpolant).
+    """
     # Expand wind direction range to cover 0 deg to 360 deg
     if wind_directions[0] == 0.0:
         wind_directions = np.concatenate([wind_directions, [360.0]])
@@ -565,52 +1588,164 @@ def get_yaw_angles_interpolant(df_opt):
         axis=2
     )
 
-    # Linear interpolant for the yaw angles
-    interpolant = RegularGridInterpolator(
-        points=(wind_directions, wind_speeds, turbulence_intensities),
-        values=yaw_offsets,
-        bounds_error=True
-    )
+    return wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
 
-    # Store for bounds checks 
-    wd_min = wind_directions.min()
-    wd_max = wind_directions.max()
-    ws_min = wind_speeds.min()
-    ws_max = wind_speeds.max()
-    ti_min = turbulence_intensities.min()
-    ti_max = turbulence_intensities.max()
 
-    # Create a wrapper function to return
-    def yaw_angle_interpolant(wd_array, ws_array, ti_array=None):
-        # Deal with missing ti_array
-        if ti_array is None:
-            ti_array = np.ones(np.shape(wd_array), dtype=float) * ti_ref
+def _check_interpolant_bounds(grids, points):
+    """
+    Raise a ValueError if a yaw offset interpolant is queried outside the (extended) wind
+    direction, wind speed, or turbulence intensity ranges of its table.
+    """
+    (wd_array, ws_array, ti_array) = points
+    (wd_min, wd_max), (ws_min, ws_max), (ti_min, ti_max) = ((g.min(), g.max()) for g in grids)
+    if (np.any(wd_array < wd_min) or np.any(wd_array > wd_max)
+        or np.any(ws_array < ws_min) or np.any(ws_array > ws_max)
+        or np.any(ti_array < ti_min) or np.any(ti_array > ti_max)):
+        err_msg = (
+            "Interpolator queried outside of allowable bounds:\n"
+            "Wind direction bounds: ["+str(wd_min)+", "+str(wd_max)+"]\n"
+            "Wind speed bounds: ["+str(ws_min)+", "+str(ws_max)+"]\n"
+            "Turbulence intensity bounds: ["+str(ti_min)+", "+str(ti_max)+"]\n\n"
+            "Queried at:\n"
+            "Wind directions: "+str(wd_array)+" \n"
+            "Wind speeds: "+str(ws_array)+" \n"
+            "Turbulence intensities: "+str(ti_array)
+        )
+        raise ValueError(err_msg)
 
-        # Format inputs
-        wd_array = np.array(wd_array, dtype=float)
-        ws_array = np.array(ws_array, dtype=float)
-        ti_array = np.array(ti_array, dtype=float)
 
-        # Check inputs are within bounds
-        if (np.any(wd_array < wd_min) or np.any(wd_array > wd_max)
-            or np.any(ws_array < ws_min) or np.any(ws_array > ws_max)
-            or np.any(ti_array < ti_min) or np.any(ti_array > ti_max)):
-            err_msg = (
-                "Interpolator queried outside of allowable bounds:\n"
-                "Wind direction bounds: ["+str(wd_min)+", "+str(wd_max)+"]\n"
-                "Wind speed bounds: ["+str(ws_min)+", "+str(ws_max)+"]\n"
-                "Turbulence intensity bounds: ["+str(ti_min)+", "+str(ti_max)+"]\n\n"
-                "Queried at:\n"
-                "Wind directions: "+str(wd_array)+" \n"
-                "Wind speeds: "+str(ws_array)+" \n"
-                "Turbulence intensities: "+str(ti_array)
+def _interpolate_grid(grids, values, points, per_turbine=False, scale=None):
+    """
+    Linearly interpolate the values of all turbines on a grid, with a single batched
+    operation over all points.
+
+    Values may be stored at reduced precision (for example, float32 or quantized int16); only
+    the values at the corners of the cells enclosing the points are converted to float64.
+
+    Args:
+        grids (tuple): Grid points along each dimension, as 1D np.ndarrays.
+        values (np.ndarray): Values on the grid, with a final dimension over turbines.
+        points (tuple): Coordinates of the points along each dimension, as 1D np.ndarrays.
+        per_turbine (bool, optional): If True, there is one point per turbine, and only the
+            value of each turbine at its own point is interpolated. Defaults to False.
+        scale (float, optional): Factor by which stored values are multiplied (for quantized
+            values). Defaults to None.
+
+    Returns:
+        np.ndarray: Interpolated values, with shape (n_points, n_turbines), or (n_turbines,)
+            if per_turbine.
+    """
+    cells = [_grid_cells(grid, x) for grid, x in zip(grids, points)]
+    if per_turbine:
+        result = _sum_cell_corners(values, cells, (np.arange(values.shape[-1]),))
+    else:
+        result = _sum_cell_corners(values, cells)
+
+    if scale is not None:
+        result *= scale
+    return result
+
+
+def _grid_cells(grid, x):
+    """
+    Find the lower and upper grid indices of the cells enclosing points x, and the fractional
+    position of each point within its cell.
+    """
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, max(len(grid) - 2, 0))
+    i_upper = np.minimum(i + 1, len(grid) - 1)
+    spacing = grid[i_upper] - grid[i]
+    weight = np.divide(x - grid[i], spacing, out=np.zeros(len(x)), where=spacing > 0)
+    return i, i_upper, weight
+
+
+def _sum_cell_corners(values, cells, trailing_index=()):
+    """
+    Sum the contributions of the corners of the cells enclosing each point (as found by
+    _grid_cells along each dimension) to multilinear interpolation of values, indexing any
+    remaining dimensions of values with trailing_index.
+    """
+    result = 0.0
+    n_dims = len(cells)
+    for corner in range(2**n_dims):
+        corner_indices = []
+        corner_weight = 1.0
+        for d, (i, i_upper, weight) in enumerate(cells):
+            if (corner >> d) & 1:
+                corner_indices.append(i_upper)
+                corner_weight = corner_weight * weight
+            else:
+                corner_indices.append(i)
+                corner_weight = corner_weight * (1 - weight)
+        corner_values = values[(*corner_indices, *trailing_index)]
+        result = result + (
+            corner_weight.reshape(corner_weight.shape + (1,) * (corner_values.ndim - 1))
+            * corner_values
+        )
+    return result
+
+
+def compact_yaw_offsets(yaw_offsets, precision="float32"):
+    """
+    Store yaw offsets at reduced precision.
+
+    Args:
+        yaw_offsets (np.ndarray): Yaw offsets (degrees).
+        precision (str, optional): One of "float64", "float32", "float16", or "int16" (offsets
+            quantized to hundredths of a degree). Defaults to "float32".
+
+    Returns:
+        tuple: Compact yaw offsets, as an np.ndarray, and the scale by which they must be
+            multiplied to recover the yaw offsets in degrees (None if no scaling is needed).
+    """
+    if precision in ("float64", "float32", "float16"):
+        return np.asarray(yaw_offsets).astype(precision, copy=False), None
+    elif precision == "int16":
+        quantized = np.round(np.asarray(yaw_offsets) / INT16_RESOLUTION)
+        if np.any(np.abs(quantized) > np.iinfo(np.int16).max):
+            raise ValueError(
+                "Yaw offsets exceed the range of int16 quantization (+/- {0} degrees).".format(
+                    np.iinfo(np.int16).max * INT16_RESOLUTION
+                )
             )
-            raise ValueError(err_msg)
+        return quantized.astype(np.int16), INT16_RESOLUTION
+    else:
+        raise ValueError(
+            "precision must be one of {0}.".format(", ".join(YAW_OFFSET_PRECISIONS))
+        )
 
-        interpolation_points = np.column_stack((wd_array, ws_array, ti_array))
-        return np.array(interpolant(interpolation_points), dtype=float)
 
-    return yaw_angle_interpolant
+def quantization_error_report(yaw_offsets, precisions=YAW_OFFSET_PRECISIONS):
+    """
+    Compare yaw offsets stored at reduced precision against the float64 source table.
+
+    Args:
+        yaw_offsets (np.ndarray or pd.DataFrame): Yaw offsets (degrees), as an array or as a
+            yaw offset lookup table df_opt.
+        precisions (list, optional): Precisions to compare (see compact_yaw_offsets). Defaults
+            to all available precisions.
+
+    Returns:
+        pd.DataFrame: For each precision, the maximum, mean, and root mean square absolute error
+            (degrees) of the stored yaw offsets, and the memory required to store them (bytes)
+            and as a fraction of float64 storage.
+    """
+    if isinstance(yaw_offsets, pd.DataFrame):
+        yaw_offsets = np.vstack(yaw_offsets["yaw_angles_opt"].to_numpy())
+    yaw_offsets = np.asarray(yaw_offsets, dtype=float)
+
+    report = []
+    for precision in precisions:
+        compact, scale = compact_yaw_offsets(yaw_offsets, precision)
+        errors = np.abs(compact.astype(float) * (1.0 if scale is None else scale) - yaw_offsets)
+        report.append({
+            "precision": precision,
+            "max_abs_error": float(errors.max()) if errors.size else 0.0,
+            "mean_abs_error": float(errors.mean()) if errors.size else 0.0,
+            "rms_error": float(np.sqrt(np.mean(errors**2))) if errors.size else 0.0,
+            "memory_bytes": compact.nbytes,
+            "memory_fraction": compact.nbytes / max(yaw_offsets.nbytes, 1),
+        })
+    return pd.DataFrame(report).set_index("precision")
 
 
 def create_uniform_wind_rose(
@@ -639,27 +1774,122 @@ def create_uniform_wind_rose(
         ti_max (float): Maximum (inclusive) turbulence intensity as a fraction. Defaults to 0.06.
     """
 
-    if wd_min == 0 and wd_max == 360:
-        wd_max = wd_max - wd_resolution
-    wind_directions = np.arange(wd_min, wd_max+0.001, wd_resolution)
-    
-    wind_speeds = np.arange(ws_min, ws_max+0.001, ws_resolution)
+    from floris import WindRose, WindTIRose
 
-    if ti_min == ti_max:
+    wind_directions, wind_speeds, turbulence_intensities = _uniform_axes(
+        wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max
+    )
+
+    if len(turbulence_intensities) == 1:
         return WindRose(
             wind_speeds=wind_speeds,
             wind_directions=wind_directions,
             ti_table=ti_min,
         )
     else:
-        turbulence_intensities = np.arange(ti_min, ti_max+0.0001, ti_resolution)
-
         return WindTIRose(
             wind_speeds=wind_speeds,
             wind_directions=wind_directions,
             turbulence_intensities=turbulence_intensities,
         )
 
+def create_wind_data_grid(wind_directions, wind_speeds, turbulence_intensities):
+    """
+    Create wind data covering all combinations of the given wind directions, wind speeds, and
+    turbulence intensities, which need not be uniformly spaced, to use for wake steering
+    optimizations. Conditions are ordered first by wind direction, then by wind speed, then by
+    turbulence intensity, as required of df_opt.
+
+    Args:
+        wind_directions (array-like): Wind directions in degrees.
+        wind_speeds (array-like): Wind speeds in m/s.
+        turbulence_intensities (array-like): Turbulence intensities as fractions.
+
+    Returns:
+        TimeSeries: FLORIS TimeSeries containing all conditions.
+    """
+    from floris import TimeSeries
+
+    wd_grid, ws_grid, ti_grid = np.meshgrid(
+        np.atleast_1d(np.asarray(wind_directions, dtype=float)),
+        np.atleast_1d(np.asarray(wind_speeds, dtype=float)),
+        np.atleast_1d(np.asarray(turbulence_intensities, dtype=float)),
+        indexing="ij"
+    )
+    return TimeSeries(
+        wind_directions=wd_grid.flatten(),
+        wind_speeds=ws_grid.flatten(),
+        turbulence_intensities=ti_grid.flatten(),
+    )
+
+def _uniform_axes(
+    wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max
+):
+    """
+    Compute uniformly spaced wind directions, wind speeds, and turbulence intensities, as used
+    in create_uniform_wind_rose.
+    """
+    if wd_min == 0 and wd_max == 360:
+        wd_max = wd_max - wd_resolution
+    wind_directions = np.arange(wd_min, wd_max+0.001, wd_resolution)
+
+    wind_speeds = np.arange(ws_min, ws_max+0.001, ws_resolution)
+
+    if ti_min == ti_max:
+        turbulence_intensities = np.array([ti_min], dtype=float)
+    else:
+        turbulence_intensities = np.arange(ti_min, ti_max+0.0001, ti_resolution)
+
+    return wind_directions, wind_speeds, turbulence_intensities
+
+def _design_wind_data(
+    wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max,
+    wind_directions, wind_speeds, turbulence_intensities
+):
+    """
+    Create the wind data for a wake steering design, using a uniform wind rose unless any of
+    wind_directions, wind_speeds, or turbulence_intensities are specified explicitly.
+    """
+    _check_design_axes(wind_directions, wind_speeds, turbulence_intensities)
+    if wind_directions is None and wind_speeds is None and turbulence_intensities is None:
+        return create_uniform_wind_rose(
+            wd_resolution=wd_resolution,
+            wd_min=wd_min,
+            wd_max=wd_max,
+            ws_resolution=ws_resolution,
+            ws_min=ws_min,
+            ws_max=ws_max,
+            ti_resolution=ti_resolution,
+            ti_min=ti_min,
+            ti_max=ti_max,
+        )
+    uniform_axes = _uniform_axes(
+        wd_resolution, wd_min, wd_max, ws_resolution, ws_min, ws_max, ti_resolution, ti_min, ti_max
+    )
+    return create_wind_data_grid(*(
+        uniform if specified is None else specified for uniform, specified
+        in zip(uniform_axes, (wind_directions, wind_speeds, turbulence_intensities))
+    ))
+
+def _check_design_axes(wind_directions, wind_speeds, turbulence_intensities):
+    """
+    Check that any specified wind directions, wind speeds, and turbulence intensities of a
+    wake steering design are strictly increasing (sorted and unique), as required of df_opt.
+    """
+    for name, values in zip(
+        ["wind_directions", "wind_speeds", "turbulence_intensities"],
+        [wind_directions, wind_speeds, turbulence_intensities]
+    ):
+        if values is None:
+            continue
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        if values.ndim != 1 or len(values) == 0 or np.any(np.diff(values) <= 0):
+            raise ValueError(
+                name + " must be a nonempty, strictly increasing (sorted and unique) array."
+            )
+
+_DF_OPT_AXES = ["wind_direction", "wind_speed", "turbulence_intensity"]
+
 def check_df_opt_ordering(df_opt):
     """
     Check that the ordering of inputs is first wind direction, then wind speed,
@@ -667,11 +1897,51 @@ def check_df_opt_ordering(df_opt):
 
     Raises an error if this is found not to be the case.
 
+    The check is a single pass over the wind direction, wind speed, and turbulence intensity
+    columns, which tests that they form a full grid with strides determined from the first
+    rows.
+
     Args:
         df_opt (pd.DataFrame): A yaw offset lookup table.
     """
+    if not _is_df_opt_grid(*(df_opt[c].to_numpy() for c in _DF_OPT_AXES)):
+        # Run full check to identify the problem
+        _check_df_opt_ordering_full(df_opt)
 
-    inputs_all = df_opt[["wind_direction", "wind_speed", "turbulence_intensity"]].to_numpy()
+def _is_df_opt_grid(wind_directions, wind_speeds, turbulence_intensities):
+    """
+    Determine whether the wind directions, wind speeds, and turbulence intensities form a full
+    grid, ordered first by (strictly increasing) wind direction, then by wind speed, then by
+    turbulence intensity.
+    """
+    n_rows = len(wind_directions)
+    if n_rows == 0:
+        return True
+
+    # Number of rows per wind speed and per wind direction, from the first rows
+    new_wd = wind_directions != wind_directions[0]
+    n_per_wd = int(np.argmax(new_wd)) if new_wd.any() else n_rows
+    new_ws = new_wd | (wind_speeds != wind_speeds[0])
+    n_per_ws = int(np.argmax(new_ws)) if new_ws.any() else n_rows
+    if n_per_wd % n_per_ws != 0 or n_rows % n_per_wd != 0:
+        return False
+    shape = (n_rows // n_per_wd, n_per_wd // n_per_ws, n_per_ws)
+
+    wd = wind_directions.reshape(shape)
+    ws = wind_speeds.reshape(shape)
+    ti = turbulence_intensities.reshape(shape)
+    return bool(
+        np.all(wd == wd[:, :1, :1]) and np.all(np.diff(wd[:, 0, 0]) > 0)
+        and np.all(ws == ws[:1, :, :1]) and np.all(np.diff(ws[0, :, 0]) > 0)
+        and np.all(ti == ti[:1, :1, :]) and np.all(np.diff(ti[0, 0, :]) > 0)
+    )
+
+def _check_df_opt_ordering_full(df_opt):
+    """
+    Check the ordering of df_opt using the unique values of each column. Slower than
+    _is_df_opt_grid, but identifies whether the table is incomplete or out of order.
+    """
+    inputs_all = df_opt[_DF_OPT_AXES].to_numpy()
     wd_unique = np.unique(df_opt["wind_direction"])
     ws_unique = np.unique(df_opt["wind_speed"])
     ti_unique = np.unique(df_opt["turbulence_intensity"])
@@ -1,10 +1,30 @@
-from hycon.interfaces.hercules_interface import HerculesInterface
-from hycon.interfaces.hercules_v1_interface import (
-    HerculesADInterface,
-    HerculesBatteryInterface,
-    HerculesHybridADInterface,
-    HerculesV1ADInterface,
-    HerculesV1BatteryInterface,
-    HerculesV1HybridADInterface,
-)
-from hycon.interfaces.rosco_zmq_interface import ROSCO_ZMQInterface
+import importlib
+
+# Interfaces are imported on first access (see __getattr__), so that importing an interface
+# only loads its own dependencies (for example, zmq is only loaded for ROSCO_ZMQInterface)
+_INTERFACE_MODULES = {
+    "ForecastBuffer": "hycon.interfaces.forecast_buffer",
+    "HerculesInterface": "hycon.interfaces.hercules_interface",
+    "HerculesADInterface": "hycon.interfaces.hercules_v1_interface",
+    "HerculesBatteryInterface": "hycon.interfaces.hercules_v1_interface",
+    "HerculesHybridADInterface": "hycon.interfaces.hercules_v1_interface",
+    "HerculesV1ADInterface": "hycon.interfaces.hercules_v1_interface",
+    "HerculesV1BatteryInterface": "hycon.interfaces.hercules_v1_interface",
+    "HerculesV1HybridADInterface": "hycon.interfaces.hercules_v1_interface",
+    "InflowEstimator": "hycon.interfaces.inflow_estimator",
+    "ROSCO_ZMQInterface": "hycon.interfaces.rosco_zmq_interface",
+}
+
+__all__ = list(_INTERFACE_MODULES.keys())
+
+
+def __getattr__(name):
+    if name in _INTERFACE_MODULES:
+        value = getattr(importlib.import_module(_INTERFACE_MODULES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
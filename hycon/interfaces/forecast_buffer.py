@@ -0,0 +1,167 @@
+import re
+
+import numpy as np
+
+# Recognized naming conventions for forecast signals, e.g. "wind_power_forecast_3" or
+# "forecast_ws_mean_3", where the trailing integer is the lead (in forecast steps)
+FORECAST_KEY_PATTERNS = [
+    re.compile(r"^(?P<signal>.+)_forecast_(?P<lead>\d+)$"),
+    re.compile(r"^forecast_(?P<signal>.+)_(?P<lead>\d+)$"),
+]
+
+
+def parse_forecast_key(key):
+    """
+    Split a forecast key into its signal name and lead.
+
+    Args:
+        key (str): Forecast key, following either the "<signal>_forecast_<k>" or
+            "forecast_<signal>_<k>" naming convention.
+
+    Returns:
+        tuple or None: (signal, lead) if key follows a recognized naming convention, otherwise
+            None.
+    """
+    for pattern in FORECAST_KEY_PATTERNS:
+        match = pattern.match(key)
+        if match is not None:
+            return match.group("signal"), int(match.group("lead"))
+    return None
+
+
+class ForecastBuffer():
+    """
+    Array-backed storage for forecast signals, indexed by lead.
+
+    Each forecast signal is held in a preallocated ring buffer of twice the signal's horizon
+    length, with every value written to both halves. The forecast over the full horizon is
+    therefore always a contiguous slice of the buffer, and horizon() returns a (read-only)
+    view rather than a copy. Leads that have not been provided are NaN.
+
+    Forecasts are written using update(), which accepts the scalar forecast dictionaries
+    collected by the interfaces. The interfaces pass the complete forecast at each step with
+    replace=True, so that leads (and signals) no longer provided are reset to NaN rather than
+    holding stale values. Calling advance() shifts all forecasts forward by a number of
+    forecast steps (so that the previous lead k becomes lead k-1) without any copying; the
+    vacated final leads hold the last known value until overwritten.
+    """
+    def __init__(self, horizons={}):
+        """
+        Constructor for ForecastBuffer.
+
+        Args:
+            horizons (dict): Horizon length (number of leads) to preallocate for each signal.
+                Signals not specified are allocated on first update, with horizon length
+                determined by the largest lead provided. Defaults to {}.
+        """
+        self._data = {}
+        self._start = {}
+        self._horizon = {}
+        self._key_cache = {}
+
+        for signal, horizon in horizons.items():
+            self.register(signal, horizon)
+
+    def register(self, signal, horizon):
+        """
+        Allocate storage for a forecast signal. If the signal is already registered with a
+        shorter horizon, its storage is extended, retaining the current forecast.
+
+        Args:
+            signal (str): Name of the forecast signal.
+            horizon (int): Number of leads to store.
+        """
+        if horizon < 1:
+            raise ValueError("Forecast horizon must be at least 1.")
+
+        data = np.full(2 * horizon, np.nan)
+        if signal in self._data:
+            if horizon <= self._horizon[signal]:
+                return
+            current = self.horizon(signal)
+            data[:len(current)] = current
+            data[horizon:horizon+len(current)] = current
+
+        self._data[signal] = data
+        self._start[signal] = 0
+        self._horizon[signal] = horizon
+
+    def update(self, forecast_dict, replace=False):
+        """
+        Write forecast values. Keys that do not follow a recognized naming convention are
+        ignored.
+
+        Args:
+            forecast_dict (dict): Forecast values, keyed by "<signal>_forecast_<k>" or
+                "forecast_<signal>_<k>", where k is the lead.
+            replace (bool): If True, forecast_dict is the complete current forecast, and all
+                values not provided in it are reset to NaN. If False, values not provided are
+                retained. Defaults to False.
+        """
+        if replace:
+            self.clear()
+        for key, value in forecast_dict.items():
+            if key not in self._key_cache:
+                self._key_cache[key] = parse_forecast_key(key)
+            parsed = self._key_cache[key]
+            if parsed is None:
+                continue
+            signal, lead = parsed
+            if signal not in self._data or lead >= self._horizon[signal]:
+                self.register(signal, max(self._horizon.get(signal, 0), lead + 1))
+
+            horizon = self._horizon[signal]
+            i = (self._start[signal] + lead) % horizon
+            self._data[signal][i] = value
+            self._data[signal][i + horizon] = value
+
+    def advance(self, n_steps=1):
+        """
+        Shift all forecasts forward in time by n_steps forecast steps, so that the previous lead
+        k becomes lead k - n_steps. The final n_steps leads hold the last known value of the
+        forecast.
+
+        Args:
+            n_steps (int): Number of forecast steps to advance. Defaults to 1.
+        """
+        for signal, data in self._data.items():
+            horizon = self._horizon[signal]
+            n = min(n_steps, horizon - 1)
+            if n < 1:
+                continue
+            last = data[self._start[signal] + horizon - 1]
+            start = (self._start[signal] + n) % horizon
+            # Fill the vacated leads with the last known value
+            i = (start + horizon - n + np.arange(n)) % horizon
+            data[i] = last
+            data[i + horizon] = last
+            self._start[signal] = start
+
+    def horizon(self, signal):
+        """
+        Get the forecast of a signal over its full horizon.
+
+        Args:
+            signal (str): Name of the forecast signal.
+
+        Returns:
+            np.ndarray: Read-only view of the forecast values, indexed by lead.
+        """
+        if signal not in self._data:
+            raise KeyError("Forecast signal \"" + signal + "\" not found.")
+        start = self._start[signal]
+        view = self._data[signal][start:start+self._horizon[signal]]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        """Reset all stored forecast values to NaN."""
+        for data in self._data.values():
+            data[:] = np.nan
+
+    @property
+    def signals(self):
+        return list(self._data.keys())
+
+    def __contains__(self, signal):
+        return signal in self._data
@@ -1,6 +1,10 @@
 import copy
 
+import numpy as np
+
 from hycon.controllers.wind_farm_power_tracking_controller import POWER_SETPOINT_DEFAULT
+from hycon.interfaces.forecast_buffer import ForecastBuffer
+from hycon.interfaces.inflow_estimator import InflowEstimator
 from hycon.interfaces.interface_base import InterfaceBase
 
 
@@ -8,7 +12,17 @@ class HerculesInterface(InterfaceBase):
     """
     Class for interfacing with Hercules v2 simulator.
     """
-    def __init__(self, h_dict):
+    def __init__(self, h_dict, inflow_window=None):
+        """
+        Constructor for HerculesInterface.
+
+        Args:
+            h_dict (dict): Hercules input dictionary.
+            inflow_window (float): Length (s) of the window over which the wind direction and
+                wind speed measurements at each turbine are averaged (using the circular mean
+                for wind direction). Defaults to None, in which case the measurements are passed
+                through without averaging.
+        """
         super().__init__()
         self.dt = h_dict["dt"]
 
@@ -24,6 +38,9 @@ class HerculesInterface(InterfaceBase):
         else:
             self.plant_parameters = {}
 
+        # Array-backed storage for forecast signals
+        self.forecast_buffer = ForecastBuffer()
+
         # Determine which components are present in the simulation
         self._has_wind_component = "wind_farm" in h_dict
         self._has_solar_component = "solar_farm" in h_dict
@@ -38,6 +55,14 @@ class HerculesInterface(InterfaceBase):
                 "turbines": range(h_dict["wind_farm"]["n_turbines"]),
             }
             self._n_turbines = self.plant_parameters["wind_farm"]["n_turbines"]
+
+            # Inflow estimation
+            if inflow_window is None:
+                self.inflow_estimator = None
+            else:
+                self.inflow_estimator = InflowEstimator(
+                    self._n_turbines, max(int(round(inflow_window / self.dt)), 1)
+                )
         else:
             self._n_turbines = 0
 
@@ -96,9 +121,12 @@ class HerculesInterface(InterfaceBase):
         if self._has_wind_component:
             measurements["wind_farm"] = {
                 "turbine_powers": h_dict["wind_farm"]["turbine_powers"],
-                "wind_directions": [h_dict["wind_farm"]["wind_direction_mean"]]*self._n_turbines,
-                # TODO: wind_speeds?
             }
+            measurements["wind_farm"].update(self._inflow_measurements(h_dict["wind_farm"]))
+            if "turbine_available_powers" in h_dict["wind_farm"]:
+                measurements["wind_farm"]["turbine_available_powers"] = (
+                    h_dict["wind_farm"]["turbine_available_powers"]
+                )
             total_power += sum(measurements["wind_farm"]["turbine_powers"])
 
         # Basic solar quantities
@@ -168,10 +196,58 @@ class HerculesInterface(InterfaceBase):
                 if "forecast" in k:
                     measurements["forecast"][k] = h_dict["external_signals"][k]
 
+        # Forecasts not provided at this step are reset, rather than holding stale values
+        self.forecast_buffer.update(measurements["forecast"], replace=True)
+        measurements["forecast_buffer"] = self.forecast_buffer
+
         measurements["total_power"] = total_power
 
         return measurements
 
+    def _inflow_measurements(self, wind_farm_dict):
+        """
+        Extract wind directions, wind speeds and turbulence intensities at each turbine.
+        Per-turbine values (turbine_wind_directions, turbine_wind_speeds,
+        turbine_turbulence_intensities) are used where available, otherwise the farm-wide values
+        (wind_direction_mean, wind_speed, turbulence_intensity) are applied to all turbines. If
+        an inflow estimator is configured, the returned wind directions and wind speeds are
+        moving-window averages.
+        """
+        if "turbine_wind_directions" in wind_farm_dict:
+            wind_directions = wind_farm_dict["turbine_wind_directions"]
+        else:
+            wind_directions = [wind_farm_dict["wind_direction_mean"]]*self._n_turbines
+        if "turbine_wind_speeds" in wind_farm_dict:
+            wind_speeds = wind_farm_dict["turbine_wind_speeds"]
+        elif "wind_speed" in wind_farm_dict:
+            wind_speeds = [wind_farm_dict["wind_speed"]]*self._n_turbines
+        else:
+            wind_speeds = None
+
+        if self.inflow_estimator is not None:
+            wind_directions, estimated_wind_speeds = self.inflow_estimator.update(
+                wind_directions, np.nan if wind_speeds is None else wind_speeds
+            )
+            wind_directions = wind_directions.tolist()
+            if wind_speeds is not None:
+                wind_speeds = estimated_wind_speeds.tolist()
+
+        inflow_measurements = {"wind_directions": wind_directions}
+        if wind_speeds is not None:
+            inflow_measurements["wind_speeds"] = wind_speeds
+
+        # Turbulence intensities are passed through without averaging
+        if "turbine_turbulence_intensities" in wind_farm_dict:
+            inflow_measurements["turbulence_intensities"] = (
+                wind_farm_dict["turbine_turbulence_intensities"]
+            )
+        elif "turbulence_intensity" in wind_farm_dict:
+            inflow_measurements["turbulence_intensities"] = (
+                [wind_farm_dict["turbulence_intensity"]]*self._n_turbines
+            )
+
+        return inflow_measurements
+
     def send_controls(
             self,
             h_dict,
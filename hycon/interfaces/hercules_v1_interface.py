@@ -1,4 +1,5 @@
 from hycon.controllers.wind_farm_power_tracking_controller import POWER_SETPOINT_DEFAULT
+from hycon.interfaces.forecast_buffer import ForecastBuffer
 from hycon.interfaces.interface_base import InterfaceBase
 
 
@@ -16,6 +17,9 @@ class HerculesV1ADInterface(InterfaceBase):
         # Assign plant parameters for controller use
         self.plant_parameters = {"n_turbines": self.n_turbines}
 
+        # Array-backed storage for forecast signals
+        self.forecast_buffer = ForecastBuffer()
+
         pass
 
     def get_measurements(self, hercules_dict):
@@ -40,10 +44,14 @@ class HerculesV1ADInterface(InterfaceBase):
                 if "forecast" in k != "wind_power_reference":
                     forecast[k] = hercules_dict["external_signals"][k]
 
+        # Forecasts not provided at this step are reset, rather than holding stale values
+        self.forecast_buffer.update(forecast, replace=True)
+
         measurements = {
             "time": time,
             "total_power": sum(turbine_powers),
             "forecast": forecast,
+            "forecast_buffer": self.forecast_buffer,
             "wind_farm": {
                 "wind_directions": wind_directions,
                 "turbine_powers": turbine_powers,
@@ -91,6 +99,10 @@ class HerculesV1HybridADInterface(InterfaceBase):
         self._has_wind_component = False
         self._has_battery_component = False
         self._has_hydrogen_component = False
+
+        # Array-backed storage for forecast signals
+        self.forecast_buffer = ForecastBuffer()
+
         # Grab name of wind, solar, and battery 
         self.plant_parameters = {}
         for i in py_sims:
@@ -155,10 +167,14 @@ class HerculesV1HybridADInterface(InterfaceBase):
 
         total_power = 0.0
 
+        # Forecasts not provided at this step are reset, rather than holding stale values
+        self.forecast_buffer.update(forecast, replace=True)
+
         measurements = {
             "time": time,
             "plant_power_reference": plant_power_reference,
             "forecast": forecast,
+            "forecast_buffer": self.forecast_buffer,
         } 
 
         if self._has_wind_component:
@@ -0,0 +1,88 @@
+import numpy as np
+
+from hycon.angles import wrap_360
+
+
+class InflowEstimator():
+    """
+    Moving-window estimator of the wind direction and wind speed at each turbine.
+
+    Wind directions are averaged using the circular mean (so that, for example, directions of
+    359 and 1 degrees average to 0 degrees), and wind speeds using the arithmetic mean, over
+    the most recent window_length measurements. Measurements are held in ring buffers (of
+    the sine and cosine of the wind direction, and the wind speed), with running sums updated
+    at each step so that the cost of each update does not depend on the window length. Until
+    window_length measurements have been received, all measurements received are averaged.
+    """
+    def __init__(self, n_turbines, window_length=1):
+        """
+        Constructor for InflowEstimator.
+
+        Args:
+            n_turbines (int): Number of turbines.
+            window_length (int): Number of measurements to average over. Defaults to 1 (no
+                averaging).
+        """
+        if window_length < 1:
+            raise ValueError("window_length must be at least 1.")
+        self.n_turbines = n_turbines
+        self.window_length = window_length
+
+        self._sin_buffer = np.zeros((window_length, n_turbines))
+        self._cos_buffer = np.zeros((window_length, n_turbines))
+        self._ws_buffer = np.zeros((window_length, n_turbines))
+        self._sin_sum = np.zeros(n_turbines)
+        self._cos_sum = np.zeros(n_turbines)
+        self._ws_sum = np.zeros(n_turbines)
+        self._position = -1
+        self._n_received = 0
+
+        self.wind_directions = None
+        self.wind_speeds = None
+
+    def update(self, wind_directions, wind_speeds):
+        """
+        Add measurements and update the estimates.
+
+        Args:
+            wind_directions (float or array-like): Measured wind direction (degrees) at each
+                turbine. Scalars are applied to all turbines.
+            wind_speeds (float or array-like): Measured wind speed (m/s) at each turbine.
+                Scalars are applied to all turbines.
+
+        Returns:
+            tuple: Estimated wind directions (degrees) and wind speeds (m/s) at each turbine,
+                as np.ndarrays.
+        """
+        wd_rad = np.deg2rad(np.broadcast_to(np.asarray(wind_directions, dtype=float),
+                                            (self.n_turbines,)))
+        wind_speeds = np.broadcast_to(np.asarray(wind_speeds, dtype=float), (self.n_turbines,))
+
+        self._position = (self._position + 1) % self.window_length
+        self._n_received = min(self._n_received + 1, self.window_length)
+        i = self._position
+
+        if i == 0:
+            # Recompute sums from scratch once per window to avoid accumulating round-off error
+            self._sin_buffer[0] = np.sin(wd_rad)
+            self._cos_buffer[0] = np.cos(wd_rad)
+            self._ws_buffer[0] = wind_speeds
+            self._sin_sum = self._sin_buffer[:self._n_received].sum(axis=0)
+            self._cos_sum = self._cos_buffer[:self._n_received].sum(axis=0)
+            self._ws_sum = self._ws_buffer[:self._n_received].sum(axis=0)
+        else:
+            sin_new = np.sin(wd_rad)
+            cos_new = np.cos(wd_rad)
+            self._sin_sum += sin_new - self._sin_buffer[i]
+            self._cos_sum += cos_new - self._cos_buffer[i]
+            self._ws_sum += wind_speeds - self._ws_buffer[i]
+            self._sin_buffer[i] = sin_new
+            self._cos_buffer[i] = cos_new
+            self._ws_buffer[i] = wind_speeds
+
+        self.wind_directions = wrap_360(np.rad2deg(np.arctan2(self._sin_sum, self._cos_sum)))
+        # Small negative angles (from round-off) wrap to 360.0; report these as 0.0
+        self.wind_directions[self.wind_directions >= 360.0] = 0.0
+        self.wind_speeds = self._ws_sum / self._n_received
+
+        return self.wind_directions, self.wind_speeds
@@ -1,4 +1,4 @@
-from floris.utilities import wrap_180
+from hycon.angles import wrap_180
 
 
 def convert_absolute_nacelle_heading_to_offset(target_nac_heading, current_nac_heading):
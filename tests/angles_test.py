@@ -0,0 +1,44 @@
+import numpy as np
+from floris.utilities import wrap_180 as floris_wrap_180, wrap_360 as floris_wrap_360
+from hycon.angles import angle_difference, circular_mean, in_sector, wrap_180, wrap_360
+
+
+def test_wrap():
+    angles = np.array([-540.0, -180.0, -179.5, 0.0, 90.0, 180.0, 270.0, 359.9, 360.0, 725.0])
+
+    # Matches FLORIS implementation, for both arrays and scalars
+    assert np.array_equal(wrap_180(angles), floris_wrap_180(angles))
+    assert np.array_equal(wrap_360(angles), floris_wrap_360(angles))
+    assert [wrap_180(a) for a in angles.tolist()] == floris_wrap_180(angles).tolist()
+    assert [wrap_360(a) for a in angles.tolist()] == floris_wrap_360(angles).tolist()
+    assert isinstance(wrap_180(270.0), float)
+    assert np.array_equal(wrap_180([270.0, -90.0]), [-90.0, -90.0])
+
+    # In place
+    angles_in_place = angles.copy()
+    wrap_180(angles_in_place, out=angles_in_place)
+    assert np.array_equal(angles_in_place, floris_wrap_180(angles))
+    wrap_360(angles_in_place, out=angles_in_place)
+    assert np.array_equal(angles_in_place, floris_wrap_360(angles))
+
+def test_angle_difference():
+    assert angle_difference(10.0, 350.0) == 20.0
+    assert angle_difference(350.0, 10.0) == -20.0
+    assert np.allclose(angle_difference([10.0, 350.0], [350.0, 10.0]), [20.0, -20.0])
+
+def test_circular_mean():
+    assert abs(angle_difference(circular_mean([350.0, 10.0]), 0.0)) < 1e-9
+    assert abs(angle_difference(circular_mean([350.0, 20.0], weights=[2.0, 1.0]), 0.0)) < 0.5
+    assert np.allclose(circular_mean([[90.0, 180.0], [90.0, 0.0]], axis=0), [90.0, 90.0])
+
+def test_in_sector():
+    assert in_sector(5.0, 0.0, 10.0)
+    assert not in_sector(0.0, 0.0, 10.0) # Strict bounds
+    assert not in_sector(15.0, 0.0, 10.0)
+    assert in_sector(359.0, 355.0, 5.0) # Sector spanning 0/360 degrees
+    assert in_sector(1.0, 355.0, 5.0)
+    assert not in_sector(180.0, 355.0, 5.0)
+    assert np.array_equal(
+        in_sector(np.array([359.0, 1.0, 180.0]), 355.0, 5.0),
+        [True, True, False]
+    )
@@ -1,4 +1,7 @@
+import numpy as np
+import pytest
 from hycon.controllers.battery_controller import (
+    BatteryArbitrageController,
     BatteryPriceSOCController,
 )
 from hycon.interfaces import HerculesInterface
@@ -93,3 +96,106 @@ def test_BatteryPriceSOCController_compute_controls():
     measurement_dict["RT_LMP"] = 10
     controls_dict = test_controller.compute_controls(measurement_dict)
     assert controls_dict["power_setpoint"] == 0.0
+
+
+def test_BatteryPriceSOCController_price_thresholds():
+    test_interface = HerculesInterface(test_hercules_dict)
+
+    # Thresholds match those from a full sort, for several rank choices
+    rng = np.random.default_rng(0)
+    DA_LMP_test = rng.uniform(-10, 100, 24)
+    DA_LMP_sorted = np.sort(DA_LMP_test)
+    for threshold_rank, extreme_rank in [(4, 1), (6, 2), (1, 1), (12, 12)]:
+        test_controller = BatteryPriceSOCController(
+            test_interface,
+            test_hercules_dict,
+            {"threshold_rank": threshold_rank, "extreme_rank": extreme_rank}
+        )
+        assert np.allclose(
+            test_controller.compute_price_thresholds(DA_LMP_test),
+            [
+                DA_LMP_sorted[extreme_rank-1],
+                DA_LMP_sorted[threshold_rank-1],
+                DA_LMP_sorted[-threshold_rank],
+                DA_LMP_sorted[-extreme_rank],
+            ]
+        )
+
+    with pytest.raises(ValueError):
+        BatteryPriceSOCController(
+            test_interface, test_hercules_dict, {"threshold_rank": 1, "extreme_rank": 2}
+        )
+
+    # Thresholds are cached and only recomputed when the day-ahead prices change
+    test_controller = BatteryPriceSOCController(test_interface, test_hercules_dict)
+    measurement_dict = {
+        "battery": {"state_of_charge": 0.5},
+        "RT_LMP": 21,
+        "DA_LMP_24hours": [i for i in range(24)],
+    }
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    assert controls_dict["power_setpoint"] == test_controller.rated_power_discharging
+    thresholds = test_controller._price_thresholds
+    test_controller.compute_controls(measurement_dict)
+    assert test_controller._price_thresholds is thresholds
+
+    measurement_dict["DA_LMP_24hours"] = [i + 10 for i in range(24)]
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    assert test_controller._price_thresholds is not thresholds
+    assert controls_dict["power_setpoint"] == 0.0
+
+
+def test_BatteryArbitrageController():
+    test_interface = HerculesInterface(test_hercules_dict)
+    controller_parameters = {"soc_min": 0.1, "soc_max": 0.9, "n_soc_grid": 41}
+    test_controller = BatteryArbitrageController(
+        test_interface, test_hercules_dict, controller_parameters
+    )
+
+    # Cheap prices now, expensive prices later: battery charges
+    DA_LMP_test = [10.0]*12 + [50.0]*12
+    measurement_dict = {
+        "time": 0.0,
+        "battery": {"state_of_charge": 0.5},
+        "RT_LMP": 10.0,
+        "DA_LMP_24hours": DA_LMP_test,
+    }
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    assert controls_dict["power_setpoint"] <= 0.0
+    assert test_controller.planned_soc.max() == pytest.approx(0.9)
+    assert (test_controller.planned_soc >= 0.1 - 1e-9).all()
+    assert (test_controller.planned_soc <= 0.9 + 1e-9).all()
+
+    # Real-time price spike: battery discharges
+    measurement_dict["RT_LMP"] = 100.0
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    assert controls_dict["power_setpoint"] > 0.0
+    assert test_controller.planned_soc[0] == pytest.approx(0.1)
+
+    # Expensive hours: battery discharges
+    measurement_dict["time"] = 13 * 3600.0
+    measurement_dict["RT_LMP"] = 50.0
+    measurement_dict["battery"]["state_of_charge"] = 0.9
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    assert controls_dict["power_setpoint"] > 0.0
+
+    # Future stages are not re-solved if only the real-time price changes
+    values = test_controller._values.copy()
+    measurement_dict["RT_LMP"] = 45.0
+    test_controller.compute_controls(measurement_dict)
+    assert np.array_equal(values, test_controller._values)
+
+    # Partial re-solve after a day-ahead price change matches a full solve
+    measurement_dict["DA_LMP_24hours"] = [10.0]*12 + [50.0]*11 + [70.0]
+    controls_dict = test_controller.compute_controls(measurement_dict)
+    test_controller_full = BatteryArbitrageController(
+        test_interface, test_hercules_dict, controller_parameters
+    )
+    controls_dict_full = test_controller_full.compute_controls(measurement_dict)
+    assert np.allclose(test_controller._values, test_controller_full._values)
+    assert controls_dict["power_setpoint"] == controls_dict_full["power_setpoint"]
+
+    with pytest.raises(ValueError):
+        BatteryArbitrageController(
+            test_interface, test_hercules_dict, {"soc_min": 0.5, "soc_max": 0.4}
+        )
@@ -1,4 +1,6 @@
 import copy
+import subprocess
+import sys
 
 import numpy as np
 import pandas as pd
@@ -9,14 +11,20 @@ from hycon.controllers import (
     BatteryController,
     BatteryPassthroughController,
     HybridSupervisoryControllerBaseline,
+    HybridSupervisoryControllerMPC,
     HybridSupervisoryControllerMultiRef,
     HydrogenPlantController,
     LookupBasedWakeSteeringController,
     SolarPassthroughController,
     WindFarmPowerDistributingController,
     WindFarmPowerTrackingController,
+    YawScheduler,
+)
+from hycon.controllers.controller_base import timeseries_step
+from hycon.controllers.wind_farm_power_tracking_controller import (
+    POWER_SETPOINT_DEFAULT,
+    water_filling_allocation,
 )
-from hycon.controllers.wind_farm_power_tracking_controller import POWER_SETPOINT_DEFAULT
 from hycon.interfaces import (
     HerculesADInterface,
     HerculesBatteryInterface,
@@ -191,6 +199,87 @@ def test_LookupBasedWakeSteeringController():
     )
     assert np.allclose(test_angles, wind_directions - test_offsets)
 
+    # Lookup table with offsets that depend on wind speed and turbulence intensity; each turbine
+    # is looked up at its own conditions
+    df_opt_test = pd.DataFrame(data={
+        "wind_direction":[220.0]*4 + [320.0]*4,
+        "wind_speed":[0.0, 0.0, 20.0, 20.0]*2,
+        "turbulence_intensity":[0.06, 0.10]*4,
+        "yaw_angles_opt":[np.array([0.0, 0.0]), np.array([0.0, 0.0]),
+                          np.array([20.0, 10.0]), np.array([10.0, 5.0])]*2,
+    })
+    test_controller = LookupBasedWakeSteeringController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        df_yaw=df_opt_test
+    )
+    yaw_angles = test_controller.wake_steering_angles([270.0, 270.0], [10.0, 5.0])["yaw_angles"]
+    assert np.allclose(yaw_angles, [270.0 - 7.5, 270.0 - 1.875]) # Median TI of table (0.08)
+    yaw_angles = test_controller.wake_steering_angles(
+        [270.0, 270.0], [10.0, 5.0], [0.06, 0.10]
+    )["yaw_angles"]
+    assert np.allclose(yaw_angles, [270.0 - 10.0, 270.0 - 1.25])
+    # Missing measurements revert to previous values
+    yaw_angles = test_controller.wake_steering_angles([270.0, 270.0])["yaw_angles"]
+    assert np.allclose(yaw_angles, [270.0 - 10.0, 270.0 - 1.25])
+
+    # Sparse lookup table gives the same yaw angles
+    test_controller = LookupBasedWakeSteeringController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        df_yaw=df_opt_test,
+        sparse_table=True,
+    )
+    yaw_angles = test_controller.wake_steering_angles(
+        [270.0, 270.0], [10.0, 5.0], [0.06, 0.10]
+    )["yaw_angles"]
+    assert np.allclose(yaw_angles, [270.0 - 10.0, 270.0 - 1.25])
+
+    # Yaw scheduler limits the yaw rate of the setpoints sent
+    test_controller = LookupBasedWakeSteeringController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        df_yaw=df_opt_test,
+        yaw_scheduler=YawScheduler(dt=1.0, n_turbines=2, maximum_yaw_rate=0.5),
+    )
+    test_controller.wake_steering_angles([270.0, 270.0], [0.0, 0.0])
+    yaw_angles = test_controller.wake_steering_angles([270.0, 270.0], [20.0, 20.0])["yaw_angles"]
+    assert np.allclose(yaw_angles, [269.5, 269.5])
+    assert test_controller.yaw_scheduler.statistics()["total_yaw_travel"] == 1.0
+    with pytest.raises(ValueError):
+        LookupBasedWakeSteeringController(
+            interface=test_interface,
+            input_dict=test_hercules_dict,
+            yaw_scheduler=YawScheduler(dt=1.0, n_turbines=3),
+        )
+
+    # Within a hysteresis zone, the previous setpoint is held
+    test_controller = LookupBasedWakeSteeringController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        df_yaw=df_opt_test,
+        hysteresis_dict={"T000": [(265.0, 275.0)]},
+    )
+    test_controller.wake_steering_angles([260.0, 260.0], [10.0, 10.0], [0.06, 0.06])
+    yaw_angles = test_controller.wake_steering_angles(
+        [270.0, 270.0], [10.0, 10.0], [0.06, 0.06]
+    )["yaw_angles"]
+    assert np.allclose(yaw_angles, [260.0 - 10.0, 270.0 - 5.0])
+
+    # Scalar yaw initial condition held when starting within a hysteresis zone
+    test_controller = LookupBasedWakeSteeringController(
+        interface=test_interface,
+        input_dict={
+            **test_hercules_dict, "controller": {"initial_conditions": {"yaw": 268.0}}
+        },
+        df_yaw=df_opt_test,
+        hysteresis_dict={"T000": [(265.0, 275.0)]},
+    )
+    yaw_angles = test_controller.wake_steering_angles(
+        [270.0, 270.0], [10.0, 10.0], [0.06, 0.06]
+    )["yaw_angles"]
+    assert np.allclose(yaw_angles, [268.0, 270.0 - 5.0])
+
 def test_WindFarmPowerDistributingController():
     test_interface = HerculesADInterface(test_hercules_dict)
     test_controller = WindFarmPowerDistributingController(
@@ -218,6 +307,61 @@ def test_WindFarmPowerDistributingController():
     )
     assert np.allclose(test_power_setpoints, 500)
     
+def test_WindFarmPowerDistributingController_available_power():
+    test_interface = StandinInterface()
+    test_controller = WindFarmPowerDistributingController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        distribution_mode="available_power",
+    )
+
+    # Reference below total available power: low producer capped, remainder to high producer
+    out = test_controller.turbine_power_references(
+        farm_power_reference=3000,
+        turbine_powers=[500, 1500],
+        turbine_available_powers=[1000, 4000],
+    )
+    assert np.allclose(out["power_setpoints"], [1000, 2000])
+
+    # Reference shared evenly if no turbine is limited
+    out = test_controller.turbine_power_references(
+        farm_power_reference=1000,
+        turbine_powers=[500, 1500],
+        turbine_available_powers=[1000, 4000],
+    )
+    assert np.allclose(out["power_setpoints"], [500, 500])
+
+    # Reference above total available power: surplus split evenly
+    out = test_controller.turbine_power_references(
+        farm_power_reference=6000,
+        turbine_powers=[500, 1500],
+        turbine_available_powers=[1000, 4000],
+    )
+    assert np.allclose(out["power_setpoints"], [1500, 4500])
+
+    # Falls back to even split if available powers are not provided
+    out = test_controller.turbine_power_references(
+        farm_power_reference=3000,
+        turbine_powers=[500, 1500],
+    )
+    assert np.allclose(out["power_setpoints"], [1500, 1500])
+
+    # Batched allocation matches individual solutions
+    rng = np.random.default_rng(0)
+    capacities = rng.uniform(0, 5000, (20, 50))
+    references = rng.uniform(0, 3e5, 20)
+    allocations = water_filling_allocation(references, capacities)
+    assert np.allclose(allocations.sum(axis=1), references)
+    for r, c, a in zip(references, capacities, allocations):
+        assert np.allclose(a, water_filling_allocation(r, c))
+
+    with pytest.raises(ValueError):
+        WindFarmPowerDistributingController(
+            interface=test_interface,
+            input_dict=test_hercules_dict,
+            distribution_mode="unknown_mode",
+        )
+
 def test_WindFarmPowerTrackingController():
     test_interface = HerculesADInterface(test_hercules_dict)
     test_controller = WindFarmPowerTrackingController(
@@ -269,6 +413,64 @@ def test_WindFarmPowerTrackingController():
     )
     assert (test_power_setpoints_a < test_power_setpoints).all()
 
+def test_WindFarmPowerTrackingController_integral_and_saturation():
+    test_interface = StandinInterface()
+    test_controller = WindFarmPowerTrackingController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        proportional_gain=1,
+        integral_gain=0.5,
+    )
+
+    # Integral action accumulates a persistent error
+    out_0 = test_controller.turbine_power_references(
+        farm_power_reference=1000, turbine_powers=[400, 400]
+    )
+    out_1 = test_controller.turbine_power_references(
+        farm_power_reference=1000, turbine_powers=[400, 400]
+    )
+    assert (np.array(out_1["power_setpoints"]) > np.array(out_0["power_setpoints"])).all()
+    assert test_controller.u_i_prev > 0
+
+    # Saturated turbine is held at its available power, correction goes to the other turbine
+    test_controller = WindFarmPowerTrackingController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        proportional_gain=1,
+    )
+    out = test_controller.turbine_power_references(
+        farm_power_reference=1000,
+        turbine_powers=[300, 500],
+        turbine_available_powers=[300, 2000],
+    )
+    assert test_controller.n_saturated == 1
+    assert np.allclose(out["power_setpoints"], [300, 500 + 200])
+
+    # No saturation if farm is over-producing
+    out = test_controller.turbine_power_references(
+        farm_power_reference=600,
+        turbine_powers=[300, 500],
+        turbine_available_powers=[300, 2000],
+    )
+    assert test_controller.n_saturated == 0
+    assert np.allclose(out["power_setpoints"], [200, 400])
+
+    # Anti-windup: integrator held when all turbines are saturated
+    test_controller = WindFarmPowerTrackingController(
+        interface=test_interface,
+        input_dict=test_hercules_dict,
+        integral_gain=0.5,
+    )
+    for _ in range(3):
+        out = test_controller.turbine_power_references(
+            farm_power_reference=1000,
+            turbine_powers=[300, 300],
+            turbine_available_powers=[300, 300],
+        )
+    assert test_controller.n_saturated == 2
+    assert test_controller.u_i_prev == 0
+    assert np.allclose(out["power_setpoints"], [300, 300])
+
 def test_HybridSupervisoryControllerBaseline():
     test_interface = HerculesHybridADInterface(test_hercules_dict)
 
@@ -527,6 +729,85 @@ def test_HybridSupervisoryControllerMultiRef():
         ]
     )  # Check individual components producing according to their references
 
+def test_HybridSupervisoryControllerMPC():
+    test_hercules_v2_dict_temp = copy.deepcopy(test_hercules_v2_dict)
+    test_interface = HerculesInterface(test_hercules_v2_dict_temp)
+
+    def build_controller(controller_parameters={}):
+        return HybridSupervisoryControllerMPC(
+            interface=test_interface,
+            input_dict=test_hercules_v2_dict_temp,
+            wind_controller=WindFarmPowerTrackingController(
+                test_interface, test_hercules_v2_dict_temp
+            ),
+            solar_controller=SolarPassthroughController(test_interface, test_hercules_v2_dict_temp),
+            battery_controller=BatteryPassthroughController(
+                test_interface, test_hercules_v2_dict_temp
+            ),
+            controller_parameters=controller_parameters,
+        )
+
+    test_controller = build_controller({"solve_time_budget": 1.0})
+    test_hercules_v2_dict_temp["external_signals"]["wind_power_forecast_0"] = 6000.0
+    test_hercules_v2_dict_temp["external_signals"]["solar_power_forecast_0"] = 800.0
+
+    # Reference within available power: tracked using wind, solar and battery
+    for power_ref in [3000.0, 5000.0, 9000.0]:
+        test_hercules_v2_dict_temp["external_signals"]["plant_power_reference"] = power_ref
+        test_controller.step(test_hercules_v2_dict_temp)
+        wind_ref, solar_ref, battery_ref = test_controller.supervisory_control(
+            test_controller._measurements_dict
+        )
+        assert test_controller.solve_converged
+        assert np.isclose(wind_ref + solar_ref + battery_ref, power_ref, rtol=1e-2)
+        assert -1 <= wind_ref <= 6000.0 + 1
+        assert -1 <= solar_ref <= 800.0 + 1
+        assert -20e3 - 1 <= battery_ref <= 15e3 + 1
+    assert test_controller.n_fallbacks == 0
+
+    # Reference above the interconnect limit: limited
+    test_hercules_v2_dict_temp["external_signals"]["plant_power_reference"] = 20000.0
+    test_controller.step(test_hercules_v2_dict_temp)
+    output = test_controller.supervisory_control(test_controller._measurements_dict)
+    assert test_controller.solve_converged
+    assert sum(output) <= 10000.0 * (1 + 1e-3)
+
+    # Unconverged solves fall back on the baseline logic
+    test_controller = build_controller({"max_iterations": 1})
+    baseline_controller = HybridSupervisoryControllerBaseline(
+        interface=test_interface,
+        input_dict=test_hercules_v2_dict_temp,
+        wind_controller=test_controller.wind_controller,
+        solar_controller=test_controller.solar_controller,
+        battery_controller=test_controller.battery_controller,
+    )
+    measurements_dict = test_interface.get_measurements(test_hercules_v2_dict_temp)
+    output = test_controller.supervisory_control(measurements_dict)
+    assert test_controller.n_fallbacks == 1
+    assert not test_controller.solve_converged
+    assert np.allclose(output, baseline_controller.supervisory_control(measurements_dict))
+
+    # Without a forecast buffer from the interface, leads dropped from the forecast dictionary
+    # are not used at later steps
+    test_controller = build_controller({"solve_time_budget": 1.0})
+    measurements_dict = test_interface.get_measurements(test_hercules_v2_dict_temp)
+    del measurements_dict["forecast_buffer"]
+    measurements_dict["forecast"] = {
+        "wind_power_forecast_0": 6000.0, "wind_power_forecast_1": 2000.0
+    }
+    test_controller.supervisory_control(measurements_dict)
+    wind_forecast = test_controller._horizon_values(
+        test_controller._forecast_buffer, "wind_power", 6000.0
+    )
+    assert wind_forecast[1] == 2000.0
+    measurements_dict["forecast"] = {"wind_power_forecast_0": 6000.0}
+    test_controller.supervisory_control(measurements_dict)
+    assert np.isnan(test_controller._forecast_buffer.horizon("wind_power")[1])
+    wind_forecast = test_controller._horizon_values(
+        test_controller._forecast_buffer, "wind_power", 6000.0
+    )
+    assert np.all(wind_forecast == 6000.0)
+
 def test_BatteryPassthroughController():
     test_interface = HerculesHybridADInterface(test_hercules_dict)
     test_controller = BatteryPassthroughController(test_interface, test_hercules_dict)
@@ -761,3 +1042,159 @@ def test_HydrogenPlantController():
         generator_controller=hybrid_controller,
         controller_parameters=external_controller_parameters
     )
+
+def test_controller_replay():
+    """
+    Tests that replaying controllers over columnar time series matches
+    stepping through compute_controls.
+    """
+    test_interface = HerculesHybridADInterface(test_hercules_dict)
+    rng = np.random.default_rng(0)
+    n_steps = 50
+
+    # Stateless controllers
+    measurements_timeseries = {
+        "time": np.arange(n_steps, dtype=float),
+        "solar_farm": {"power_reference": rng.uniform(0, 1000, n_steps)},
+        "battery": {"power_reference": rng.uniform(-1000, 1000, n_steps)},
+        "wind_farm": {
+            "power_reference": rng.uniform(0, 4000, n_steps),
+            "turbine_powers": rng.uniform(0, 2000, (n_steps, 2)),
+            "turbine_available_powers": rng.uniform(0, 3000, (n_steps, 2)),
+        },
+    }
+    test_controllers = [
+        SolarPassthroughController(test_interface, test_hercules_dict),
+        BatteryPassthroughController(test_interface, test_hercules_dict),
+        WindFarmPowerDistributingController(test_interface, test_hercules_dict),
+        WindFarmPowerDistributingController(
+            test_interface, test_hercules_dict, distribution_mode="available_power"
+        ),
+    ]
+    for test_controller in test_controllers:
+        controls_timeseries = test_controller.replay(measurements_timeseries)
+        for k in range(n_steps):
+            controls_dict = test_controller.compute_controls(
+                timeseries_step(measurements_timeseries, k)
+            )
+            for key, value in controls_dict.items():
+                assert np.allclose(controls_timeseries[key][k], value)
+
+    # Stateful controllers
+    measurements_timeseries["battery"]["power"] = rng.uniform(-1000, 1000, n_steps)
+    measurements_timeseries["battery"]["state_of_charge"] = rng.uniform(0, 1, n_steps)
+    test_controller_replay = BatteryController(
+        test_interface, test_hercules_dict, {"clipping_thresholds": [0.1, 0.2, 0.8, 0.9]}
+    )
+    test_controller_step = BatteryController(
+        test_interface, test_hercules_dict, {"clipping_thresholds": [0.1, 0.2, 0.8, 0.9]}
+    )
+    controls_timeseries = test_controller_replay.replay(measurements_timeseries)
+    controls_step = [
+        test_controller_step.compute_controls(timeseries_step(measurements_timeseries, k))
+        ["power_setpoint"] for k in range(n_steps)
+    ]
+    assert np.allclose(controls_timeseries["power_setpoint"], controls_step)
+    assert test_controller_replay.x == test_controller_step.x
+
+    # Generic scan for a stateful controller without a dedicated replay method
+    del measurements_timeseries["wind_farm"]["turbine_available_powers"]
+    test_controller_replay = WindFarmPowerTrackingController(
+        test_interface, test_hercules_dict, integral_gain=0.1
+    )
+    test_controller_step = WindFarmPowerTrackingController(
+        test_interface, test_hercules_dict, integral_gain=0.1
+    )
+    controls_timeseries = test_controller_replay.replay(measurements_timeseries)
+    assert controls_timeseries["power_setpoints"].shape == (n_steps, 2)
+    controls_step = [
+        test_controller_step.compute_controls(timeseries_step(measurements_timeseries, k))
+        ["power_setpoints"] for k in range(n_steps)
+    ]
+    assert np.allclose(controls_timeseries["power_setpoints"], controls_step)
+
+    # Hydrogen plant controller, replayed through the wind controller
+    measurements_timeseries = {
+        "time": np.arange(n_steps, dtype=float),
+        "total_power": rng.uniform(0, 4000, n_steps),
+        "wind_farm": {"turbine_powers": rng.uniform(0, 2000, (n_steps, 2))},
+        "hydrogen": {
+            "production_rate": rng.uniform(0, 0.05, n_steps),
+            "power_reference": 0.03,
+        },
+    }
+    hydrogen_parameters = {
+        "nominal_plant_power_kW": 10000,
+        "nominal_hydrogen_rate_kgps": 0.1,
+    }
+    test_controllers = [
+        HydrogenPlantController(
+            test_interface,
+            {"dt": 1, "controller": hydrogen_parameters},
+            generator_controller=WindFarmPowerTrackingController(
+                test_interface, test_hercules_dict
+            )
+        ) for _ in range(2)
+    ]
+    controls_timeseries = test_controllers[0].replay(measurements_timeseries)
+    controls_step = [
+        test_controllers[1].compute_controls(timeseries_step(measurements_timeseries, k))
+        ["wind_power_setpoints"] for k in range(n_steps)
+    ]
+    assert np.allclose(controls_timeseries["wind_power_setpoints"], controls_step)
+    assert test_controllers[0].filtered_power_prev == test_controllers[1].filtered_power_prev
+
+def test_BatteryController_power_setpoint_timeseries():
+    test_interface = HerculesBatteryInterface(test_hercules_dict)
+    rng = np.random.default_rng(1)
+    n_steps = 1000
+    reference_power = rng.uniform(-20000, 20000, n_steps)
+    current_power = rng.uniform(-20000, 20000, n_steps)
+    soc = rng.uniform(0, 1, n_steps)
+
+    test_controller_filter = BatteryController(
+        test_interface, test_hercules_dict, {"clipping_thresholds": [0.1, 0.2, 0.8, 0.9]}
+    )
+    test_controller_step = BatteryController(
+        test_interface, test_hercules_dict, {"clipping_thresholds": [0.1, 0.2, 0.8, 0.9]}
+    )
+    test_controller_filter.x = 10.0
+    test_controller_step.x = 10.0
+
+    # Applied in two passes to check that the internal state carries over
+    power_setpoints = np.concatenate([
+        test_controller_filter.power_setpoint_timeseries(
+            reference_power[:500], current_power[:500], soc[:500]
+        ),
+        test_controller_filter.power_setpoint_timeseries(
+            reference_power[500:], current_power[500:], soc[500:]
+        ),
+    ])
+    power_setpoints_step = [
+        test_controller_step.compute_controls({
+            "battery": {
+                "power_reference": reference_power[k],
+                "power": current_power[k],
+                "state_of_charge": soc[k],
+            }
+        })["power_setpoint"] for k in range(n_steps)
+    ]
+
+    assert np.array_equal(power_setpoints, power_setpoints_step)
+    assert test_controller_filter.x == test_controller_step.x
+
+def test_lazy_imports():
+    # Controllers are imported on first access, loading only their own dependencies
+    statement = (
+        "import sys; from hycon.controllers import BatteryController, HydrogenPlantController; "
+        "print(','.join(m for m in ['floris', 'pandas', 'scipy'] if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", statement], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+    import hycon.controllers
+    assert "BatteryController" in dir(hycon.controllers)
+    with pytest.raises(AttributeError):
+        hycon.controllers.NotAController
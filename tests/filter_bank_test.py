@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from hycon.controllers.filter_bank import FilterBank
+
+
+def test_FilterBank_first_order():
+    filter_bank = FilterBank(dt=0.5)
+    filter_bank.add_filter("a", "first_order", alpha=0.1)
+    filter_bank.add_filter("b", "first_order", size=3, time_constant=2.0, initial_value=[1, 2, 3])
+
+    assert filter_bank.state("a") == 0.0
+    assert np.allclose(filter_bank.state("b"), [1, 2, 3])
+
+    filtered = filter_bank.update({"a": 10.0, "b": np.zeros(3)})
+    assert filtered["a"] == 0.9*0.0 + 0.1*10.0
+    assert np.allclose(filtered["b"], np.exp(-0.25) * np.array([1, 2, 3]))
+
+    # Filters not updated are held
+    filtered = filter_bank.update({"a": 10.0})
+    assert "b" not in filtered
+    assert np.allclose(filter_bank.state("b"), np.exp(-0.25) * np.array([1, 2, 3]))
+
+    with pytest.raises(ValueError):
+        filter_bank.add_filter("c", "first_order")
+    with pytest.raises(KeyError):
+        filter_bank.add_filter("a", "first_order", alpha=0.1)
+    with pytest.raises(ValueError):
+        filter_bank.add_filter("c", "third_order")
+
+def test_FilterBank_second_order():
+    filter_bank = FilterBank(dt=0.01)
+    filter_bank.add_filter("a", "second_order", natural_frequency=2.0, damping_ratio=0.5)
+    filter_bank.add_filter("b", "second_order", natural_frequency=2.0, initial_value=5.0)
+
+    # Steady state is maintained
+    for _ in range(10):
+        filtered = filter_bank.update({"a": 0.0, "b": 5.0})
+    assert filtered["a"] == 0.0
+    assert np.isclose(filtered["b"], 5.0)
+
+    # Underdamped step response overshoots and settles at the input
+    step_response = np.array([filter_bank.update({"a": 1.0})["a"] for _ in range(2000)])
+    assert step_response.max() > 1.1
+    assert np.isclose(step_response[-1], 1.0, atol=1e-3)
+
+    # Time series filtering matches stepwise filtering
+    filter_bank_timeseries = FilterBank(dt=0.01)
+    filter_bank_timeseries.add_filter("a", "second_order", natural_frequency=2.0, damping_ratio=0.5)
+    step_input = np.concatenate([np.zeros(10), np.ones(2000)])
+    assert np.allclose(
+        filter_bank_timeseries.filter_timeseries("a", step_input),
+        np.concatenate([np.zeros(10), step_response])
+    )
+
+def test_FilterBank_moving_average():
+    filter_bank = FilterBank(dt=0.5)
+    filter_bank.add_filter("a", "moving_average", window=2.0)
+    filter_bank.add_filter("b", "moving_average", window=1.0, size=2, initial_value=1.0)
+
+    filtered = [filter_bank.update({"a": float(k), "b": [k, 2*k]}) for k in range(1, 7)]
+    assert np.allclose([f["a"] for f in filtered], [0.25, 0.75, 1.5, 2.5, 3.5, 4.5])
+    assert np.allclose(filtered[0]["b"], [1.0, 1.5])
+    assert np.allclose(filtered[-1]["b"], [5.5, 11.0])
+
+    filter_bank.set_state("a", 2.0)
+    assert filter_bank.state("a") == 2.0
+    assert np.allclose(filter_bank.filter_timeseries("a", [2.0, 6.0, 6.0]), [2.0, 3.0, 4.0])
+
+def test_FilterBank_held_filters():
+    # Filters held during an update, or while another filter is run over a time series, match
+    # filters that were never held
+    def make_bank(names):
+        filter_bank = FilterBank(dt=0.5)
+        if "ma" in names:
+            filter_bank.add_filter("ma", "moving_average", window=2.0, size=2)
+        if "so" in names:
+            filter_bank.add_filter("so", "second_order", natural_frequency=1.0)
+        if "fo" in names:
+            filter_bank.add_filter("fo", "first_order", alpha=0.3)
+        if "ma_other" in names:
+            filter_bank.add_filter("ma_other", "moving_average", window=1.5)
+        return filter_bank
+
+    names = ["ma", "so", "fo", "ma_other"]
+    held_bank = make_bank(names)
+    reference_banks = {name: make_bank([name]) for name in names}
+    rng = np.random.default_rng(0)
+    inputs = [
+        {"ma": rng.normal(size=2), "so": rng.normal(), "fo": rng.normal(),
+         "ma_other": rng.normal()}
+        for _ in range(6)
+    ]
+    for k, measurements in enumerate(inputs):
+        held_bank.update(measurements)
+        for name in names:
+            reference_banks[name].update({name: measurements[name]})
+
+        # Held step, updating only one filter
+        held_name = names[k % len(names)]
+        held_bank.update({held_name: 1.0})
+        reference_banks[held_name].update({held_name: 1.0})
+
+        # Time series filtering of another filter
+        held_bank.filter_timeseries("ma_other", [2.0, 3.0])
+        reference_banks["ma_other"].filter_timeseries("ma_other", [2.0, 3.0])
+
+        for name in names:
+            assert np.allclose(held_bank.state(name), reference_banks[name].state(name))
+
+    # The full moving average history survives held steps
+    assert np.allclose(
+        held_bank.update({"ma": [0.0, 0.0]})["ma"],
+        reference_banks["ma"].update({"ma": [0.0, 0.0]})["ma"]
+    )
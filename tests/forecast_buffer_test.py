@@ -0,0 +1,82 @@
+import copy
+
+import numpy as np
+import pytest
+from hycon.interfaces import ForecastBuffer, HerculesInterface
+from hycon.interfaces.forecast_buffer import parse_forecast_key
+
+from tests.hercules_interface_test import test_hercules_dict
+
+
+def test_parse_forecast_key():
+    assert parse_forecast_key("wind_power_forecast_3") == ("wind_power", 3)
+    assert parse_forecast_key("forecast_ws_mean_0") == ("ws_mean", 0)
+    assert parse_forecast_key("forecast_ws_mean") is None
+    assert parse_forecast_key("plant_power_reference") is None
+
+def test_ForecastBuffer_update():
+    forecast_buffer = ForecastBuffer()
+    forecast_buffer.update({"a_forecast_0": 1.0, "a_forecast_2": 3.0, "forecast_b_0": 5.0})
+    assert forecast_buffer.signals == ["a", "b"]
+    assert "a" in forecast_buffer
+    assert np.allclose(forecast_buffer.horizon("a"), [1.0, np.nan, 3.0], equal_nan=True)
+    assert np.allclose(forecast_buffer.horizon("b"), [5.0])
+
+    # Horizons are read-only views into the buffer
+    view = forecast_buffer.horizon("a")
+    forecast_buffer.update({"a_forecast_1": 2.0})
+    assert np.allclose(view, [1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        view[0] = 0.0
+
+    # Longer horizons extend the storage
+    forecast_buffer.update({"a_forecast_4": 5.0})
+    assert np.allclose(forecast_buffer.horizon("a"), [1.0, 2.0, 3.0, np.nan, 5.0], equal_nan=True)
+
+    with pytest.raises(KeyError):
+        forecast_buffer.horizon("c")
+
+def test_ForecastBuffer_advance():
+    forecast_buffer = ForecastBuffer(horizons={"a": 4})
+    forecast_buffer.update({"a_forecast_{:d}".format(k): float(k) for k in range(4)})
+
+    forecast_buffer.advance()
+    assert np.allclose(forecast_buffer.horizon("a"), [1.0, 2.0, 3.0, 3.0])
+    forecast_buffer.update({"a_forecast_3": 4.0})
+    assert np.allclose(forecast_buffer.horizon("a"), [1.0, 2.0, 3.0, 4.0])
+
+    # Wraps around the ring buffer, with views remaining contiguous
+    forecast_buffer.advance(3)
+    assert np.allclose(forecast_buffer.horizon("a"), [4.0, 4.0, 4.0, 4.0])
+    assert forecast_buffer.horizon("a").base is not None
+
+    forecast_buffer.clear()
+    assert np.isnan(forecast_buffer.horizon("a")).all()
+
+def test_HerculesInterface_forecast_buffer():
+    test_hercules_dict_temp = copy.deepcopy(test_hercules_dict)
+    interface = HerculesInterface(test_hercules_dict_temp)
+
+    measurements = interface.get_measurements(test_hercules_dict_temp)
+    assert measurements["forecast_buffer"] is interface.forecast_buffer
+    assert np.allclose(measurements["forecast_buffer"].horizon("ws_mean"), [8.0, 8.1])
+
+    test_hercules_dict_temp["external_signals"]["forecast_ws_mean_1"] = 9.0
+    measurements = interface.get_measurements(test_hercules_dict_temp)
+    assert np.allclose(measurements["forecast_buffer"].horizon("ws_mean"), [8.0, 9.0])
+
+    # Leads no longer provided are reset, rather than holding stale values
+    del test_hercules_dict_temp["external_signals"]["forecast_ws_mean_1"]
+    measurements = interface.get_measurements(test_hercules_dict_temp)
+    assert measurements["forecast_buffer"].horizon("ws_mean")[0] == 8.0
+    assert np.isnan(measurements["forecast_buffer"].horizon("ws_mean")[1])
+
+def test_ForecastBuffer_update_replace():
+    forecast_buffer = ForecastBuffer()
+    forecast_buffer.update({"a_forecast_{:d}".format(k): float(k) for k in range(4)})
+    forecast_buffer.update({"a_forecast_0": 5.0, "a_forecast_1": 6.0})
+    assert np.allclose(forecast_buffer.horizon("a"), [5.0, 6.0, 2.0, 3.0])
+
+    forecast_buffer.update({"a_forecast_0": 7.0, "a_forecast_1": 8.0}, replace=True)
+    assert np.allclose(forecast_buffer.horizon("a")[:2], [7.0, 8.0])
+    assert np.isnan(forecast_buffer.horizon("a")[2:]).all()
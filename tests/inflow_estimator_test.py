@@ -0,0 +1,66 @@
+import copy
+
+import numpy as np
+import pytest
+from hycon.interfaces import HerculesInterface
+from hycon.interfaces.inflow_estimator import InflowEstimator
+
+from tests.hercules_interface_test import test_hercules_dict
+
+
+def test_InflowEstimator():
+    inflow_estimator = InflowEstimator(n_turbines=2, window_length=3)
+
+    # Partially filled window averages all measurements received; circular mean across 0/360
+    wd, ws = inflow_estimator.update([350.0, 90.0], [8.0, 10.0])
+    assert np.allclose(wd, [350.0, 90.0])
+    assert np.allclose(ws, [8.0, 10.0])
+    wd, ws = inflow_estimator.update([10.0, 90.0], 12.0)
+    assert np.allclose(wd, [0.0, 90.0])
+    assert np.allclose(ws, [10.0, 11.0])
+
+    # Oldest measurements drop out of the window
+    measurements = [(20.0, 6.0), (30.0, 9.0), (40.0, 12.0)]
+    for wd_k, ws_k in measurements:
+        wd, ws = inflow_estimator.update(wd_k, ws_k)
+    assert np.allclose(wd, 30.0)
+    assert np.allclose(ws, 9.0)
+    assert np.array_equal(inflow_estimator.wind_directions, wd)
+
+    # Long runs match direct computation
+    rng = np.random.default_rng(0)
+    wd_series = 360.0 * rng.random((100, 2))
+    for wd_k in wd_series:
+        wd, ws = inflow_estimator.update(wd_k, 8.0)
+    wd_rad = np.deg2rad(wd_series[-3:])
+    wd_direct = np.rad2deg(np.arctan2(np.sin(wd_rad).sum(0), np.cos(wd_rad).sum(0))) % 360.0
+    assert np.allclose(wd, wd_direct)
+
+    with pytest.raises(ValueError):
+        InflowEstimator(n_turbines=2, window_length=0)
+
+def test_HerculesInterface_inflow_estimation():
+    h_dict = copy.deepcopy(test_hercules_dict)
+    h_dict["wind_farm"]["turbine_wind_directions"] = [355.0, 270.0]
+    h_dict["wind_farm"]["turbine_wind_speeds"] = [9.0, 11.0]
+
+    # Without an inflow window, measurements are passed through
+    interface = HerculesInterface(h_dict=h_dict)
+    measurements = interface.get_measurements(h_dict=h_dict)
+    assert measurements["wind_farm"]["wind_directions"] == [355.0, 270.0]
+    assert measurements["wind_farm"]["wind_speeds"] == [9.0, 11.0]
+
+    # Farm-wide values are applied to all turbines if per-turbine values are not available
+    measurements = interface.get_measurements(h_dict=test_hercules_dict)
+    assert measurements["wind_farm"]["wind_speeds"] == [10.0, 10.0]
+
+    # Inflow window of 2 s (2 time steps)
+    interface = HerculesInterface(h_dict=h_dict, inflow_window=2.0)
+    assert interface.inflow_estimator.window_length == 2
+    interface.get_measurements(h_dict=h_dict)
+    h_dict["wind_farm"]["turbine_wind_directions"] = [5.0, 280.0]
+    h_dict["wind_farm"]["turbine_wind_speeds"] = [11.0, 13.0]
+    measurements = interface.get_measurements(h_dict=h_dict)
+    assert np.allclose(measurements["wind_farm"]["wind_directions"], [0.0, 275.0])
+    assert np.allclose(measurements["wind_farm"]["wind_speeds"], [10.0, 12.0])
+    assert isinstance(measurements["wind_farm"]["wind_directions"], list)
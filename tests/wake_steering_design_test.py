@@ -1,18 +1,28 @@
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import pytest
 from floris import FlorisModel
+from hycon.angles import in_sector
 from hycon.design_tools.wake_steering_design import (
     apply_static_rate_limits,
     apply_wind_speed_ramps,
+    apply_wind_speed_ramps_dense,
+    build_adaptive_wake_steering_lookup_table,
     build_simple_wake_steering_lookup_table,
     build_uncertain_wake_steering_lookup_table,
+    build_uncertain_wake_steering_lookup_table_sweep,
     check_df_opt_ordering,
     compute_hysteresis_zones,
     consolidate_hysteresis_zones,
     create_uniform_wind_rose,
+    get_sparse_yaw_angles_interpolant,
     get_yaw_angles_interpolant,
+    get_yaw_angles_interpolant_from_grid,
+    HysteresisZoneIndex,
+    quantization_error_report,
+    SparseYawOffsetTable,
 )
 
 TEST_DATA = Path(__file__).resolve().parent
@@ -168,6 +178,83 @@ def test_build_uncertain_wake_steering_lookup_table():
     )
     assert not np.allclose(df_opt_uncertain.farm_power_opt, df_opt_uncertain_fixed.farm_power_opt)
 
+def test_build_uncertain_wake_steering_lookup_table_sweep():
+    fmodel_test = FlorisModel(YAML_INPUT)
+    kwargs = {"wd_resolution": 2.0, "wd_min": 250.0, "wd_max": 290.0, "ws_max": 9.0,
+              "minimum_yaw_angle": -25, "maximum_yaw_angle": 25}
+    df_opts = build_uncertain_wake_steering_lookup_table_sweep(
+        fmodel_test, [3.0, 6.0], n_processes=1, **kwargs
+    )
+    assert list(df_opts.keys()) == [3.0, 6.0]
+    check_df_opt_ordering(df_opts[3.0])
+    assert len(df_opts[3.0]) == 21 * 2
+
+    # Expected power matches or improves on that of the direct uncertain optimization
+    df_opt_uncertain = build_uncertain_wake_steering_lookup_table(
+        fmodel_test, wd_std=3.0, **kwargs
+    )
+    assert np.allclose(df_opts[3.0].farm_power_baseline, df_opt_uncertain.farm_power_baseline)
+    assert df_opts[3.0].farm_power_opt.sum() > 0.999 * df_opt_uncertain.farm_power_opt.sum()
+    assert np.all(df_opts[3.0].farm_power_opt >= df_opts[3.0].farm_power_baseline)
+
+    # Greater uncertainty reduces the offsets
+    max_offsets = {
+        wd_std: np.abs(np.vstack(df_opt.yaw_angles_opt.values)).max()
+        for wd_std, df_opt in df_opts.items()
+    }
+    assert max_offsets[6.0] < max_offsets[3.0]
+
+    # Parallel evaluation in chunks gives the same result
+    df_opts_parallel = build_uncertain_wake_steering_lookup_table_sweep(
+        fmodel_test, [3.0, 6.0], n_processes=2, chunk_size=100, **kwargs
+    )
+    for wd_std in [3.0, 6.0]:
+        assert np.array_equal(
+            np.vstack(df_opts[wd_std].yaw_angles_opt.values),
+            np.vstack(df_opts_parallel[wd_std].yaw_angles_opt.values)
+        )
+
+    with pytest.raises(ValueError):
+        build_uncertain_wake_steering_lookup_table_sweep(fmodel_test, [0.0], **kwargs)
+
+def test_build_adaptive_wake_steering_lookup_table():
+    fmodel_test = FlorisModel(YAML_INPUT)
+    df_opt_adaptive = build_adaptive_wake_steering_lookup_table(
+        fmodel_test,
+        wd_resolution_coarse=8.0,
+        wd_resolution_fine=2.0,
+        wd_min=222.0,
+        wd_max=318.0,
+        ws_min=8.0,
+        ws_max=9.0,
+        minimum_yaw_angle=-20,
+        maximum_yaw_angle=20,
+    )
+    df_opt_fine = generic_df_opt(
+        wd_resolution=2.0, wd_min=222.0, wd_max=318.0, ws_min=8.0, ws_max=9.0, ws_resolution=1.0,
+        ti_max=0.06
+    )
+
+    # Table is refined only around the switching point at 270 degrees, and can be used to
+    # build an interpolant
+    wind_directions = np.unique(df_opt_adaptive.wind_direction)
+    assert len(wind_directions) < len(np.unique(df_opt_fine.wind_direction))
+    assert np.all(np.isin(np.arange(222.0, 319.0, 8.0), wind_directions))
+    assert 266.0 in wind_directions and 268.0 in wind_directions
+    assert 226.0 not in wind_directions
+    yaw_interpolant = get_yaw_angles_interpolant(df_opt_adaptive)
+
+    # Offsets match those of a uniform fine table at the table wind directions
+    df_opt_fine_subset = df_opt_fine[df_opt_fine.wind_direction.isin(wind_directions)]
+    assert np.allclose(
+        np.vstack(df_opt_adaptive.yaw_angles_opt.values),
+        np.vstack(df_opt_fine_subset.yaw_angles_opt.values)
+    )
+    assert np.allclose(
+        yaw_interpolant(wind_directions, 8.0*np.ones_like(wind_directions), None),
+        np.vstack(df_opt_fine_subset[df_opt_fine_subset.wind_speed == 8.0].yaw_angles_opt.values)
+    )
+
 def test_apply_static_rate_limits():
     eps = 1e-4
 
@@ -212,6 +299,84 @@ def test_apply_static_rate_limits():
     assert not (np.abs(np.diff(offsets_unlimited, axis=1)) <= ws_rate_limit*ws_resolution).all()
     assert not (np.abs(np.diff(offsets_unlimited, axis=2)) <= ti_rate_limit*ti_resolution).all()
 
+def test_non_uniform_grids():
+    # Non-uniform wind directions, finer around the switching point at 270 degrees
+    fmodel_test = FlorisModel(YAML_INPUT)
+    wind_directions = np.array([220.0, 240.0, 260.0, 266.0, 268.0, 269.0, 270.0, 271.0, 272.0,
+                                274.0, 280.0, 300.0, 320.0])
+    df_opt = build_simple_wake_steering_lookup_table(
+        fmodel_test,
+        wind_directions=wind_directions,
+        minimum_yaw_angle=-20,
+        maximum_yaw_angle=20,
+    )
+    assert np.array_equal(np.unique(df_opt.wind_direction), wind_directions)
+    check_df_opt_ordering(df_opt)
+
+    # Rate limits apply per unit change in wind direction
+    wd_rate_limit = 4.0
+    df_opt_rate_limited = apply_static_rate_limits(df_opt, wd_rate_limit=wd_rate_limit)
+    offsets_limited = np.vstack(df_opt_rate_limited.yaw_angles_opt.values)
+    assert (
+        np.abs(np.diff(offsets_limited, axis=0))
+        <= wd_rate_limit*np.diff(wind_directions)[:, None]+1e-4
+    ).all()
+
+    # Hysteresis zone is centered between the wind directions either side of the jump
+    hysteresis_dict = compute_hysteresis_zones(df_opt, min_zone_width=2.0)
+    assert hysteresis_dict == {"T000": [(268.5, 270.5)]}
+
+    # Ramps to non-uniform wind speeds, and interpolant
+    wind_speeds = np.array([0.0, 3.0, 4.0, 5.0, 8.0, 10.0, 11.5, 13.0, 25.0])
+    df_opt_ramps = apply_wind_speed_ramps(df_opt, wind_speeds=wind_speeds)
+    assert np.array_equal(np.unique(df_opt_ramps.wind_speed), wind_speeds)
+    offsets = np.vstack(df_opt.yaw_angles_opt.values)
+    _, _, _, offsets_dense = apply_wind_speed_ramps_dense(df_opt, wind_speeds=wind_speeds)
+    assert np.allclose(offsets_dense[:, 2, 0, :], 0.5*offsets[:, :])
+    assert np.allclose(offsets_dense[:, 6, 0, :], 0.5*offsets[:, :])
+    yaw_interpolant = get_yaw_angles_interpolant_from_grid(
+        wind_directions, wind_speeds, [0.06], offsets_dense
+    )
+    assert np.allclose(yaw_interpolant(271.0, 4.5, 0.06), 0.75*offsets[7, :])
+
+    # Unsorted or repeated wind conditions are rejected before optimizing
+    with pytest.raises(ValueError):
+        build_simple_wake_steering_lookup_table(fmodel_test, wind_directions=[270.0, 260.0])
+    with pytest.raises(ValueError):
+        build_uncertain_wake_steering_lookup_table(
+            fmodel_test, wd_std=3.0, wind_speeds=[8.0, 8.0]
+        )
+    with pytest.raises(ValueError):
+        build_uncertain_wake_steering_lookup_table_sweep(
+            fmodel_test, [3.0], turbulence_intensities=[0.08, 0.06]
+        )
+
+def test_compute_hysteresis_zones_wrapping():
+    def df_opt_from_offsets(wind_directions, offsets):
+        return pd.DataFrame({
+            "wind_direction": wind_directions,
+            "wind_speed": 8.0,
+            "turbulence_intensity": 0.06,
+            "yaw_angles_opt": [np.array([o]) for o in offsets],
+        })
+
+    # Full wind rose wraps, with a jump in offset between the last and first wind directions
+    wind_directions = np.arange(0.0, 360.0, 10.0)
+    offsets = np.where(wind_directions > 180.0, 20.0, -20.0)
+    offsets[(wind_directions > 90.0) & (wind_directions < 270.0)] = 0.0
+    hysteresis_dict = compute_hysteresis_zones(
+        df_opt_from_offsets(wind_directions, offsets), yaw_rate_threshold=3.0
+    )
+    assert hysteresis_dict == {"T000": [(354.0, 356.0)]}
+
+    # Partial wind rose, with a coarse step between 150 and 270 degrees, does not wrap
+    wind_directions = np.concatenate([np.arange(30.0, 151.0, 10.0), np.arange(270.0, 331.0, 10.0)])
+    offsets = np.where(wind_directions > 180.0, 20.0, -20.0)
+    hysteresis_dict = compute_hysteresis_zones(
+        df_opt_from_offsets(wind_directions, offsets), yaw_rate_threshold=0.5
+    )
+    assert hysteresis_dict == {}
+
 def test_apply_wind_speed_ramps():
 
     ws_specified = 8.0
@@ -252,6 +417,44 @@ def test_apply_wind_speed_ramps():
         )/2
     )
 
+def test_apply_wind_speed_ramps_dense(tmp_path):
+    df_opt_single_ws = generic_df_opt(ws_min=8.0, ws_max=8.0)
+    df_opt_ramps = apply_wind_speed_ramps(df_opt_single_ws, ws_resolution=0.5)
+
+    # Matches apply_wind_speed_ramps (which is ordered by wind speed first)
+    wind_directions, wind_speeds, turbulence_intensities, offsets = apply_wind_speed_ramps_dense(
+        df_opt_single_ws, ws_resolution=0.5, chunk_size=7
+    )
+    assert offsets.shape == (len(wind_directions), len(wind_speeds), 2, 2)
+    offsets_ramps = np.vstack(df_opt_ramps.yaw_angles_opt.values).reshape(
+        len(wind_speeds), len(wind_directions), 2, 2
+    )
+    assert np.allclose(offsets, offsets_ramps.transpose(1, 0, 2, 3))
+
+    # Output to a memory-mapped, lower precision array
+    out = np.lib.format.open_memmap(
+        tmp_path / "offsets.npy", mode="w+", dtype=np.float32, shape=offsets.shape
+    )
+    _, _, _, offsets_mmap = apply_wind_speed_ramps_dense(
+        df_opt_single_ws, ws_resolution=0.5, out=out
+    )
+    assert offsets_mmap is out
+    assert np.allclose(np.load(tmp_path / "offsets.npy"), offsets, atol=1e-4)
+
+    # Dense table can be used to build an interpolant
+    yaw_interpolant = get_yaw_angles_interpolant_from_grid(
+        wind_directions, wind_speeds, turbulence_intensities, offsets
+    )
+    assert np.allclose(
+        yaw_interpolant(wind_directions[3], wind_speeds[20], turbulence_intensities[1]),
+        offsets[3, 20, 1, :]
+    )
+
+    with pytest.raises(ValueError):
+        apply_wind_speed_ramps_dense(
+            df_opt_single_ws, ws_resolution=0.5, out=np.zeros((1, 1, 1, 1))
+        )
+
 def test_wake_steering_interpolant():
 
     df_opt = generic_df_opt()
@@ -280,6 +483,40 @@ def test_wake_steering_interpolant():
     base = 1.0*temp[0,:] + 0.0*temp[1,:] # ti interp
     assert np.allclose(interpolated_offset, base)
 
+    # Per-turbine lookup matches the diagonal of the full lookup
+    rng = np.random.default_rng(0)
+    wd_turbines = rng.uniform(220.0, 310.0, 2)
+    ws_turbines = rng.uniform(6.0, 12.0, 2) # Includes values outside the table
+    ti_turbines = rng.uniform(0.05, 0.09, 2)
+    assert np.allclose(
+        yaw_interpolant(wd_turbines, ws_turbines, ti_turbines, per_turbine=True),
+        np.diag(yaw_interpolant(wd_turbines, ws_turbines, ti_turbines))
+    )
+    assert np.allclose(
+        yaw_interpolant(wd_turbines, ws_turbines, per_turbine=True),
+        np.diag(yaw_interpolant(wd_turbines, ws_turbines))
+    )
+
+    # Reduced precision tables
+    rng = np.random.default_rng(1)
+    wd_query = rng.uniform(220.0, 308.0, 50)
+    ws_query = rng.uniform(6.0, 12.0, 50)
+    offsets_float64 = yaw_interpolant(wd_query, ws_query, None)
+    for precision, tolerance in [("float32", 1e-5), ("float16", 2e-2), ("int16", 5e-3)]:
+        yaw_interpolant_compact = get_yaw_angles_interpolant(df_opt, precision=precision)
+        assert np.allclose(
+            yaw_interpolant_compact(wd_query, ws_query, None), offsets_float64, atol=tolerance
+        )
+        assert np.allclose(
+            yaw_interpolant_compact(wd_query[:2], ws_query[:2], None, per_turbine=True),
+            np.diag(offsets_float64[:2]),
+            atol=tolerance
+        )
+    assert np.allclose(get_yaw_angles_interpolant(df_opt, precision="int16")(271, 8.25, 0.06),
+                       base, atol=5e-3)
+    with pytest.raises(ValueError):
+        get_yaw_angles_interpolant(df_opt, precision="int8")
+
     # Check extrapolation
     with pytest.raises(ValueError):
         _ = yaw_interpolant(200.0, 8.0, 0.06) # min specified wd is 220
@@ -295,6 +532,80 @@ def test_wake_steering_interpolant():
     with pytest.raises(ValueError):
         _ = yaw_interpolant(361.0, 8.0, 0.06)
 
+def test_sparse_yaw_offset_table():
+    # Offsets are nonzero in a sector around 270 degrees for T000, and in a sector wrapping
+    # around the 0/360 degree point (as well as at a single wind direction) for T001
+    wind_directions = np.arange(0.0, 360.0, 10.0)
+    wind_speeds = np.array([6.0, 8.0, 10.0])
+    turbulence_intensities = np.array([0.06, 0.08])
+    rng = np.random.default_rng(0)
+    yaw_offsets = np.zeros((36, 3, 2, 3))
+    yaw_offsets[25:29, :, :, 0] = rng.uniform(-20.0, 20.0, (4, 3, 2))
+    yaw_offsets[[0, 1, 34, 35], :, :, 1] = rng.uniform(-20.0, 20.0, (4, 3, 2))
+    yaw_offsets[18, 1, 0, 1] = 0.005
+
+    sparse_table = SparseYawOffsetTable(
+        wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
+    )
+    assert sparse_table.sectors == {
+        "T000": [(240.0, 290.0)],
+        "T001": [(0.0, 20.0), (170.0, 190.0), (330.0, 360.0)],
+    }
+    assert sparse_table.nbytes < sparse_table.dense_nbytes
+
+    # Offsets match those of the dense interpolant
+    dense_interpolant = get_yaw_angles_interpolant_from_grid(
+        wind_directions, wind_speeds, turbulence_intensities, yaw_offsets
+    )
+    wd_query = np.concatenate([rng.uniform(0.0, 360.0, 200), [0.0, 180.0, 245.0, 360.0]])
+    ws_query = rng.uniform(4.0, 12.0, len(wd_query))
+    ti_query = rng.uniform(0.05, 0.09, len(wd_query))
+    assert np.allclose(
+        sparse_table(wd_query, ws_query, ti_query),
+        dense_interpolant(wd_query, ws_query, ti_query)
+    )
+    assert np.allclose(
+        sparse_table(wd_query[:3], ws_query[:3], per_turbine=True),
+        dense_interpolant(wd_query[:3], ws_query[:3], per_turbine=True)
+    )
+    assert np.array_equal(sparse_table(100.0, 8.0, 0.06), np.zeros((1, 3)))
+
+    # Small offsets are dropped according to the tolerance
+    sparse_table = SparseYawOffsetTable(
+        wind_directions, wind_speeds, turbulence_intensities, yaw_offsets, tolerance=0.01
+    )
+    assert sparse_table.sectors["T001"] == [(0.0, 20.0), (330.0, 360.0)]
+    assert np.array_equal(sparse_table(180.0, 8.0, 0.06), np.zeros((1, 3)))
+
+    # Built from df_opt, and at reduced precision
+    df_opt = generic_df_opt()
+    yaw_interpolant = get_yaw_angles_interpolant(df_opt)
+    wd_query = rng.uniform(220.0, 308.0, 50)
+    ws_query = rng.uniform(6.0, 12.0, 50)
+    for precision, tolerance in [("float64", 1e-9), ("int16", 5e-3)]:
+        sparse_interpolant = get_sparse_yaw_angles_interpolant(df_opt, precision=precision)
+        assert np.allclose(
+            sparse_interpolant(wd_query, ws_query, None),
+            yaw_interpolant(wd_query, ws_query, None),
+            atol=tolerance
+        )
+    with pytest.raises(ValueError):
+        sparse_interpolant(200.0, 8.0, 0.06) # min specified wd is 220
+
+def test_quantization_error_report():
+    yaw_offsets = np.array([[0.0, 12.3456], [-24.99, 1.0/3.0]])
+    report = quantization_error_report(yaw_offsets)
+    assert list(report.index) == ["float64", "float32", "float16", "int16"]
+    assert report.loc["float64", "max_abs_error"] == 0.0
+    assert report.loc["float32", "max_abs_error"] < 1e-5
+    assert report.loc["int16", "max_abs_error"] <= 0.005
+    assert report.loc["int16", "memory_fraction"] == 0.25
+    assert report.loc["float32", "memory_bytes"] == 16
+
+    # Offsets outside the int16 range
+    with pytest.raises(ValueError):
+        quantization_error_report(np.array([400.0]), precisions=["int16"])
+
 def test_hysteresis_zones():
 
     df_opt = generic_df_opt()
@@ -438,6 +749,39 @@ def test_consolidate_hysteresis_zones():
     hysteresis_wds_base = [(340, 30), (35, 50)]
     assert consolidate_hysteresis_zones(hysteresis_wds_unconsolidated) == hysteresis_wds_base
 
+    # Zones contained within other zones, and zones touching at 0/360 degrees
+    hysteresis_wds_unconsolidated = [(10, 30), (12, 15), (350, 0), (0, 5)]
+    hysteresis_wds_base = [(350, 5), (10, 30)]
+    assert consolidate_hysteresis_zones(hysteresis_wds_unconsolidated) == hysteresis_wds_base
+    assert consolidate_hysteresis_zones([]) == []
+
+def test_HysteresisZoneIndex():
+    hysteresis_dict = {
+        "T000": [(10.0, 30.0), (100.0, 110.0)],
+        "T001": [(350.0, 10.0)], # Wraps around 0/360 degrees
+        # No zones for T002
+        "T003": [(170.0, 190.0), (340.0, 0.5), (200.0, 210.0)], # Unsorted
+    }
+    index = HysteresisZoneIndex(hysteresis_dict, n_turbines=4)
+
+    assert np.array_equal(index.in_zone([20.0, 0.0, 20.0, 180.0]), [True, True, False, True])
+    assert np.array_equal(index.in_zone([10.0, 10.0, 0.0, 0.5]), [False, False, False, False])
+    assert np.array_equal(index.in_zone([105.0, 359.0, 105.0, 0.0]), [True, True, False, True])
+    assert np.array_equal(index.in_zone([380.0, -5.0, 0.0, -10.0]), [True, True, False, True])
+
+    # Matches direct check of all zones
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        wind_directions = rng.uniform(0.0, 360.0, 4)
+        in_zone_direct = [
+            any(in_sector(wd, lb, ub) for lb, ub in hysteresis_dict.get("T{:03d}".format(t), []))
+            for t, wd in enumerate(wind_directions)
+        ]
+        assert np.array_equal(index.in_zone(wind_directions), in_zone_direct)
+
+    # Empty index
+    assert not HysteresisZoneIndex({}, n_turbines=2).in_zone([0.0, 10.0]).any()
+
 def test_create_uniform_wind_rose():
     wind_rose = create_uniform_wind_rose()
     frequencies = wind_rose.unpack_freq()
@@ -459,3 +803,32 @@ def test_check_df_opt_ordering():
     df_opt_2.wind_direction = df_opt.wind_speed
     with pytest.raises(ValueError):
         check_df_opt_ordering(df_opt_2)
+
+    # Other reorderings are detected
+    df_opt_3 = df_opt.copy()
+    df_opt_3.loc[[0, 1], "turbulence_intensity"] = df_opt_3.turbulence_intensity[[1, 0]].values
+    with pytest.raises(ValueError):
+        check_df_opt_ordering(df_opt_3)
+    with pytest.raises(ValueError):
+        check_df_opt_ordering(df_opt.iloc[::-1])
+
+    # In-place modifications are detected
+    check_df_opt_ordering(df_opt)
+    df_opt.loc[5, "wind_speed"] = 100.0
+    with pytest.raises(ValueError):
+        check_df_opt_ordering(df_opt)
+
+    # Including in rows of a large table away from its first and last rows
+    wd_grid, ws_grid, ti_grid = np.meshgrid(
+        np.arange(0.0, 360.0, 1.0), np.arange(4.0, 14.0), np.linspace(0.04, 0.12, 5),
+        indexing="ij"
+    )
+    df_opt = pd.DataFrame({
+        "wind_direction": wd_grid.flatten(),
+        "wind_speed": ws_grid.flatten(),
+        "turbulence_intensity": ti_grid.flatten(),
+    })
+    check_df_opt_ordering(df_opt)
+    df_opt.loc[len(df_opt) // 2 + 1, "wind_speed"] = 99.0
+    with pytest.raises(ValueError):
+        check_df_opt_ordering(df_opt)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from hycon.controllers.yaw_scheduler import YawScheduler
+
+
+def test_YawScheduler_passthrough():
+    # Default parameters pass target yaw angles through
+    yaw_scheduler = YawScheduler(dt=1.0, n_turbines=2)
+    targets = [[270.0, 280.0], [271.5, 279.0], [271.5, 279.0], [260.0, 300.0]]
+    for target in targets:
+        assert np.allclose(yaw_scheduler.update(target), target)
+    statistics = yaw_scheduler.statistics()
+    assert np.allclose(statistics["yaw_travel"], [13.0, 22.0])
+    assert np.array_equal(statistics["n_maneuvers"], [2, 2])
+    assert statistics["total_yaw_travel"] == 35.0
+    assert statistics["elapsed_time"] == 4.0
+
+def test_YawScheduler_deadband_dwell_rate():
+    yaw_scheduler = YawScheduler(
+        dt=1.0,
+        n_turbines=2,
+        deadband=[5.0, 1.0],
+        minimum_dwell_time=3.0,
+        maximum_yaw_rate=2.0,
+    )
+    yaw_scheduler.update([270.0, 270.0])
+
+    # Small fluctuations within the deadband of T000 do not cause yawing; T001 yaws at the
+    # maximum yaw rate
+    yaw_angles = np.array([yaw_scheduler.update([273.0, 273.0]) for _ in range(3)])
+    assert np.allclose(yaw_angles[:, 0], 270.0)
+    assert np.allclose(yaw_angles[:, 1], [272.0, 273.0, 273.0])
+
+    # T001 must dwell before the next maneuver
+    yaw_angles = np.array([yaw_scheduler.update([280.0, 280.0]) for _ in range(5)])
+    assert np.allclose(yaw_angles[:, 0], [272.0, 274.0, 276.0, 278.0, 280.0])
+    assert np.allclose(yaw_angles[:, 1], [273.0, 273.0, 275.0, 277.0, 279.0])
+    assert np.array_equal(yaw_scheduler.statistics()["n_maneuvers"], [1, 2])
+
+    with pytest.raises(ValueError):
+        YawScheduler(dt=1.0, n_turbines=2, maximum_yaw_rate=0.0)
+
+def test_YawScheduler_averaging_and_wrapping():
+    # Averaging suppresses yawing in response to zero-mean fluctuations
+    rng = np.random.default_rng(0)
+    yaw_scheduler = YawScheduler(dt=1.0, n_turbines=3, deadband=3.0, averaging_time=30.0)
+    yaw_scheduler.update(np.full(3, 270.0))
+    for _ in range(600):
+        yaw_scheduler.update(270.0 + rng.normal(0.0, 4.0, 3))
+    assert np.all(yaw_scheduler.statistics()["n_maneuvers"] == 0)
+    yaw_scheduler_raw = YawScheduler(dt=1.0, n_turbines=3, deadband=3.0)
+    yaw_scheduler_raw.update(np.full(3, 270.0))
+    for _ in range(600):
+        yaw_scheduler_raw.update(270.0 + rng.normal(0.0, 4.0, 3))
+    assert np.all(yaw_scheduler_raw.statistics()["n_maneuvers"] > 0)
+
+    # Yawing through the 0/360 degree point takes the shorter path
+    yaw_scheduler = YawScheduler(dt=1.0, n_turbines=1, maximum_yaw_rate=5.0)
+    yaw_scheduler.reset(yaw_angles=355.0)
+    yaw_angles = [yaw_scheduler.update([5.0])[0] for _ in range(3)]
+    assert np.allclose(yaw_angles, [360.0, 365.0, 365.0])
+    assert yaw_scheduler.statistics()["total_yaw_travel"] == 10.0